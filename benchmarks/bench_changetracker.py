@@ -0,0 +1,270 @@
+# bench_changetracker.py — вимірювання часу та пікової пам'яті гарячих шляхів changetracker
+#
+# Запуск (з кореня репозиторію):
+#     python benchmarks/bench_changetracker.py --output results.json
+#     python benchmarks/bench_changetracker.py --quick --workload wide --workload list
+#     python benchmarks/bench_changetracker.py --compare old.json --output new.json
+#
+# Файл не починається з test_ і лежить поза tests/, тож pytest його не збирає.
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Iterator
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from changetracker import ChangeTracker, commit_many  # noqa: E402
+
+# Режими ChangeTracker, для яких повторюються всі вимірювання
+MODES = {
+    "default": {},
+    "dirty": {"dirty_tracking": True},
+    "containers": {"track_containers": True},
+    "hash": {"hash_compare": True},
+    "deferred": {"track_containers": True, "deferred_baseline": True, "init_log": False},
+}
+
+
+@dataclass
+class BenchResult:
+    workload: str
+    size: int
+    mode: str
+    operation: str
+    repeats: int
+    best_seconds: float
+    median_seconds: float
+    peak_bytes: int
+
+
+@dataclass
+class Operation:
+    """
+    Операція для вимірювання: setup() готує стан (не входить у час), run(state) — те, що вимірюється.
+    Для кожного повтору стан готується заново, бо операції (commit) змінюють об'єкт.
+    """
+    name: str
+    setup: Callable[[], object]
+    run: Callable[[object], object]
+
+
+class Node(ChangeTracker):
+    """Об'єкт з довільним набором полів (генератори нижче задають поля через kwargs)."""
+
+    def __init__(self, fields: dict, **options):
+        for key, value in fields.items():
+            setattr(self, key, value)
+        super().__init__(**options)
+
+
+# --- Генератори навантажень: кожен повертає фабрику кореневого об'єкта та функцію зміни ---
+
+def wide(size: int, options: dict):
+    """Широкий об'єкт: size скалярних полів. Змінюється одне поле."""
+    def make():
+        return Node({f"field_{i}": i for i in range(size)}, **options)
+
+    def mutate(root):
+        root.field_0 = -1
+    return make, mutate
+
+
+def deep(size: int, options: dict):
+    """Ланцюжок із size вкладених ChangeTracker. Змінюється найглибший."""
+    def make():
+        node = Node({"value": 0}, **options)
+        for level in range(size - 1):
+            node = Node({"value": level, "child": node}, **options)
+        return node
+
+    def mutate(root):
+        node = root
+        while hasattr(node, "child"):
+            node = node.child
+        node.value = -1
+    return make, mutate
+
+
+def long_list(size: int, options: dict):
+    """Поле-список із size елементів. До списку додається один елемент."""
+    def make():
+        return Node({"items": list(range(size)), "name": "list"}, **options)
+
+    def mutate(root):
+        root.items.append(-1)
+    return make, mutate
+
+
+def long_dict(size: int, options: dict):
+    """Поле-словник із size ключів. Змінюється один ключ."""
+    def make():
+        return Node({"mapping": {f"k{i}": i for i in range(size)}, "name": "dict"}, **options)
+
+    def mutate(root):
+        root.mapping["k0"] = -1
+    return make, mutate
+
+
+WORKLOADS = {
+    "wide": (wide, 1_000),
+    "deep": (deep, 50),
+    "list": (long_list, 100_000),
+    "dict": (long_dict, 100_000),
+}
+
+# Кількість об'єктів для навантаження "many"
+MANY_SIZE = 100_000
+
+
+def single_object_operations(generator, size: int, options: dict) -> Iterator[Operation]:
+    make, mutate = generator(size, options)
+
+    def changed():
+        root = make()
+        mutate(root)
+        return root
+
+    def snapshot(root):
+        return root._get_field_snapshot(root)
+
+    yield Operation("init", lambda: None, lambda _: make())
+    yield Operation("get_changed_data_clean", make, lambda root: root.get_changed_data())
+    yield Operation("get_changed_data_changed", changed, lambda root: root.get_changed_data())
+    yield Operation("commit_changed", changed, lambda root: root.commit())
+    yield Operation("get_field_snapshot", make, snapshot)
+
+
+def many_operations(size: int, options: dict) -> Iterator[Operation]:
+    """Багато дрібних об'єктів: змінюється кожен сотий."""
+    def make():
+        return [Node({"name": f"n{i}", "value": i, "tags": ["a"]}, **options) for i in range(size)]
+
+    def changed():
+        trackers = make()
+        for tracker in trackers[::100]:
+            tracker.value = -1
+        return trackers
+
+    def get_all(trackers):
+        for tracker in trackers:
+            tracker.get_changed_data()
+
+    def commit_all(trackers):
+        for tracker in trackers:
+            tracker.commit()
+
+    yield Operation("init", lambda: None, lambda _: make())
+    yield Operation("get_changed_data_changed", changed, get_all)
+    yield Operation("commit_changed", changed, commit_all)
+    yield Operation("commit_many_changed", changed, commit_many)
+
+
+def measure(operation: Operation, repeats: int) -> tuple[list[float], int]:
+    """Повертає час кожного повтору (без tracemalloc) та пікову пам'ять операції (окремий прогін під tracemalloc)."""
+    times = []
+    for _ in range(repeats):
+        state = operation.setup()
+        gc.collect()
+        start = time.perf_counter()
+        operation.run(state)
+        times.append(time.perf_counter() - start)
+        del state
+
+    state = operation.setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        operation.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return times, peak
+
+
+def run(workloads: list[str], modes: list[str], repeats: int, scale: float) -> list[BenchResult]:
+    results = []
+    for workload in workloads:
+        for mode in modes:
+            options = MODES[mode]
+            if workload == "many":
+                size = max(1, int(MANY_SIZE * scale))
+                operations = many_operations(size, options)
+            else:
+                generator, size = WORKLOADS[workload]
+                size = max(2, int(size * scale))
+                operations = single_object_operations(generator, size, options)
+            for operation in operations:
+                times, peak = measure(operation, repeats)
+                result = BenchResult(
+                    workload=workload,
+                    size=size,
+                    mode=mode,
+                    operation=operation.name,
+                    repeats=repeats,
+                    best_seconds=min(times),
+                    median_seconds=statistics.median(times),
+                    peak_bytes=peak
+                )
+                results.append(result)
+                print(f"{workload:>5} {size:>7} {mode:>10} {operation.name:<26} {result.best_seconds * 1000:>10.3f} ms {peak / 1024:>10.1f} KiB")
+    return results
+
+
+def compare(results: list[BenchResult], baseline_path: str) -> None:
+    """Друкує відношення часу та пам'яті до попереднього запуску (> 1 — повільніше/більше)."""
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = {
+            (r["workload"], r["size"], r["mode"], r["operation"]): r for r in json.load(file)["results"]
+        }
+    print(f"\nПорівняння з {baseline_path}:")
+    for result in results:
+        old = baseline.get((result.workload, result.size, result.mode, result.operation))
+        if old is None:
+            continue
+        time_ratio = result.best_seconds / old["best_seconds"] if old["best_seconds"] else float("inf")
+        memory_ratio = result.peak_bytes / old["peak_bytes"] if old["peak_bytes"] else float("inf")
+        print(f"{result.workload:>5} {result.mode:>10} {result.operation:<26} time x{time_ratio:.2f} memory x{memory_ratio:.2f}")
+
+
+def main(argv: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарки commit/get_changed_data/_get_field_snapshot.")
+    parser.add_argument("--workload", action="append", choices=[*WORKLOADS, "many"], help="Навантаження (можна кілька). За замовчуванням — усі.")
+    parser.add_argument("--mode", action="append", choices=list(MODES), help="Режим ChangeTracker (можна кілька). За замовчуванням — усі.")
+    parser.add_argument("--repeats", type=int, default=3, help="Кількість повторів для вимірювання часу.")
+    parser.add_argument("--scale", type=float, default=1.0, help="Множник розмірів навантажень.")
+    parser.add_argument("--quick", action="store_true", help="Швидкий прогін: --scale 0.01 --repeats 1.")
+    parser.add_argument("--output", help="Файл JSON для результатів.")
+    parser.add_argument("--compare", help="Файл JSON попереднього запуску для порівняння.")
+    args = parser.parse_args(argv)
+
+    scale, repeats = (0.01, 1) if args.quick else (args.scale, args.repeats)
+    # Глибина рекурсії: "знімки" глибоких ланцюжків обходяться рекурсивно
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10_000))
+    results = run(args.workload or [*WORKLOADS, "many"], args.mode or list(MODES), repeats, scale)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({
+                "meta": {
+                    "created": datetime.now().isoformat(),
+                    "python": sys.version,
+                    "platform": platform.platform(),
+                    "scale": scale,
+                    "repeats": repeats,
+                },
+                "results": [asdict(result) for result in results],
+            }, file, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,12 @@
-from .core import ChangeTracker, ChangeTrackerIncludeMode, ChangeTrackerLogs, ChangeTrackerLog
\ No newline at end of file
+from .core import ChangeTracker, ChangeTrackerBase, ChangeTrackerIncludeMode, ChangeTrackerLogs, ChangeTrackerLog, ChangeTrackerAction, ChangeTrackerDiffMode
+from .containers import TrackedList, TrackedDict
+from .retention import ChangeTrackerRetention
+from .bulk import commit_many, ChangeTrackerTransaction
+from .parallel import commit_parallel, get_changed_data_parallel
+from .registry import register_type_handler, unregister_type_handler
+from .memo import SnapshotRef
+from .delta import ChangeTrackerDelta
+from .query import ChangeLogQuery
+from .slotted import SlottedChangeTracker
+from .instrumentation import ChangeTrackerInstrumentation, CommitMetrics
+from .coalescing import ChangeTrackerCoalescing
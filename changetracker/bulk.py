@@ -0,0 +1,173 @@
+# bulk.py — спільний коміт багатьох ChangeTracker під одним commit_id
+from contextlib import ExitStack
+from datetime import datetime
+from typing import Callable, Iterable
+import uuid
+
+from .core import ChangeTrackerBase, ChangeTrackerDiffMode, _PreparedCommit
+from .logs import ChangeTrackerLogs
+from .memo import SnapshotMemo
+
+
+def collect_trackers(trackers: Iterable[ChangeTrackerBase]) -> list[ChangeTrackerBase]:
+    """
+    Повертає список унікальних ChangeTracker разом з усіма вкладеними ChangeTracker (у порядку обходу в глибину).
+    Кожен об'єкт (зокрема спільний для кількох батьків або доступний через цикл) потрапляє в список один раз.
+    """
+    result = []
+    visited = set()
+    stack = list(trackers)[::-1]
+    while stack:
+        tracker = stack.pop()
+        if id(tracker) in visited:
+            continue
+        visited.add(id(tracker))
+        result.append(tracker)
+        children = [value for value in tracker._get_fields().values() if isinstance(value, ChangeTrackerBase)]
+        stack.extend(reversed(children))
+    return result
+
+
+def commit_many(
+    trackers: Iterable[ChangeTrackerBase],
+    init: bool = False,
+    commit_id: str = None,
+    timestamp: datetime = None,
+    diff_mode: ChangeTrackerDiffMode = None
+) -> ChangeTrackerLogs:
+    """
+    Атомарно комітить набір ChangeTracker (разом із вкладеними) під одним commit_id та timestamp.
+
+    :param trackers: Об'єкти для коміту.
+    :param init: Ознака ініціалізації для всіх записів.
+    :param commit_id: ID коміту. Якщо не вказано, генерується один на весь набір.
+    :param timestamp: Час коміту. Якщо не вказано, використовується поточна дата та час.
+    :param diff_mode: Режим формування журналу змін для всіх об'єктів. Якщо не вказано — режим кожного об'єкта.
+    :return: ChangeTrackerLogs — об'єднаний журнал змін усіх об'єктів.
+
+    Опис:
+        - Кожен унікальний об'єкт (зокрема спільний вкладений) обробляється один раз, а "знімки" спільних підоб'єктів
+          створюються один раз для всього набору.
+        - Спершу для всіх об'єктів обчислюються зміни; якщо на цьому етапі виникає виняток, жоден об'єкт не змінюється.
+        - Потім зміни застосовуються до всіх об'єктів, і лише після цього записи передаються в приймачі журналу (sink).
+          Приймач — зовнішнє сховище: його виняток не скасовує вже застосованих змін. Решта приймачів усе одно отримують
+          записи, а перший виняток передається далі після завершення коміту.
+        - Об'єкти з thread_safe=True блокуються для комітів на весь час commit_many (у сталому порядку, за id).
+    """
+    # Спільна таблиця ідентичності: кожен об'єкт графа знімається один раз для всього набору
+    memo = SnapshotMemo()
+
+    def diff_all(prepared: list[tuple[ChangeTrackerBase, _PreparedCommit]]) -> None:
+        for tracker, prepared_commit in prepared:
+            # Об'єкти з thread_safe можуть змінитися між кроками — знімки з інших об'єктів для них не перевикористовуються
+            tracker._diff_prepared(prepared_commit, memo=memo if tracker._lock is None else SnapshotMemo())
+
+    return commit_prepared(collect_trackers(trackers), diff_all, init=init, commit_id=commit_id, timestamp=timestamp, diff_mode=diff_mode, memo=memo)
+
+
+def commit_prepared(
+    trackers: list[ChangeTrackerBase],
+    diff_all: Callable[[list[tuple[ChangeTrackerBase, _PreparedCommit]]], None],
+    init: bool = False,
+    commit_id: str = None,
+    timestamp: datetime = None,
+    diff_mode: ChangeTrackerDiffMode = None,
+    memo: SnapshotMemo = None
+) -> ChangeTrackerLogs:
+    """
+    Спільна частина commit_many() та parallel.commit_parallel(): знімає посилання на поля всіх об'єктів,
+    обчислює зміни через diff_all (заповнює logs, snapshots та hashes кожного _PreparedCommit) і застосовує їх.
+    Якщо diff_all завершився винятком, жоден об'єкт не змінюється. Записи передаються в приймачі журналу
+    після застосування змін до всіх об'єктів; перший виняток приймача передається далі в кінці коміту.
+    Хуки instrumentation: pre_commit — перед зняттям посилань, post_commit — після застосування змін усього набору
+    (вкладені об'єкти входять у набір, тож child_commits дорівнює 0; для commit_parallel() diff_seconds
+    та snapshot_nodes не вимірюються — порівняння виконується в інших процесах).
+    """
+    result = []
+    with ExitStack() as locks:
+        for tracker in sorted(trackers, key=id):
+            locks.enter_context(tracker._commit_guard())
+
+        prepared = [
+            (tracker, tracker._capture_commit(
+                new_data=None,
+                diff_mode=diff_mode,
+                detach_dirty=tracker._lock is not None,
+                metrics=tracker._instrumentation.begin(tracker) if tracker._instrumentation is not None else None
+            ))
+            for tracker in trackers
+        ]
+        try:
+            diff_all(prepared)
+        except BaseException:
+            for tracker, prepared_commit in prepared:
+                tracker._discard_prepared(prepared_commit)
+            raise
+
+        if timestamp is None:
+            timestamp = datetime.now()
+        if commit_id is None:
+            commit_id = str(uuid.uuid4())
+
+        for tracker, prepared_commit in prepared:
+            tracker._apply_commit(prepared_commit, init=init, commit_id=commit_id, timestamp=timestamp, write_sink=False)
+            result.extend(prepared_commit.logs)
+
+        # Приймачі отримують записи після застосування змін до всіх об'єктів: виняток приймача не зупиняє застосування
+        sink_error = None
+        for tracker, prepared_commit in prepared:
+            if prepared_commit.logs and tracker._sink is not None:
+                try:
+                    tracker._sink.write(prepared_commit.logs)
+                except Exception as error:
+                    if sink_error is None:
+                        sink_error = error
+
+    # Батьки поза набором отримують новий стан закомічених об'єктів у базовий стан
+    committed = {id(tracker) for tracker, _ in prepared}
+    memo = memo or SnapshotMemo()
+    for tracker, prepared_commit in prepared:
+        if prepared_commit.logs:
+            tracker._notify_parents_commit(skip=committed, memo=memo)
+    for tracker, prepared_commit in prepared:
+        if prepared_commit.metrics is not None:
+            tracker._instrumentation.end(tracker, prepared_commit.logs, prepared_commit.metrics)
+    if sink_error is not None:
+        raise sink_error
+    return ChangeTrackerLogs(data=result)
+
+
+class ChangeTrackerTransaction:
+    """
+    Unit of work: збирає ChangeTracker протягом блоку with і комітить їх одним commit_many() під час виходу.
+    Якщо блок завершився винятком, нічого не комітиться.
+
+        with ChangeTrackerTransaction() as transaction:
+            for entity in entities:
+                entity.status = "done"
+                transaction.add(entity)
+        print(transaction.result)
+    """
+
+    def __init__(self, trackers: Iterable[ChangeTrackerBase] = (), init: bool = False, diff_mode: ChangeTrackerDiffMode = None):
+        self.trackers = list(trackers)
+        self.init = init
+        self.diff_mode = diff_mode
+        self.commit_id = None
+        self.result = None
+
+    def add(self, tracker: ChangeTrackerBase) -> None:
+        self.trackers.append(tracker)
+
+    def commit(self) -> ChangeTrackerLogs:
+        self.commit_id = str(uuid.uuid4())
+        self.result = commit_many(self.trackers, init=self.init, commit_id=self.commit_id, diff_mode=self.diff_mode)
+        self.trackers = []
+        return self.result
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
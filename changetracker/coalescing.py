@@ -0,0 +1,77 @@
+# coalescing.py — згортання частих комітів ChangeTracker в один (за кількістю викликів, часом або таймером)
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import threading
+import time
+import weakref
+
+
+@dataclass(frozen=True)
+class ChangeTrackerCoalescing:
+    """
+    Політика згортання комітів ChangeTracker.
+
+    commit() не комітить одразу, а відкладає коміт, доки не спрацює одне з обмежень. Відкладений коміт порівнює поточний стан
+    з базовим станом останнього коміту, тож журнал отримує лише чисті зміни: поле, змінене A→B→C, — один запис A→C,
+    а поле, змінене і повернуте до початкового значення, — жодного. Відкладені зміни видно в get_changed_data(),
+    а flush() комітить їх одразу.
+
+    :param max_commits: Коміт виконується на max_commits-й виклик commit() від попереднього коміту.
+    :param max_delay: Коміт виконується викликом commit(), якщо від першого відкладеного виклику минуло не менше max_delay.
+    :param timer: Якщо True, відкладений коміт виконується таймером через max_delay після першого відкладеного виклику,
+        навіть без наступних commit(). Таймер комітить в іншому потоці, тож потребує thread_safe=True.
+    """
+    max_commits: int = None
+    max_delay: timedelta = None
+    timer: bool = False
+
+    def __post_init__(self):
+        if self.timer and self.max_delay is None:
+            raise ValueError("Coalescing timer requires max_delay")
+
+
+class PendingCommit:
+    """
+    Відкладені виклики commit() об'єкта з моменту останнього коміту.
+    Відкладений коміт отримує commit_id (якщо вказаний), timestamp та diff_mode останнього відкладеного виклику.
+    """
+
+    __slots__ = ("count", "started", "commit_id", "timestamp", "diff_mode", "timer")
+
+    def __init__(self):
+        self.count = 0
+        self.started = time.monotonic()
+        self.commit_id = None
+        self.timestamp = None
+        self.diff_mode = None
+        self.timer = None
+
+    def add(self, commit_id: str, timestamp: datetime, diff_mode) -> None:
+        self.count += 1
+        if commit_id is not None:
+            self.commit_id = commit_id
+        self.timestamp = timestamp or datetime.now()
+        if diff_mode is not None:
+            self.diff_mode = diff_mode
+
+    def is_due(self, coalescing: ChangeTrackerCoalescing) -> bool:
+        """Чи настав час коміту за обмеженнями політики (таймер перевіряється окремо)."""
+        if coalescing.max_commits is not None and self.count >= coalescing.max_commits:
+            return True
+        return coalescing.max_delay is not None and time.monotonic() - self.started >= coalescing.max_delay.total_seconds()
+
+    def start_timer(self, delay: timedelta, tracker) -> None:
+        """Запускає таймер, що викличе tracker.flush() (таймер не тримає об'єкт живим)."""
+        self.timer = threading.Timer(delay.total_seconds(), _flush_tracker, args=(weakref.ref(tracker),))
+        self.timer.daemon = True
+        self.timer.start()
+
+    def cancel(self) -> None:
+        if self.timer is not None:
+            self.timer.cancel()
+
+
+def _flush_tracker(ref: weakref.ref) -> None:
+    tracker = ref()
+    if tracker is not None:
+        tracker.flush()
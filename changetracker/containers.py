@@ -0,0 +1,241 @@
+# containers.py — спостережувані контейнери (TrackedList / TrackedDict) для ChangeTracker
+from contextlib import nullcontext
+from typing import Any
+
+from .values import is_immutable_value
+
+
+# Контекст без блокування (власник без thread_safe або контейнер без власника)
+_NO_LOCK = nullcontext()
+
+
+def wrap_value(value: Any, parent: Any, field: str = None) -> Any:
+    """
+    Обгортає list/dict у TrackedList/TrackedDict (рекурсивно) та прив'язує їх до власника.
+
+    :param value: Значення для обгортання.
+    :param parent: Власник — батьківський TrackedContainer або ChangeTracker.
+    :param field: Назва поля, якщо власник — ChangeTracker.
+    :return: Відстежуваний контейнер або саме значення.
+
+    Якщо значення не можна відстежити (кастомний об'єкт, ChangeTracker тощо), батьківський контейнер позначається як "непрозорий".
+    Якщо контейнер уже належить іншому власнику, старий власник спершу фіксує свій базовий стан,
+    а контейнер стає "непрозорим" — спільний контейнер обидва власники перевіряють повністю.
+    """
+    value_type = type(value)
+    if value_type is list:
+        return TrackedList(value, parent=parent, field=field)
+    if value_type is dict:
+        return TrackedDict(value, parent=parent, field=field)
+    if isinstance(value, TrackedContainer):
+        if value._ct_parent is not None and (value._ct_parent is not parent or value._ct_field != field):
+            value._ct_before_change()
+            value._ct_mark_opaque()
+        value._ct_attach(parent, field)
+        if value._ct_opaque and isinstance(parent, TrackedContainer):
+            parent._ct_mark_opaque()
+        return value
+    if isinstance(parent, TrackedContainer) and not is_immutable_value(value):
+        parent._ct_mark_opaque()
+    return value
+
+
+class TrackedContainer:
+    """
+    Базовий клас для спостережуваних контейнерів.
+
+    Перед кожною мутацією контейнер сповіщає власника: батьківський контейнер або ChangeTracker (разом з назвою поля).
+    ChangeTracker у відповідь позначає поле як "брудне" і, якщо потрібно, фіксує "знімок" стану до зміни (copy-on-write).
+
+    Контейнер вважається "непрозорим" (_ct_opaque), якщо містить значення, мутації яких він не бачить
+    (кастомні об'єкти, вкладені ChangeTracker). Такі поля ChangeTracker завжди перевіряє повністю.
+    """
+
+    __slots__ = ()
+
+    def _ct_init(self, parent: Any, field: str) -> None:
+        self._ct_parent = parent
+        self._ct_field = field
+        self._ct_opaque = False
+        # Кешований структурний хеш вмісту (None — не обчислено або застарів)
+        self._ct_hash = None
+
+    def _ct_attach(self, parent: Any, field: str) -> None:
+        self._ct_parent = parent
+        self._ct_field = field
+
+    def _ct_mark_opaque(self) -> None:
+        container = self
+        while isinstance(container, TrackedContainer) and not container._ct_opaque:
+            container._ct_opaque = True
+            container = container._ct_parent
+        if container is not None and not isinstance(container, TrackedContainer):
+            # Кореневий контейнер поля став "непрозорим" — сповіщаємо власника
+            container._on_container_opaque()
+
+    def _ct_before_change(self) -> None:
+        # Скидаємо кешовані хеші від зміненого контейнера до кореня
+        root = self
+        root._ct_hash = None
+        while isinstance(root._ct_parent, TrackedContainer):
+            root = root._ct_parent
+            root._ct_hash = None
+        owner = root._ct_parent
+        if owner is not None:
+            owner._on_container_change(root._ct_field, root)
+
+    def _ct_change(self):
+        """
+        Сповіщає власника про мутацію (_ct_before_change) і повертає контекст, у якому її треба виконати.
+        Якщо власник — ChangeTracker з thread_safe=True, контекст тримає його блокування до кінця мутації:
+        commit() не може зняти копію полів посеред зміни контейнера.
+        """
+        root = self
+        while isinstance(root._ct_parent, TrackedContainer):
+            root = root._ct_parent
+        lock = getattr(root._ct_parent, "_lock", None)
+        if lock is None:
+            self._ct_before_change()
+            return _NO_LOCK
+        lock.acquire()
+        try:
+            self._ct_before_change()
+        except BaseException:
+            lock.release()
+            raise
+        return _LockRelease(lock)
+
+    def __reduce_ex__(self, protocol):
+        # copy/deepcopy/pickle повертають звичайні list/dict без прив'язки до власника
+        return self._ct_plain_type, (self._ct_plain_type(self),)
+
+
+class _LockRelease:
+    """Контекст, що звільняє вже захоплене блокування на виході."""
+
+    __slots__ = ("lock",)
+
+    def __init__(self, lock):
+        self.lock = lock
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.lock.release()
+
+
+class TrackedList(TrackedContainer, list):
+    """Список, який сповіщає власника про мутації на місці."""
+
+    __slots__ = ("_ct_parent", "_ct_field", "_ct_opaque", "_ct_hash")
+    _ct_plain_type = list
+
+    def __init__(self, iterable=(), parent: Any = None, field: str = None):
+        self._ct_init(parent, field)
+        list.__init__(self, (wrap_value(v, self) for v in iterable))
+
+    def _ct_wrap_many(self, values) -> list:
+        return [wrap_value(v, self) for v in values]
+
+    def __setitem__(self, index, value):
+        with self._ct_change():
+            if isinstance(index, slice):
+                value = self._ct_wrap_many(value)
+            else:
+                value = wrap_value(value, self)
+            list.__setitem__(self, index, value)
+
+    def __delitem__(self, index):
+        with self._ct_change():
+            list.__delitem__(self, index)
+
+    def __iadd__(self, values):
+        with self._ct_change():
+            return list.__iadd__(self, self._ct_wrap_many(values))
+
+    def __imul__(self, count):
+        with self._ct_change():
+            return list.__imul__(self, count)
+
+    def append(self, value):
+        with self._ct_change():
+            list.append(self, wrap_value(value, self))
+
+    def extend(self, values):
+        with self._ct_change():
+            list.extend(self, self._ct_wrap_many(values))
+
+    def insert(self, index, value):
+        with self._ct_change():
+            list.insert(self, index, wrap_value(value, self))
+
+    def pop(self, index=-1):
+        with self._ct_change():
+            return list.pop(self, index)
+
+    def remove(self, value):
+        with self._ct_change():
+            list.remove(self, value)
+
+    def clear(self):
+        with self._ct_change():
+            list.clear(self)
+
+    def sort(self, *args, **kwargs):
+        with self._ct_change():
+            list.sort(self, *args, **kwargs)
+
+    def reverse(self):
+        with self._ct_change():
+            list.reverse(self)
+
+
+class TrackedDict(TrackedContainer, dict):
+    """Словник, який сповіщає власника про мутації на місці."""
+
+    __slots__ = ("_ct_parent", "_ct_field", "_ct_opaque", "_ct_hash")
+    _ct_plain_type = dict
+
+    def __init__(self, mapping=(), parent: Any = None, field: str = None):
+        self._ct_init(parent, field)
+        dict.__init__(self)
+        for key, value in dict(mapping).items():
+            dict.__setitem__(self, key, wrap_value(value, self))
+
+    def __setitem__(self, key, value):
+        with self._ct_change():
+            dict.__setitem__(self, key, wrap_value(value, self))
+
+    def __delitem__(self, key):
+        with self._ct_change():
+            dict.__delitem__(self, key)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def pop(self, *args):
+        with self._ct_change():
+            return dict.pop(self, *args)
+
+    def popitem(self):
+        with self._ct_change():
+            return dict.popitem(self)
+
+    def clear(self):
+        with self._ct_change():
+            dict.clear(self)
+
+    def update(self, *args, **kwargs):
+        with self._ct_change():
+            for key, value in dict(*args, **kwargs).items():
+                dict.__setitem__(self, key, wrap_value(value, self))
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return dict.__getitem__(self, key)
+        with self._ct_change():
+            value = wrap_value(default, self)
+            dict.__setitem__(self, key, value)
+            return value
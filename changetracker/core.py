@@ -1,60 +1,73 @@
 # core.py — основний код для changetracker
-from dataclasses import asdict, dataclass
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from dataclasses import asdict
 from datetime import datetime
 from enum import Enum
-from typing import Literal
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Awaitable, Literal, Union
+import asyncio
+import copy
+import functools
+import threading
 import uuid
+import weakref
 
+from .coalescing import ChangeTrackerCoalescing, PendingCommit
+from .containers import _NO_LOCK, TrackedContainer, TrackedDict, TrackedList, wrap_value
+from .delta import ADD, REMOVE, REPLACE, ChangeTrackerDelta, diff_ops, patch_snapshot
+from .diff import MISSING, diff_paths, split_path
+from .filtering import ChangeTrackerIncludeMode, FieldFilterPlan, get_filter_plan
+from .instrumentation import ChangeTrackerInstrumentation, CommitMetrics
+from .hashing import hash_mapping, hash_scalar, hash_sequence, structural_hash
+from .log_store import ChangeLogStore
+from .memo import SnapshotMemo, SnapshotRef
+from .registry import get_type_handler, values_equal
+from .logs import ChangeTrackerAction, ChangeTrackerLog, ChangeTrackerLogs
+from .retention import ChangeTrackerRetention, exceeds_retention, fold_states, get_retention_fold_count
+from .sinks import ChangeLogSink
+from .values import is_immutable_value
 
+# Спільні порожні значення службових полів: об'єкт отримує власні лише тоді, коли вони потрібні
+_EMPTY_CHANGE_LOG = ChangeLogStore()
+_NO_FIELDS = frozenset()
+_NO_CHECKPOINTS = MappingProxyType({})
+_NO_STATS = MappingProxyType({})
+# Виклики get_changed_data() в обхід кешу рахуються для класу: зазвичай їх причина — конфігурація класу,
+# і лічильник не має створювати власних _extras кожного об'єкта
+_BYPASSED_CALLS = weakref.WeakKeyDictionary()
 
-class ChangeTrackerIncludeMode(Enum):
-    ALL = "__all"
-    ONLY_PUBLIC = "__only_public"
-    ONLY_PRIVATE = "__only_private"
 
+class _EmptyKeys(frozenset):
+    """
+    Спільна порожня множина ключів dirty_tracking (_dirty_keys, _volatile_keys, _child_keys, _tracked_keys):
+    discard() та clear() нічого не роблять, а перше додавання замінює її власною множиною об'єкта (_add_key).
+    """
 
-class ChangeTrackerAction(Enum):
-    CREATED = "created"
-    DELETED = "deleted"
-    CHANGED = "changed"
+    __slots__ = ()
 
+    def discard(self, key: str) -> None:
+        pass
 
-@dataclass
-class ChangeTrackerLog:
-    field: str
-    old_value: any
-    new_value: any
-    action: ChangeTrackerAction
-    init: bool = None
-    timestamp: datetime = None
-    commit_id: int = None
+    def clear(self) -> None:
+        pass
 
+    def __reduce__(self):
+        # pickle та copy повертають той самий спільний екземпляр
+        return "_NO_KEYS"
 
-@dataclass
-class ChangeTrackerLogs:
-    data: list[ChangeTrackerLog]
 
-    def get_filtered_data(self, filter_action: ChangeTrackerAction = None, filter_init: bool = None) -> list[ChangeTrackerLog]:
-        """
-        Повертає відфільтрований список журналів змін (ChangeTrackerLog) відповідно до заданих фільтрів.
+_NO_KEYS = _EmptyKeys()
 
-        :param filter_action: Якщо вказано, повертає лише зміни з відповідним типом дії (створення, видалення, зміна).
-        :param filter_init: 
-            Якщо True — повертає лише ініціалізаційні зміни. 
-            Якщо False — повертає лише зміни після ініціалізації. 
-            Якщо None — повертає всі зміни незалежно від ознаки ініціалізації.
-        :return: list[ChangeTrackerLog] - Відфільтрований список журналів змін.
-        """
-        
-        data = self.data
-        if filter_action is not None:
-            data = [log for log in self.data if log.action == filter_action]
-        
-        if filter_init is not None:
-            data = [log for log in self.data if log.init == filter_init]
-        
-        return data
 
+class ChangeTrackerDiffMode(Enum):
+    # Один запис на поле зі старим та новим значенням поля цілком
+    FIELD = "field"
+    # Один запис на змінений листок вкладеної структури (address.city, items[3].price)
+    PATH = "path"
+    # Як PATH, але списки порівнюються поелементно: вставки, видалення, заміни та переміщення (MOVED)
+    ELEMENTS = "elements"
 
 
 def get_filtered_data(
@@ -100,53 +113,405 @@ def get_action_change(field: str, old_data: any, new_data: any) -> ChangeTracker
     elif field in old_data and field in new_data and old_data[field] != new_data[field]:
         return ChangeTrackerAction.CHANGED
 
-#!todo Залишалась проблема
-# - після commit() дочірнього об'єкта, батьківський об'єкт все ще думає що в дочірньому все ще є зміни 
-# через те що не оновився original_data батька
-class ChangeTracker:
+class _TrackedBaseline:
+    """
+    Базовий стан поля з відстежуваним контейнером, який ще не змінювався після коміту.
+    Замість повної копії зберігається посилання на сам контейнер: перед першою мутацією
+    контейнер сповіщає ChangeTracker, і той фіксує справжній "знімок" (copy-on-write).
+    """
+
+    __slots__ = ("container",)
+
+    def __init__(self, container: TrackedContainer):
+        self.container = container
+
 
+class _HashedBaseline:
     """
-    Клас ChangeTracker призначений для відстеження змін у даних об'єкта. 
-    Він дозволяє фіксувати початковий стан, зберігати історію змін (створення, оновлення, видалення полів), 
-    а також фільтрувати поля для відстеження за допомогою режимів включення (ChangeTrackerIncludeMode) та списку дозволених полів. 
-    Клас зберігає журнал змін із детальною інформацією про кожну зміну, 
-    включаючи старе та нове значення, час зміни, тип дії та ознаку ініціалізації.
+    Базовий стан поля, для якого зберігається лише структурний хеш (hash_only_fields).
+    Дозволяє визначити, чи змінилось поле, але не зберігає старого значення.
+    """
+
+    __slots__ = ("hash",)
+
+    def __init__(self, value_hash: int):
+        self.hash = value_hash
+
+
+class _FieldCheckpoint:
+    """
+    Чекпоінт коміту, записи якого не відтворюються операціями над станом (див. _is_replayable): стан лише тих полів,
+    які змінив коміт (MISSING — поле видалено). Повна копія стану копіювала б і незмінені контейнери.
     """
 
-    _include_mode: ChangeTrackerIncludeMode
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: dict[str, any]):
+        self.fields = fields
+
+
+class _ChangeTrackerConfig:
+    """
+    Налаштування ChangeTracker, що не змінюються після __init__. Один екземпляр спільний для всіх об'єктів
+    з однаковою конфігурацією (_get_config), тож об'єкт тримає їх в одному слоті _config.
+    Службові атрибути _filter_plan, _sink, _retention тощо читаються звідси (див. _config_attribute).
+    """
+
+    __slots__ = (
+        "filter_plan", "hash_only_fields", "diff_mode", "retention", "sink", "checkpoint_interval", "instrumentation",
+        "coalescing", "cache_changed_data", "__weakref__"
+    )
+
+    def __init__(self, filter_plan: FieldFilterPlan, hash_only_fields: frozenset[str], diff_mode: "ChangeTrackerDiffMode", retention: ChangeTrackerRetention, sink: ChangeLogSink, checkpoint_interval: int, instrumentation: ChangeTrackerInstrumentation, coalescing: ChangeTrackerCoalescing, cache_changed_data: bool):
+        self.filter_plan = filter_plan
+        self.hash_only_fields = hash_only_fields
+        self.diff_mode = diff_mode
+        self.retention = retention
+        self.sink = sink
+        self.checkpoint_interval = checkpoint_interval
+        self.instrumentation = instrumentation
+        self.coalescing = coalescing
+        self.cache_changed_data = cache_changed_data
+
+    def __reduce__(self):
+        # pickle та copy: без приймача журналу та instrumentation — відновлений об'єкт не пише в приймач
+        return _ChangeTrackerConfig, (
+            self.filter_plan, self.hash_only_fields, self.diff_mode, self.retention, None, self.checkpoint_interval, None,
+            self.coalescing, self.cache_changed_data
+        )
+
+
+# Спільні налаштування; запис зникає разом з останнім об'єктом, що їх використовує
+_CONFIGS = weakref.WeakValueDictionary()
+
+
+def _get_config(filter_plan: FieldFilterPlan, hash_only_fields: frozenset[str], diff_mode: "ChangeTrackerDiffMode", retention: ChangeTrackerRetention, sink: ChangeLogSink, checkpoint_interval: int, instrumentation: ChangeTrackerInstrumentation, coalescing: ChangeTrackerCoalescing, cache_changed_data: bool) -> _ChangeTrackerConfig:
+    """Повертає спільні налаштування для конфігурації (створює під час першого виклику)."""
+    # Приймач та instrumentation порівнюються за ідентичністю; налаштування тримають їх, тож id не перевикористовуються
+    key = (filter_plan, hash_only_fields, diff_mode, retention, id(sink), checkpoint_interval, id(instrumentation), coalescing, cache_changed_data)
+    config = _CONFIGS.get(key)
+    if config is None:
+        config = _ChangeTrackerConfig(filter_plan, hash_only_fields, diff_mode, retention, sink, checkpoint_interval, instrumentation, coalescing, cache_changed_data)
+        _CONFIGS[key] = config
+    return config
+
+
+def _config_attribute(path: str) -> property:
+    """Службовий атрибут ChangeTracker, що читається зі спільних налаштувань (_config) за шляхом path."""
+    return property(attrgetter(f"_config.{path}"))
+
+
+class _ChangeTrackerExtras:
+    """
+    Рідко потрібний стан окремого ChangeTracker: чекпоінти, блокування (thread_safe), відкладений коміт (coalescing)
+    та статистика кешу get_changed_data(). Створюється під час першого запису такого стану; до того слот _extras
+    містить спільний екземпляр _NO_EXTRAS зі значеннями за замовчуванням (його не змінюють).
+    """
+
+    __slots__ = ("checkpoints", "lock", "commit_lock", "async_lock", "queued_dirty", "pending_commit", "changes_stats")
+
+    def __init__(self):
+        self.checkpoints = _NO_CHECKPOINTS
+        self.lock = None
+        self.commit_lock = None
+        self.async_lock = None
+        # Мітки "брудних" полів, зняті викликами acommit(), що чекають черги
+        self.queued_dirty = ()
+        self.pending_commit = None
+        self.changes_stats = _NO_STATS
+
+
+_NO_EXTRAS = _ChangeTrackerExtras()
+
+
+def _extra_attribute(name: str) -> property:
+    """
+    Службовий атрибут ChangeTracker, що зберігається в _ChangeTrackerExtras. Запис значення за замовчуванням
+    не створює власних _extras об'єкта.
+    """
+    def set(self, value: any) -> None:
+        extras = self._extras
+        if extras is _NO_EXTRAS:
+            if value is getattr(_NO_EXTRAS, name):
+                return
+            extras = _ChangeTrackerExtras()
+            object.__setattr__(self, "_extras", extras)
+        setattr(extras, name, value)
+
+    return property(attrgetter(f"_extras.{name}"), set)
+
+
+# Методи, якими ChangeTracker перехоплює присвоєння та видалення полів (dirty_tracking, track_containers, thread_safe)
+_ATTRIBUTE_HOOKS = ("__setattr__", "__delattr__")
+
+
+def _intercept_attributes(cls: type) -> None:
+    """
+    Вмикає перехоплення присвоєнь і видалень атрибутів для класу cls. Доти присвоєння в підкласах ChangeTracker
+    виконує object.__setattr__ без жодних накладних витрат (див. ChangeTrackerBase.__init_subclass__).
+    """
+    for name in _ATTRIBUTE_HOOKS:
+        if cls.__dict__.get(name) is getattr(object, name):
+            setattr(cls, name, getattr(ChangeTrackerBase, name))
+
+
+class _PreparedCommit:
+    """Результат першої фази коміту (_prepare_commit): зміни та новий базовий стан, ще не застосовані до об'єкта."""
+
+    __slots__ = ("own_state", "keys", "new_filtered_data", "logs", "snapshots", "hashes", "diff_mode", "fields", "captured_dirty", "metrics")
+
+    def __init__(self, own_state: bool, keys: set[str], new_filtered_data: dict[str, any], logs: list[ChangeTrackerLog], snapshots: dict[str, any], hashes: dict[str, int], diff_mode: "ChangeTrackerDiffMode", fields: dict[str, any] = None, captured_dirty: set[str] = None, metrics: CommitMetrics = None):
+        self.own_state = own_state
+        self.keys = keys
+        self.new_filtered_data = new_filtered_data
+        self.logs = logs
+        self.snapshots = snapshots
+        self.hashes = hashes
+        self.diff_mode = diff_mode
+        # Атрибути об'єкта на момент коміту (для thread_safe — копія, знята під блокуванням)
+        self.fields = fields
+        # thread_safe: "брудні" поля, враховані цим комітом (None — мітки не підмінялись)
+        self.captured_dirty = captured_dirty
+        # Метрики коміту (None — instrumentation вимкнено)
+        self.metrics = metrics
+
+
+class ChangeTrackerBase:
+    """
+    Спільна логіка ChangeTracker та SlottedChangeTracker (без власних слотів, тож не змінює розміщення атрибутів
+    підкласів). Поля читаються через _get_fields()/_get_field(): за замовчуванням — з __dict__ екземпляра.
+    Для перевірки, чи є значення відстежуваним об'єктом будь-якого виду, використовуйте isinstance(value, ChangeTrackerBase).
+    """
+
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in _ATTRIBUTE_HOOKS:
+            if name in cls.__dict__:
+                # Власний __setattr__/__delattr__ підкласу викликає super(): предки мають перехоплювати завжди
+                for base in cls.__mro__[1:]:
+                    if issubclass(base, ChangeTrackerBase) and base.__dict__.get(name) is getattr(object, name):
+                        setattr(base, name, getattr(ChangeTrackerBase, name))
+            elif getattr(cls, name) in (getattr(ChangeTrackerBase, name), getattr(object, name)):
+                # Поки жоден об'єкт класу не потребує перехоплення, присвоєння йдуть напряму в object (_intercept_attributes)
+                setattr(cls, name, getattr(object, name))
+
     _original_data: dict[str, any]
-    _changed_log: list[dict[str, any]]
+    _changed_log: ChangeLogStore
+    _dirty_keys: set[str]
+    _volatile_keys: set[str]
+    _child_keys: set[str]
+    _parent_links: tuple[tuple[weakref.ref, str], ...]
+    _tracked_keys: set[str]
+    _full_check: bool
+    _observable: bool
+    _original_hashes: dict[str, int]
+    _hash_cache: int
+    _changes_cache: tuple["ChangeTrackerDiffMode", list[ChangeTrackerLog]]
+    _config: _ChangeTrackerConfig
+    _extras: _ChangeTrackerExtras
+
+    # Налаштування, спільні для об'єктів з однаковою конфігурацією (_ChangeTrackerConfig)
+    _filter_plan = _config_attribute("filter_plan")
+    _include_mode = _config_attribute("filter_plan.include_mode")
+    _hash_only_fields = _config_attribute("hash_only_fields")
+    _diff_mode = _config_attribute("diff_mode")
+    _retention = _config_attribute("retention")
+    _sink = _config_attribute("sink")
+    _checkpoint_interval = _config_attribute("checkpoint_interval")
+    _instrumentation = _config_attribute("instrumentation")
+    _coalescing = _config_attribute("coalescing")
+
+    # Рідко потрібний стан об'єкта (_ChangeTrackerExtras), створюється під час першого запису
+    _checkpoints = _extra_attribute("checkpoints")
+    _changes_stats = _extra_attribute("changes_stats")
+    _pending_commit = _extra_attribute("pending_commit")
+    _lock = _extra_attribute("lock")
+    _commit_lock = _extra_attribute("commit_lock")
+    _async_lock = _extra_attribute("async_lock")
+    _queued_dirty = _extra_attribute("queued_dirty")
 
     # Системні ключі, які не повинні бути відстежені
     _SYSTEM_KEYS = [
         "_include_mode",
         "_original_data",
         "_changed_log",
+        "_dirty_keys",
+        "_volatile_keys",
+        "_child_keys",
+        "_parent_links",
+        "_tracked_keys",
+        "_full_check",
+        "_observable",
+        "_original_hashes",
+        "_hash_only_fields",
+        "_hash_cache",
+        "_changes_cache",
+        "_changes_stats",
+        "_diff_mode",
+        "_retention",
+        "_sink",
+        "_checkpoints",
+        "_checkpoint_interval",
+        "_filter_plan",
+        "_instrumentation",
+        "_coalescing",
+        "_pending_commit",
+        "_lock",
+        "_commit_lock",
+        "_async_lock",
+        "_queued_dirty",
+        "_config",
+        "_extras",
         "_SYSTEM_KEYS"
     ]
 
     def __init__(self, 
         include_mode: ChangeTrackerIncludeMode = ChangeTrackerIncludeMode.ONLY_PUBLIC, 
-        include_fields: Literal[list[str], "*"] = "*", #!TODO
+        include_fields: Literal[list[str], "*"] = "*",
+        exclude_fields: list[str] = None,
         original_data: dict[str, any] = None,
-        init_commit: bool = True
+        init_commit: bool = True,
+        init_log: bool = True,
+        deferred_baseline: bool = False,
+        dirty_tracking: bool = False,
+        track_containers: bool = False,
+        hash_compare: bool = False,
+        hash_only_fields: list[str] = None,
+        diff_mode: ChangeTrackerDiffMode = ChangeTrackerDiffMode.FIELD,
+        retention: ChangeTrackerRetention = None,
+        sink: ChangeLogSink = None,
+        checkpoint_interval: int = 100,
+        cache_changed_data: bool = True,
+        thread_safe: bool = False,
+        instrumentation: ChangeTrackerInstrumentation = None,
+        coalescing: ChangeTrackerCoalescing = None
     ):
+        """
+        :param include_mode: Режим включення полів для відстеження (ChangeTrackerIncludeMode).
+        :param include_fields: Список полів для відстеження або "*" для всіх полів.
+            Для "широких" об'єктів дозволяє відстежувати лише потрібні поля: решта атрибутів не переглядається взагалі.
+        :param exclude_fields: Список полів, які не потрібно відстежувати.
+        :param original_data: Початкові дані для init-коміту. Якщо не вказано, використовуються атрибути об'єкта.
+        :param init_commit: Якщо True, під час ініціалізації виконується commit(init=True).
+        :param init_log: Якщо False, init-коміт лише фіксує базовий стан: записи CREATED не створюються і не передаються
+            в приймач, commit_id не генерується. Початковий стан стає початковим станом журналу (для state_at() та revert_to()).
+            Наступні get_changed_data() та commit() повертають ті самі зміни, що й з init-журналом.
+        :param deferred_baseline: Якщо True, init-коміт не копіює поля: базовий стан тримає незмінні значення
+            та відстежувані контейнери (track_containers) за посиланням — "знімок" контейнера створюється лише перед його
+            першою мутацією (copy-on-write), а хеші hash_compare — під час першого порівняння. Копіюються лише інші
+            мутабельні значення (звичайні list/dict, вкладені об'єкти), бо їхні зміни на місці не відстежуються.
+            Разом з init_log=False прискорює масове завантаження об'єктів (наприклад, з бази даних).
+        :param dirty_tracking: Якщо True, вмикає відстеження "брудних" полів через __setattr__/__delattr__.
+            Тоді get_changed_data() та commit() знімають "знімок" і порівнюють лише поля, яким присвоювали
+            або які видаляли після останнього коміту, а також поля з мутабельними значеннями (list, dict,
+            вкладені об'єкти), які можуть змінитися на місці і тому завжди перевіряються повністю.
+        :param track_containers: Якщо True, значення list/dict у відстежуваних полях автоматично замінюються
+            на TrackedList/TrackedDict (під час ініціалізації та при присвоєнні). Вони сповіщають ChangeTracker
+            про мутації на місці, тому незмінені контейнери не копіюються й не порівнюються, а базовий стан
+            не тримає їхньої повної копії до першої зміни. Вмикає dirty_tracking.
+            Увага: поле отримує новий об'єкт-контейнер, тож зовнішні посилання на початковий list/dict
+            більше не пов'язані з полем.
+        :param hash_compare: Якщо True, для кожного поля зберігається структурний (Merkle-подібний) хеш значення.
+            Поле, хеш якого змінився, порівнюється повністю; поле з тим самим хешем лише звіряється з базовим станом
+            без копіювання (хеші — 128-бітні дайджести, див. hashing.hash_scalar).
+            Хеші відстежуваних контейнерів та вкладених ChangeTracker (з dirty_tracking) кешуються до наступної зміни.
+        :param hash_only_fields: Поля, для яких у _original_data зберігається лише хеш замість повної копії.
+            Для них журнал змін містить old_value=None; однаковий хеш означає незмінене поле (колізія 128-бітного
+            дайджесту практично неможлива).
+        :param diff_mode: Режим формування журналу змін за замовчуванням для get_changed_data() та commit() (ChangeTrackerDiffMode).
+        :param retention: Політика зберігання журналу змін (ChangeTrackerRetention). Після кожного коміту
+            найстаріші коміти, що виходять за обмеження, згортаються в один коміт-чекпоінт з чистими змінами полів.
+        :param sink: Приймач журналу змін (ChangeLogSink), у який commit() передає записи кожного коміту,
+            наприклад JsonlChangeLogSink або SqliteChangeLogSink. Приймач відповідає за буферизацію та закриття.
+        :param checkpoint_interval: Кожні checkpoint_interval комітів журналу зберігається повний стан об'єкта (чекпоінт),
+            тож state_at() та revert_to() відтворюють стан з найближчого чекпоінта, програючи не більше
+            checkpoint_interval комітів. None — без періодичних чекпоінтів (відтворення з початку журналу).
+        :param cache_changed_data: Якщо True, результат get_changed_data() кешується до наступної зміни полів,
+            мутації відстежуваного контейнера, зміни вкладеного ChangeTracker або коміту. Кеш використовується, лише
+            коли об'єкт бачить усі свої зміни (dirty_tracking/track_containers без полів з мутабельними значеннями),
+            інакше результат щоразу обчислюється заново. Статистика — changed_data_cache_info().
+        :param thread_safe: Якщо True, об'єкт можна змінювати та комітити з різних потоків. Присвоєння, видалення полів
+            та мутації відстежуваних контейнерів виконуються під блокуванням об'єкта, а commit() і get_changed_data()
+            тримають його лише на час копіювання посилань на поля та застосування результату: "знімки" й порівняння
+            виконуються без нього. Поля, змінені під час коміту, лишаються "брудними" до наступного коміту.
+            Мутації на місці звичайних list/dict виконуйте всередині locked().
+        :param instrumentation: Хуки pre_commit/post_commit та метрики фаз коміту (ChangeTrackerInstrumentation).
+            Один екземпляр можна передати багатьом об'єктам. None — без хуків і метрик.
+        :param coalescing: Політика згортання комітів (ChangeTrackerCoalescing): commit() відкладає коміт, доки не набереться
+            max_commits викликів або не мине max_delay, і журнал отримує лише чисті зміни за цей час. flush() комітить
+            відкладені зміни одразу. Таймер (timer=True) потребує thread_safe=True. None — commit() комітить одразу.
+        """
+        if coalescing is not None and coalescing.timer and not thread_safe:
+            raise ValueError("Coalescing timer requires thread_safe=True")
+        if dirty_tracking or track_containers or thread_safe:
+            _intercept_attributes(type(self))
 
-        self._include_mode = include_mode
+        # Рідко потрібний стан (_ChangeTrackerExtras) з'являється під час першого запису
+        self._extras = _NO_EXTRAS
+        # Налаштування спільні для всіх об'єктів з однаковою конфігурацією.
+        # Фільтр полів компілюється один раз для класу та конфігурації
+        filter_plan = get_filter_plan(
+            type(self),
+            include_mode,
+            include_fields=include_fields,
+            exclude_fields=_SYSTEM_FIELDS.union(exclude_fields) if exclude_fields else _SYSTEM_FIELDS
+        )
+        self._config = _get_config(
+            filter_plan,
+            frozenset(hash_only_fields) if hash_only_fields else _NO_FIELDS,
+            diff_mode,
+            retention,
+            sink,
+            checkpoint_interval,
+            instrumentation,
+            coalescing,
+            cache_changed_data
+        )
+        # None — об'єкт не синхронізується між потоками.
+        # _lock захищає поля та службові мітки (тримається недовго), _commit_lock впорядковує коміти об'єкта
+        if thread_safe:
+            self._lock = threading.RLock()
+            self._commit_lock = threading.RLock()
         self._original_data = {}
-        self._changed_log = []
+        # Спільне порожнє сховище до першого запису журналу (об'єкти без змін не тримають власного)
+        self._changed_log = _EMPTY_CHANGE_LOG
+        # Поки немає базового стану — наступне порівняння має бути повним
+        self._full_check = True
+        # None — відстеження "брудних" полів вимкнене; множини створюються під час першого додавання (_add_key)
+        self._dirty_keys = _NO_KEYS if dirty_tracking or track_containers else None
+        # Поля з мутабельними значеннями та з вкладеними ChangeTracker, які самі повідомляють про свої зміни (dirty_tracking)
+        self._volatile_keys = _NO_KEYS if self._dirty_keys is not None else None
+        self._child_keys = _NO_KEYS if self._dirty_keys is not None else None
+        # Зворотні посилання на батьківські ChangeTracker: (weakref батька, назва поля); кортеж замінюється цілком
+        self._parent_links = ()
+        # None — відстежувані контейнери вимкнені
+        self._tracked_keys = _NO_KEYS if track_containers else None
+        # None — порівняння за хешами вимкнене
+        self._original_hashes = {} if hash_compare else None
+        self._hash_cache = None
+        self._changes_cache = None
+        # True — перевірено, що об'єкт і вкладені ChangeTracker бачать усі свої зміни (_is_observable)
+        self._observable = False
+
+        # Замінюємо list/dict у відстежуваних полях на відстежувані контейнери
+        if track_containers:
+            for key, value in self._get_filtered_data(data=self._get_fields()).items():
+                wrapped = wrap_value(value, self, key)
+                if wrapped is not value:
+                    object.__setattr__(self, key, wrapped)
 
 
         # Автоматично викликаємо commit() під час ініціалізації
         if init_commit:
-            if (original_data is None):
-                original_data = self.__dict__
+            # original_data=None — поточні атрибути об'єкта
+            if init_log and not deferred_baseline:
+                self.commit(new_data=original_data, init=True)
             else:
-                pass
-
-            self.commit(new_data=original_data, init=True)
+                self._init_baseline(new_data=original_data, deferred=deferred_baseline, init_log=init_log)
     
-    def commit(self, new_data: dict[str, any] = None, init: bool = False, commit_id: str = None, timestamp: datetime = None) -> bool:
+    def commit(self, new_data: dict[str, any] = None, init: bool = False, commit_id: str = None, timestamp: datetime = None, diff_mode: ChangeTrackerDiffMode = None) -> bool:
         """
         Фіксує поточний стан відстежуваних полів об'єкта.
 
@@ -154,60 +519,396 @@ class ChangeTracker:
         :param init: Якщо True, усі поля логуються як ініціалізовані (bool, за замовчуванням False).
         :param commit_id: ID коміту. Якщо не вказано, генерується автоматично.
         :param timestamp: Час коміту. Якщо не вказано, використовується поточна дата та час.
+        :param diff_mode: Режим формування журналу змін (ChangeTrackerDiffMode). Якщо не вказано, використовується режим об'єкта.
 
         Опис:
             - Порівнює нові дані з попереднім збереженим станом (_original_data).
             - Для кожного поля, що змінилося, додає запис у журнал змін (_changed_log) із зазначенням старого та нового значення, часу зміни, типу дії (створення/зміна/видалення) та ознаки ініціалізації.
             - Оновлює _original_data до нового стану.
+            - Зі згортанням комітів (coalescing) коміт власного стану відкладається, доки не спрацює обмеження політики;
+              тоді commit() комітить зміни всіх відкладених викликів з commit_id, timestamp та diff_mode останнього з них.
+
+        :return: True — коміт виконано, False — коміт відкладено (coalescing).
         """
+        if self._coalescing is not None and new_data is None and not init:
+            pending = self._defer_commit(commit_id=commit_id, timestamp=timestamp, diff_mode=diff_mode)
+            if not pending.is_due(self._coalescing):
+                return False
+            commit_id, timestamp, diff_mode = pending.commit_id, pending.timestamp, pending.diff_mode
+        self._commit(new_data=new_data, init=init, commit_id=commit_id, timestamp=timestamp, diff_mode=diff_mode, visited=set(), memo=SnapshotMemo())
+        return True
 
-        # Отримуємо нові дані
-        if new_data is None:
-            new_data = self.__dict__
+    def flush(self) -> ChangeTrackerLogs:
+        """
+        Одразу виконує коміт, відкладений згортанням комітів (coalescing), з commit_id, timestamp та diff_mode
+        останнього відкладеного виклику commit().
 
-        # Фільтруємо нові дані
-        new_filtered_data = self._get_filtered_data(data=new_data)
+        :return: ChangeTrackerLogs — записи коміту; порожній, якщо відкладених комітів немає або зміни скасували одна одну.
+        """
+        with self._lock or _NO_LOCK:
+            pending = self._pending_commit
+        if pending is None:
+            return ChangeTrackerLogs(data=[])
+        logs = self._commit(
+            new_data=None, init=False, commit_id=pending.commit_id, timestamp=pending.timestamp, diff_mode=pending.diff_mode,
+            visited=set(), memo=SnapshotMemo()
+        )
+        return ChangeTrackerLogs(data=logs)
 
-        # Отримуємо зміни original_data -> new_filtered_data
-        changed_data = self.get_changed_data(new_data=new_filtered_data, skip_filter=True)
+    def _defer_commit(self, commit_id: str, timestamp: datetime, diff_mode: ChangeTrackerDiffMode) -> PendingCommit:
+        """Додає виклик commit() до відкладених (coalescing); з першим викликом запускається таймер політики."""
+        with self._lock or _NO_LOCK:
+            pending = self._pending_commit
+            if pending is None:
+                pending = self._pending_commit = PendingCommit()
+                if self._coalescing.timer:
+                    pending.start_timer(self._coalescing.max_delay, self)
+            pending.add(commit_id, timestamp, diff_mode)
+        return pending
 
-        # Якщо немає змін - нічого не робимо
-        if len(changed_data.data) == 0:
-            return True
+    def _settle_pending_commit(self, late_keys) -> None:
+        """
+        Коміт власного стану включив зміни відкладених викликів commit(). Зміни, зроблені після копіювання полів (thread_safe),
+        не потрапили в коміт — для них відкладається новий коміт, щоб політика (зокрема таймер) закомітила їх пізніше.
+        """
+        self._pending_commit.cancel()
+        self._pending_commit = None
+        if late_keys:
+            self._defer_commit(commit_id=None, timestamp=None, diff_mode=None)
+
+    def _init_baseline(self, new_data: dict[str, any], deferred: bool, init_log: bool) -> None:
+        """
+        Init-коміт для init_log=False та deferred_baseline=True (див. __init__).
+        Без deferred базовий стан обчислюється звичайним порівнянням; з deferred — без "знімків" значень,
+        які можна тримати за посиланням.
+        """
+        if deferred:
+            prepared = self._capture_commit(new_data=new_data, diff_mode=None, detach_dirty=False)
+            prepared.snapshots, prepared.hashes = self._deferred_snapshots(prepared)
+            prepared.logs = [
+                ChangeTrackerLog(field=key, old_value=None, new_value=self._get_field_snapshot(value), action=ChangeTrackerAction.CREATED)
+                for key, value in prepared.new_filtered_data.items()
+            ] if init_log else []
+        else:
+            prepared = self._prepare_commit(new_data=new_data)
+        if init_log:
+            self._apply_commit(prepared, init=True, commit_id=str(uuid.uuid4()), timestamp=datetime.now())
+        else:
+            self._apply_commit(prepared, write_log=False)
+
+    def _deferred_snapshots(self, prepared: "_PreparedCommit") -> tuple[dict[str, any], dict[str, int]]:
+        """Базовий стан для deferred_baseline: посилання замість "знімків", де значення не може змінитися непомітно."""
+        snapshots = {}
+        hashes = {}
+        memo = SnapshotMemo()
+        memo.push(self)
+        try:
+            for key, value in prepared.new_filtered_data.items():
+                if key in self._hash_only_fields:
+                    value_hash = hashes[key] = self._get_field_hash(value, memo)
+                    if value_hash is not None:
+                        snapshots[key] = _HashedBaseline(value_hash)
+                        continue
+                if is_immutable_value(value):
+                    snapshots[key] = value
+                elif prepared.own_state and self._is_own_container(key, value) and not value._ct_opaque:
+                    # Замінюється на _TrackedBaseline під час застосування (_apply_prepared)
+                    snapshots[key] = _TrackedBaseline(value)
+                else:
+                    snapshots[key] = self._get_field_snapshot(value, memo)
+        finally:
+            memo.pop(self)
+        return snapshots, hashes
+
+    def _commit(self, new_data: dict[str, any], init: bool, commit_id: str, timestamp: datetime, diff_mode: ChangeTrackerDiffMode, visited: set[int], memo: SnapshotMemo) -> list[ChangeTrackerLog]:
+        """
+        Виконує commit() та рекурсивно комітить вкладені ChangeTracker. Повертає записи коміту самого об'єкта.
+        visited містить id вже закомічених об'єктів — спільні вкладені об'єкти та цикли обробляються один раз.
+        memo спільний для всього рекурсивного коміту: знімки вкладених об'єктів, зроблені для батька, не повторюються.
+        """
+        visited.add(id(self))
+        if self._lock is not None:
+            # Інші потоки можуть змінити об'єкт після знімків, зроблених для батька, — вони не перевикористовуються
+            memo = SnapshotMemo()
+        metrics = self._instrumentation.begin(self) if self._instrumentation is not None else None
+        with self._commit_guard():
+            prepared = self._prepare_commit(new_data=new_data, diff_mode=diff_mode, memo=memo, metrics=metrics)
+            commit_id, timestamp = self._apply_changes(prepared, init=init, commit_id=commit_id, timestamp=timestamp)
+        if commit_id is None:
+            return prepared.logs
 
+        # Рекурсивно комітимо всі вкладені ChangeTracker, Зберігаючи commit_id, timestamp, init.
+        # Блокування коміту вже звільнене: вкладені об'єкти та батьки блокуються по одному (без взаємоблокувань у циклах)
+        started = (metrics.clock(), len(visited)) if metrics is not None else None
+        for value in list(prepared.fields.values()):
+            if isinstance(value, ChangeTrackerBase) and id(value) not in visited:
+                value._commit(new_data=None, init=init, commit_id=commit_id, timestamp=timestamp, diff_mode=None, visited=visited, memo=memo)
+        self._finish_commit(prepared, visited=visited, memo=memo, started=started)
+        return prepared.logs
+
+    def _apply_changes(self, prepared: "_PreparedCommit", init: bool, commit_id: str, timestamp: datetime, write_sink: bool = True) -> tuple[str, datetime]:
+        """
+        Застосовує підготовлений коміт для _commit() та _acommit(). Повертає commit_id та timestamp коміту для вкладених
+        об'єктів або (None, None), якщо змін немає — тоді оновлюються лише службові мітки, а метрики завершуються.
+        """
+        # Якщо немає змін - нічого не робимо
+        if len(prepared.logs) == 0:
+            self._apply_commit(prepared)
+            if prepared.metrics is not None:
+                self._instrumentation.end(self, prepared.logs, prepared.metrics)
+            return None, None
 
         if timestamp is None:
             timestamp = datetime.now()
         if commit_id is None:
             commit_id = str(uuid.uuid4())
+        self._apply_commit(prepared, init=init, commit_id=commit_id, timestamp=timestamp, write_sink=write_sink)
+        return commit_id, timestamp
+
+    def _finish_commit(self, prepared: "_PreparedCommit", visited: set[int], memo: SnapshotMemo, started: tuple[float, int]) -> None:
+        """Завершує коміт після вкладених об'єктів: оновлює базовий стан батьків і метрики (started — час і len(visited) до них)."""
+        # Батьки, які не комітились разом з об'єктом, отримують його новий стан у базовий стан
+        if prepared.own_state:
+            self._notify_parents_commit(skip=visited, memo=memo)
+
+        metrics = prepared.metrics
+        if metrics is not None:
+            metrics.children_seconds = metrics.clock() - started[0]
+            metrics.child_commits = len(visited) - started[1]
+            self._instrumentation.end(self, prepared.logs, metrics)
+
+    def _prepare_commit(self, new_data: dict[str, any] = None, diff_mode: ChangeTrackerDiffMode = None, memo: SnapshotMemo = None, metrics: CommitMetrics = None) -> "_PreparedCommit":
+        """
+        Перша фаза коміту: обчислює зміни та новий базовий стан, не змінюючи об'єкт.
+        Застосовується через _apply_commit() — так кілька об'єктів можна закомітити атомарно (див. bulk.commit_many).
+        Для thread_safe викликається під _commit_lock: під _lock знімається лише копія посилань на поля.
+        """
+        prepared = self._capture_commit(new_data=new_data, diff_mode=diff_mode, detach_dirty=self._lock is not None, metrics=metrics)
+        try:
+            self._diff_prepared(prepared, memo=memo)
+        except BaseException:
+            self._discard_prepared(prepared)
+            raise
+        return prepared
+
+    def _capture_commit(self, new_data: dict[str, any], diff_mode: ChangeTrackerDiffMode, detach_dirty: bool, metrics: CommitMetrics = None) -> "_PreparedCommit":
+        """
+        Початок першої фази коміту: знімає посилання на поля та ключі для порівняння (для thread_safe — під _lock).
+        Знімки й порівняння (_diff_prepared) потім можна виконувати без блокування або в іншому потоці.
+
+        :param detach_dirty: Мітки "брудних" полів переходять до коміту, а поля, змінені після цієї точки,
+            потрапляють у нову множину і лишаються "брудними" після коміту (зміни паралельно з порівнянням).
+        :param metrics: Метрики коміту (CommitMetrics) — заповнюються на всіх фазах коміту.
+        """
+        if metrics is not None:
+            started = metrics.clock()
+        own_state = new_data is None or new_data is self._get_fields()
+        captured_dirty = None
+        with self._lock or _NO_LOCK:
+            # Узгоджена копія посилань на поля, якщо об'єкт можуть змінювати під час порівняння
+            fields = self._get_fields(copy=detach_dirty)
+            if own_state:
+                new_data = fields
+            # Ключі, які потрібно порівняти (None — всі ключі)
+            keys = self._get_dirty_candidates() if own_state else None
+            if detach_dirty and self._dirty_keys is not None:
+                captured_dirty = self._dirty_keys
+                self._dirty_keys = _NO_KEYS
+            # Фільтруємо нові дані
+            new_filtered_data = self._get_filtered_data(data=new_data, keys=keys)
+        if metrics is not None:
+            metrics.fields_scanned = len(new_filtered_data) if keys is None else len(keys)
+            metrics.capture_seconds = metrics.clock() - started
+        return _PreparedCommit(
+            own_state=own_state,
+            keys=keys,
+            new_filtered_data=new_filtered_data,
+            logs=None,
+            snapshots=None,
+            hashes=None,
+            diff_mode=diff_mode or self._diff_mode,
+            fields=fields,
+            captured_dirty=captured_dirty,
+            metrics=metrics
+        )
+
+    def _diff_prepared(self, prepared: "_PreparedCommit", memo: SnapshotMemo = None) -> None:
+        """Знімки та порівняння для полів, знятих _capture_commit(). Об'єкт не змінюється, тож це можна робити в іншому потоці."""
+        metrics = prepared.metrics
+        if metrics is not None:
+            if memo is None:
+                memo = SnapshotMemo()
+            started, visits = metrics.clock(), memo.visits
+        # Отримуємо зміни original_data -> new_filtered_data
+        prepared.logs, prepared.snapshots, prepared.hashes = self._diff_fields(
+            prepared.new_filtered_data, keys=prepared.keys, diff_mode=prepared.diff_mode, memo=memo
+        )
+        if metrics is not None:
+            metrics.diff_seconds = metrics.clock() - started
+            metrics.snapshot_nodes = memo.visits - visits
+
+    def _discard_prepared(self, prepared: "_PreparedCommit") -> None:
+        """Скасовує підготовлений, але не застосований коміт (повертає мітки "брудних" полів, узяті ним)."""
+        self._restore_dirty_keys(prepared.captured_dirty)
+
+    def _restore_dirty_keys(self, captured_dirty: set[str]) -> None:
+        if captured_dirty:
+            with self._lock or _NO_LOCK:
+                for key in captured_dirty:
+                    self._add_key("_dirty_keys", key)
+
+    def _apply_commit(self, prepared: "_PreparedCommit", init: bool = False, commit_id: str = None, timestamp: datetime = None, write_sink: bool = True, write_log: bool = True) -> None:
+        """
+        Друга фаза коміту: оновлює базовий стан (_original_data), службові мітки та журнал змін.
+        Якщо змін немає, оновлюються лише службові мітки (commit_id та timestamp не потрібні).
+        write_sink=False — записи не передаються в приймач (acommit() робить це в executor).
+        write_log=False — оновлюється лише базовий стан, журнал не змінюється (init_log=False).
+        """
+        metrics = prepared.metrics
+        if metrics is not None:
+            started = metrics.clock()
+        if self._lock is None:
+            self._apply_prepared(prepared, init=init, commit_id=commit_id, timestamp=timestamp, write_sink=write_sink, write_log=write_log)
+        else:
+            with self._lock:
+                self._apply_prepared(prepared, init=init, commit_id=commit_id, timestamp=timestamp, write_sink=write_sink, write_log=write_log)
+        if metrics is not None:
+            metrics.apply_seconds = metrics.clock() - started
+            metrics.commit_id = commit_id
+            metrics.entries_logged = len(prepared.logs)
+            metrics.fields_changed = len({_root_field(log.field) for log in prepared.logs})
+
+    def _apply_prepared(self, prepared: "_PreparedCommit", init: bool, commit_id: str, timestamp: datetime, write_sink: bool, write_log: bool = True) -> None:
+        keys = prepared.keys
+        new_filtered_data = prepared.new_filtered_data
+        snapshots = prepared.snapshots
+        changed_logs = prepared.logs
+        self._changes_cache = None
+        # thread_safe: поля, змінені після копіювання посилань — їхній новий стан не потрапив у цей коміт
+        late_keys = self._dirty_keys if prepared.captured_dirty is not None else ()
+        if prepared.captured_dirty is not None and self._queued_dirty:
+            # acommit(): поля, зняті наступними комітами в черзі, також змінені після цього коміту
+            late_keys = late_keys.union(*self._queued_dirty)
+        if self._pending_commit is not None and prepared.own_state:
+            self._settle_pending_commit(late_keys)
+
+        # Оновлюємо збережені хеші полів
+        if self._original_hashes is not None:
+            for key, value_hash in prepared.hashes.items():
+                if value_hash is None:
+                    self._original_hashes.pop(key, None)
+                else:
+                    self._original_hashes[key] = value_hash
+            compared_keys = self._original_hashes.keys() if keys is None else keys
+            for key in compared_keys - new_filtered_data.keys():
+                self._original_hashes.pop(key, None)
+            # Хеш міг бути обчислений посеред зміни поля — такі поля наступного разу порівнюються повністю
+            for key in late_keys:
+                self._original_hashes.pop(key, None)
+
+        # Оновлюємо мітки "брудних" полів: після коміту власного стану все синхронізовано
+        if self._dirty_keys is not None:
+            if keys is None:
+                self._volatile_keys = _NO_KEYS
+                self._child_keys = _NO_KEYS
+                if self._tracked_keys is not None:
+                    self._tracked_keys = _NO_KEYS
+                for k, v in new_filtered_data.items():
+                    self._classify_field(k, v)
+                # Пізні зміни вже класифіковані під час присвоєння — відновлюємо класифікацію за поточними значеннями
+                current = self._get_fields() if late_keys else None
+                for k in late_keys:
+                    if k in current:
+                        self._classify_field(k, current[k])
+                    else:
+                        self._volatile_keys.discard(k)
+                        self._child_keys.discard(k)
+            self._full_check = not prepared.own_state
+            if self._full_check:
+                self._reset_observable()
+            if prepared.captured_dirty is None:
+                self._dirty_keys.clear()
+        else:
+            # Без dirty_tracking зворотні посилання вкладених ChangeTracker встановлюються під час коміту
+            for key, value in new_filtered_data.items():
+                if isinstance(value, ChangeTrackerBase):
+                    value._link_parent(self, key)
+
+        if write_log and len(changed_logs) == 0:
+            return
+
+        # Базовий стан без записів журналу (init_log=False) — початковий стан журналу для state_at() та revert_to()
+        if write_log and not self._changed_log.commits and None not in self._checkpoints and self._original_data:
+            self._set_checkpoint(None, self._make_checkpoint(prepared))
+
+        # Контейнери, змінені після копіювання посилань, уже зафіксували свій стан на момент порівняння (copy-on-write)
+        late_baselines = {
+            key: self._original_data[key] for key in late_keys
+            if type(snapshots.get(key)) is _TrackedBaseline and key in self._original_data
+        }
 
         # Оновлюємо оригінальні дані
-        self._original_data = {
-            k: self._get_field_snapshot(v) for k, v in new_filtered_data.items()
-        }    
-     
-        # Рекурсивно комітимо всі вкладені ChangeTracker, Зберігаючи commit_id, timestamp, init
-        for key, value in self.__dict__.items():
-            if isinstance(value, ChangeTracker):
-                value.commit(init=init, commit_id=commit_id, timestamp=timestamp)
+        if keys is None:
+            self._original_data = snapshots
+        else:
+            for key in keys:
+                if key in snapshots:
+                    self._original_data[key] = snapshots[key]
+                else:
+                    self._original_data.pop(key, None)
+        self._original_data.update(late_baselines)
+
+        # Для відстежуваних контейнерів тримаємо посилання замість повної копії (copy-on-write)
+        if self._tracked_keys:
+            for key in self._tracked_keys:
+                value = new_filtered_data.get(key)
+                if key not in late_keys and self._is_own_container(key, value) and not value._ct_opaque:
+                    self._original_data[key] = _TrackedBaseline(value)
 
-        for changed_log in changed_data.data:            
-            # Логуємо зміни
+        if not write_log:
+            return
+
+        for changed_log in changed_logs:
             # Оновлюємо дані ChangeTrackerLog об'єктів. Додаємо timestamp, commit_id, init
             changed_log.timestamp = timestamp
             changed_log.commit_id = commit_id
             changed_log.init = init
-            self._changed_log.append(changed_log)
 
-        return True
+        # Логуємо зміни. commit_id, timestamp та init зберігаються один раз на коміт
+        if self._changed_log is _EMPTY_CHANGE_LOG:
+            self._changed_log = ChangeLogStore()
+        self._changed_log.append_commit(changed_logs, commit_id=commit_id, timestamp=timestamp, init=init)
+
+        # Передаємо зміни в приймач журналу
+        if self._sink is not None and write_sink:
+            self._sink.write(changed_logs)
 
+        commit_count = len(self._changed_log.commits)
+        if self._checkpoint_interval and commit_count % self._checkpoint_interval == 0:
+            self._set_checkpoint(commit_id, self._make_checkpoint(prepared))
+        elif not _is_replayable(changed_logs, prepared.diff_mode):
+            # Записи, які не відтворюються операціями (діапазони обробників diff), — зберігаємо стан полів, змінених комітом
+            keys = {_root_field(changed_log.field) for changed_log in changed_logs}
+            self._set_checkpoint(commit_id, _FieldCheckpoint(self._make_checkpoint(prepared, keys)))
 
-    def get_changed_data(self, new_data: dict[str, any] = None, skip_filter: bool = False) -> ChangeTrackerLogs:
+        # Обмежуємо розмір журналу змін
+        if self._retention is not None and exceeds_retention(self._changed_log, self._retention, timestamp):
+            fold_count = get_retention_fold_count(self._changed_log, self._retention, timestamp)
+            if fold_count > 1:
+                self._fold_change_log(fold_count)
+
+
+    def get_changed_data(self, new_data: dict[str, any] = None, skip_filter: bool = False, diff_mode: ChangeTrackerDiffMode = None) -> ChangeTrackerLogs:
         """
         Повертає журнал змін між збереженим станом об'єкта та новим станом.
 
-        :param new_data: Нові дані для порівняння. Якщо не вказано, використовуються поточні атрибути об'єкта (self.__dict__).
+        :param new_data: Нові дані для порівняння. Якщо не вказано, використовуються поточні атрибути об'єкта (_get_fields()).
         :param skip_filter: Якщо True, не застосовувати фільтрацію полів (використовувати дані як є, для випадків коли дані попередньо фільтрувались).
+        :param diff_mode: Режим формування журналу змін (ChangeTrackerDiffMode). Якщо не вказано, використовується режим об'єкта.
+            У режимі PATH для кожного зміненого листка вкладеної структури створюється окремий запис
+            (field="address.city", field="items[3].price") лише зі зміненими значеннями.
+            У режимі ELEMENTS списки додатково порівнюються поелементно (вставки, видалення, заміни, переміщення),
+            тож додавання одного елемента в довгий список дає один запис.
         :return: ChangeTrackerLogs — список змін (додавання, зміна, видалення полів) з інформацією про старе та нове значення.
         
         Опис:
@@ -215,76 +916,1081 @@ class ChangeTracker:
             - Визначає, які поля були додані, змінені або видалені.
             - Для кожної зміни створює ChangeTrackerLog із деталями змін.
         """
-        result = []
+        with self._commit_guard():
+            return self._get_changed_data(new_data=new_data, skip_filter=skip_filter, diff_mode=diff_mode)
+
+    def _get_changed_data(self, new_data: dict[str, any], skip_filter: bool, diff_mode: ChangeTrackerDiffMode) -> ChangeTrackerLogs:
+        cached, capture = self._capture_changes(new_data=new_data, skip_filter=skip_filter, diff_mode=diff_mode, copy_fields=self._lock is not None)
+        if cached is not None:
+            return cached
+        new_filtered_data, keys, pending = capture
+        result, _, _ = self._diff_fields(new_filtered_data, keys=keys, diff_mode=pending[0])
+        return self._cache_changes(pending, result)
+
+    def _capture_changes(self, new_data: dict[str, any], skip_filter: bool, diff_mode: ChangeTrackerDiffMode, copy_fields: bool) -> tuple[ChangeTrackerLogs, tuple]:
+        """
+        Початок get_changed_data(): повертає (кешований результат, None) або (None, (відфільтровані дані, ключі, позначка кешу)).
+        Позначка кешу — (diff_mode, None), для _cache_changes(); copy_fields — скопіювати посилання на поля (порівняння
+        виконуватиметься паралельно зі змінами об'єкта).
+        """
         # Отримуємо поточні дані, які потрібно порівняти
-        if new_data is None:
-            new_data = self.__dict__
-        
-        # Фільтруємо нові дані
-        if not skip_filter:
-            new_filtered_data = self._get_filtered_data(data=new_data)
-        else:
-            new_filtered_data = new_data
+        own_state = new_data is None or new_data is self._get_fields()
+        diff_mode = diff_mode or self._diff_mode
+        with self._lock or _NO_LOCK:
+            if own_state:
+                # Узгоджена копія посилань на поля: порівняння виконується без блокування
+                new_data = self._get_fields(copy=copy_fields)
+
+            # Кешований результат: поки об'єкт не змінювався, порівняння дасть те саме
+            pending = None
+            if own_state and not skip_filter and self._config.cache_changed_data:
+                if self._is_observable():
+                    stats = self._changes_stats
+                    if stats is _NO_STATS:
+                        stats = self._changes_stats = {}
+                    cached = self._changes_cache
+                    if cached is not None and cached[0] == diff_mode and cached[1] is not None:
+                        stats["hits"] = stats.get("hits", 0) + 1
+                        return ChangeTrackerLogs(data=list(cached[1])), None
+                    stats["misses"] = stats.get("misses", 0) + 1
+                    # Зміна полів під час порівняння скидає цю позначку — тоді застарілий результат не кешується
+                    pending = (diff_mode, None)
+                    self._changes_cache = pending
+                else:
+                    cls = type(self)
+                    _BYPASSED_CALLS[cls] = _BYPASSED_CALLS.get(cls, 0) + 1
+
+            # Ключі, які потрібно порівняти (None — всі ключі)
+            keys = self._get_dirty_candidates() if own_state else None
+
+            # Фільтруємо нові дані
+            if not skip_filter:
+                new_filtered_data = self._get_filtered_data(data=new_data, keys=keys)
+            else:
+                new_filtered_data = new_data
+        return None, (new_filtered_data, keys, pending or (diff_mode, None))
+
+    def _cache_changes(self, pending: tuple, result: list[ChangeTrackerLog]) -> ChangeTrackerLogs:
+        """Кешує результат порівняння, якщо об'єкт не змінювався з моменту _capture_changes()."""
+        with self._lock or _NO_LOCK:
+            if self._changes_cache is pending:
+                self._changes_cache = (pending[0], list(result))
+        return ChangeTrackerLogs(data=result)
+
+    def changed_data_cache_info(self) -> dict[str, int]:
+        """
+        Повертає статистику кешу get_changed_data(): hits — результат узято з кешу, misses — обчислено та закешовано,
+        bypassed — обчислено без кешування (об'єкт може змінитися непомітно); bypassed рахується для всіх об'єктів класу.
+        Порожній словник, якщо кеш вимкнено.
+        """
+        if not self._config.cache_changed_data:
+            return {}
+        return {"hits": 0, "misses": 0, **self._changes_stats, "bypassed": _BYPASSED_CALLS.get(type(self), 0)}
+
+    def acommit(self, new_data: dict[str, any] = None, init: bool = False, commit_id: str = None, timestamp: datetime = None, diff_mode: ChangeTrackerDiffMode = None, executor: Executor = None) -> Awaitable[ChangeTrackerLogs]:
+        """
+        Асинхронний commit(), що не блокує цикл подій на час копіювання та порівняння великих об'єктів.
+
+        Посилання на поля та мітки "брудних" полів знімаються синхронно під час виклику acommit(), ще до першого await:
+        кожен виклик комітить стан на момент свого виклику, навіть якщо кілька викликів чекають черги одночасно.
+        "Знімки", порівняння та запис у приймач журналу виконуються в executor, коли настає черга коміту; базовий стан
+        і журнал оновлюються знову в циклі подій. Поля, змінені під час порівняння, лишаються "брудними" до наступного
+        коміту. Коміти одного об'єкта (зокрема вкладених ChangeTracker) виконуються в порядку викликів. Вкладені
+        ChangeTracker знімаються, коли до них доходить коміт батька. Об'єкт з thread_safe=True комітиться в executor
+        цілком, під своїми блокуваннями. Поки acommit() не завершився, не викликайте для цього ж об'єкта синхронний
+        commit() з циклу подій. Результат acommit() потрібно дочекатися (await): інакше знятий стан не закомітиться,
+        а його поля не лишаться "брудними" (коміт, скасований під час очікування черги, повертає мітки).
+
+        :param executor: Executor для знімків, порівняння та запису в приймач. None — executor циклу подій за замовчуванням.
+        :return: Awaitable з ChangeTrackerLogs — записи цього коміту (без записів вкладених ChangeTracker).
+        Решта параметрів — як у commit().
+        """
+        committing = self._acommit(
+            new_data=new_data, init=init, commit_id=commit_id, timestamp=timestamp, diff_mode=diff_mode, executor=executor, visited=set()
+        )
+
+        async def wait_logs() -> ChangeTrackerLogs:
+            return ChangeTrackerLogs(data=await committing)
+
+        return wait_logs()
+
+    def _acommit(self, new_data: dict[str, any], init: bool, commit_id: str, timestamp: datetime, diff_mode: ChangeTrackerDiffMode, executor: Executor, visited: set[int]) -> Awaitable[list[ChangeTrackerLog]]:
+        """
+        Асинхронний _commit(): синхронно знімає поля об'єкта (_capture_commit) і повертає корутину решти коміту.
+        Кожен об'єкт порівнюється з власним memo, бо між кроками об'єкти можуть змінитися.
+        """
+        visited.add(id(self))
+        if self._lock is not None:
+            return self._acommit_in_executor(new_data, init, commit_id, timestamp, diff_mode, executor, visited)
+        metrics = self._instrumentation.begin(self) if self._instrumentation is not None else None
+        prepared = self._capture_commit(new_data=new_data, diff_mode=diff_mode, detach_dirty=True, metrics=metrics)
+        if prepared.captured_dirty is not None:
+            # Поля, зняті комітами в черзі, для попередніх комітів змінені "пізно" (_apply_prepared)
+            self._queued_dirty = self._queued_dirty + (prepared.captured_dirty,)
+        return self._acommit_prepared(prepared, init, commit_id, timestamp, executor, visited)
+
+    async def _acommit_in_executor(self, new_data: dict[str, any], init: bool, commit_id: str, timestamp: datetime, diff_mode: ChangeTrackerDiffMode, executor: Executor, visited: set[int]) -> list[ChangeTrackerLog]:
+        # thread_safe: коміт (разом з вкладеними об'єктами) виконується в executor під блокуваннями об'єктів
+        async with self._get_async_lock():
+            return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(
+                self._commit, new_data, init, commit_id, timestamp, diff_mode, visited, SnapshotMemo()
+            ))
+
+    async def _acommit_prepared(self, prepared: "_PreparedCommit", init: bool, commit_id: str, timestamp: datetime, executor: Executor, visited: set[int]) -> list[ChangeTrackerLog]:
+        """Решта _acommit() для знятих полів: у порядку викликів порівнює їх в executor і застосовує в циклі подій."""
+        loop = asyncio.get_running_loop()
+        applied = False
+        try:
+            async with self._get_async_lock():
+                self._dequeue_dirty(prepared)
+                try:
+                    await loop.run_in_executor(executor, self._diff_prepared, prepared, SnapshotMemo(concurrent=True))
+                except RuntimeError:
+                    # Контейнер змінився під час обходу — повторюємо в циклі подій, де змінити його зараз нікому
+                    self._diff_prepared(prepared, memo=SnapshotMemo())
+                applied = True
+                commit_id, timestamp = self._apply_changes(prepared, init=init, commit_id=commit_id, timestamp=timestamp, write_sink=False)
+                if commit_id is not None and self._sink is not None:
+                    await loop.run_in_executor(executor, self._sink.write, prepared.logs)
+        except BaseException:
+            if not applied:
+                self._dequeue_dirty(prepared)
+                self._discard_prepared(prepared)
+            raise
+        if commit_id is None:
+            return prepared.logs
+
+        # Рекурсивно комітимо всі вкладені ChangeTracker, Зберігаючи commit_id, timestamp, init
+        started = (prepared.metrics.clock(), len(visited)) if prepared.metrics is not None else None
+        for value in list(prepared.fields.values()):
+            if isinstance(value, ChangeTrackerBase) and id(value) not in visited:
+                await value._acommit(new_data=None, init=init, commit_id=commit_id, timestamp=timestamp, diff_mode=None, executor=executor, visited=visited)
+        self._finish_commit(prepared, visited=visited, memo=SnapshotMemo(), started=started)
+        return prepared.logs
+
+    def _dequeue_dirty(self, prepared: "_PreparedCommit") -> None:
+        if prepared.captured_dirty is not None and self._queued_dirty:
+            self._queued_dirty = tuple(keys for keys in self._queued_dirty if keys is not prepared.captured_dirty)
+
+    async def aget_changed_data(self, new_data: dict[str, any] = None, skip_filter: bool = False, diff_mode: ChangeTrackerDiffMode = None, executor: Executor = None) -> ChangeTrackerLogs:
+        """
+        Асинхронний get_changed_data(): посилання на поля знімаються синхронно в циклі подій, а "знімки" та порівняння
+        виконуються в executor. Результат описує присвоєння полів на момент виклику (мутації на місці — не раніше нього).
+
+        :param executor: Executor для порівняння. None — executor циклу подій за замовчуванням.
+        Решта параметрів — як у get_changed_data().
+        """
+        loop = asyncio.get_running_loop()
+        async with self._get_async_lock():
+            if self._lock is not None:
+                return await loop.run_in_executor(executor, functools.partial(self.get_changed_data, new_data, skip_filter, diff_mode))
+
+            cached, capture = self._capture_changes(new_data=new_data, skip_filter=skip_filter, diff_mode=diff_mode, copy_fields=True)
+            if cached is not None:
+                return cached
+            new_filtered_data, keys, pending = capture
+            diff = functools.partial(self._diff, new_filtered_data, keys=keys, diff_mode=pending[0])
+            try:
+                result, _, _ = await loop.run_in_executor(executor, functools.partial(diff, memo=SnapshotMemo(concurrent=True)))
+            except RuntimeError:
+                result, _, _ = diff()
+            return self._cache_changes(pending, result)
+
+    def _get_async_lock(self) -> asyncio.Lock:
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        return self._async_lock
+
+    @contextmanager
+    def locked(self):
+        """
+        Контекстний менеджер, що блокує об'єкт з thread_safe=True: поки він утримується, інші потоки не змінюють поля
+        та не комітять об'єкт. Використовується, щоб кілька змін потрапили в коміт разом, а також для мутацій на місці
+        звичайних (невідстежуваних) list/dict. Блокування реентерабельне: всередині можна викликати commit().
+        Без thread_safe нічого не блокує.
+
+            with tracker.locked():
+                tracker.balance -= amount
+                tracker.history.append(amount)
+        """
+        if self._lock is None:
+            yield self
+            return
+        # Порядок захоплення такий самий, як у commit(): спершу блокування коміту, потім полів
+        with self._commit_lock, self._lock:
+            yield self
+
+    def _commit_guard(self):
+        """Блокування, що впорядковує коміти та порівняння об'єкта (thread_safe), або порожній контекст."""
+        return self._commit_lock or _NO_LOCK
+
+    def _diff_fields(self, new_filtered_data: dict[str, any], keys: set[str] = None, diff_mode: ChangeTrackerDiffMode = None, memo: SnapshotMemo = None) -> tuple[list[ChangeTrackerLog], dict[str, any], dict[str, int]]:
+        """
+        _diff() для полів, посилання на які скопійовані під блокуванням (thread_safe).
+        Якщо відстежуваний контейнер змінився під час обходу ("dictionary changed size during iteration"),
+        порівняння повторюється під блокуванням, яке мутації відстежуваних контейнерів також утримують.
+        """
+        if self._lock is None:
+            return self._diff(new_filtered_data, keys=keys, diff_mode=diff_mode, memo=memo)
+        try:
+            return self._diff(new_filtered_data, keys=keys, diff_mode=diff_mode, memo=memo)
+        except RuntimeError:
+            with self._lock:
+                return self._diff(new_filtered_data, keys=keys, diff_mode=diff_mode, memo=SnapshotMemo())
+
+    def _diff(self, new_filtered_data: dict[str, any], keys: set[str] = None, diff_mode: ChangeTrackerDiffMode = None, memo: SnapshotMemo = None) -> tuple[list[ChangeTrackerLog], dict[str, any], dict[str, int]]:
+        """
+        Порівнює відфільтровані нові дані з _original_data.
+
+        :param new_filtered_data: Відфільтровані нові дані.
+        :param keys: Ключі, які потрібно порівняти. Якщо None — порівнюються всі ключі з обох словників.
+        :param diff_mode: Режим формування журналу змін. Якщо None — режим об'єкта.
+        :param memo: Таблиця ідентичності для знімків та хешів (SnapshotMemo). Якщо None — створюється нова.
+        :return: Кортеж (список ChangeTrackerLog, новий базовий стан для порівняних ключів, хеші нових значень).
+        """
+        result = []
+        snapshots = {}
+        hashes = {}
+        use_hash = self._original_hashes is not None
+        hash_only_fields = self._hash_only_fields
+        diff_mode = diff_mode or self._diff_mode
+        path_mode = diff_mode != ChangeTrackerDiffMode.FIELD
+        elements = diff_mode == ChangeTrackerDiffMode.ELEMENTS
 
         # Отримуємо оригінальні дані з останьго коміту
         original_data = self._original_data
 
         # Знаходимо всі унікальні ключі з обох словників
-        all_keys = set(new_filtered_data.keys()) | set(original_data.keys())
-
-        # Порівнюємо нові та оригінальні дані
-        for key in all_keys:
-            old_value = original_data.get(key, None)
-            new_value = new_filtered_data.get(key, None)
-            new_value = self._get_field_snapshot(new_value)
-            action = get_action_change(key, original_data, new_filtered_data)
-
-            if old_value != new_value:
-                result.append(ChangeTrackerLog(
-                    field=key,
-                    old_value=old_value,
-                    new_value=new_value,
-                    action=action,
-                    init=None,
-                    timestamp=None,
-                    commit_id=None
-                ))
+        if keys is None:
+            all_keys = set(new_filtered_data.keys()) | set(original_data.keys())
+        else:
+            all_keys = keys
 
-        return ChangeTrackerLogs(data=result)
+        # Сам об'єкт — корінь обходу: посилання полів на нього стають SnapshotRef
+        if memo is None:
+            memo = SnapshotMemo()
+        memo.push(self)
+        try:
+            # Порівнюємо нові та оригінальні дані
+            for key in all_keys:
+                if key not in new_filtered_data and key not in original_data:
+                    continue
+                old_value = original_data.get(key, None)
+                new_value = new_filtered_data.get(key, None)
+                if type(old_value) is _TrackedBaseline:
+                    # Контейнер не змінювався з моменту коміту — нічого не копіюємо і не порівнюємо
+                    if old_value.container is new_value and not new_value._ct_opaque and key not in (self._dirty_keys or ()):
+                        snapshots[key] = old_value
+                        continue
+                    old_value = self._get_field_snapshot(old_value.container, memo)
+
+                # Порівняння за хешем: однаковий хеш — поле не змінилось, копія не потрібна.
+                # Якщо базовий стан містить повний "знімок", збіг хешів лише підказка: значення звіряється з ним без копіювання
+                new_hash = None
+                if key in new_filtered_data and (use_hash or key in hash_only_fields):
+                    new_hash = self._get_field_hash(new_value, memo)
+                    hashes[key] = new_hash
+                    if new_hash is not None and key in original_data and new_hash == self._get_original_hash(key):
+                        if type(old_value) is _HashedBaseline or self._matches_snapshot(new_value, old_value):
+                            snapshots[key] = original_data[key]
+                            continue
+
+                # Для полів hash_only старе значення невідоме
+                hashed_old = type(old_value) is _HashedBaseline
+                if hashed_old:
+                    old_value = None
+
+                new_value = self._get_field_snapshot(new_value, memo)
+                if key in new_filtered_data:
+                    if key in hash_only_fields and new_hash is not None:
+                        snapshots[key] = _HashedBaseline(new_hash)
+                    else:
+                        snapshots[key] = new_value
+
+                if hashed_old or not values_equal(old_value, new_value):
+                    if key not in original_data:
+                        action = ChangeTrackerAction.CREATED
+                    elif key not in new_filtered_data:
+                        action = ChangeTrackerAction.DELETED
+                    else:
+                        action = ChangeTrackerAction.CHANGED
+                        if path_mode and not hashed_old:
+                            path_logs = [
+                                ChangeTrackerLog(field=path, old_value=old, new_value=new, action=ChangeTrackerAction(op))
+                                for op, path, old, new in diff_paths(key, old_value, new_value, elements)
+                            ]
+                            # Поле змінилося, але обробник diff змін не знайшов — записуємо поле цілком
+                            if path_logs:
+                                result.extend(path_logs)
+                                continue
+                    result.append(ChangeTrackerLog(
+                        field=key,
+                        old_value=old_value,
+                        new_value=new_value,
+                        action=action,
+                        init=None,
+                        timestamp=None,
+                        commit_id=None
+                    ))
+        finally:
+            # Після винятку (див. _diff_fields) спільний memo лишається узгодженим
+            memo.pop(self)
+        return result, snapshots, hashes
+
+    def _get_original_hash(self, key: str) -> int:
+        baseline = self._original_data.get(key)
+        if type(baseline) is _HashedBaseline:
+            return baseline.hash
+        if self._original_hashes is not None:
+            return self._original_hashes.get(key)
+        return None
+
+    def _get_dirty_candidates(self) -> set[str]:
+        """
+        Повертає множину ключів, які потрібно порівняти в режимі dirty_tracking,
+        або None, якщо потрібне повне порівняння (режим вимкнено або базовий стан ще не синхронізований).
+        """
+        if self._dirty_keys is None or self._full_check:
+            return None
+        keys = {*self._dirty_keys, *self._volatile_keys}
+        if self._tracked_keys:
+            # Контейнери, що стали "непрозорими", перевіряємо повністю
+            keys.update(k for k in self._tracked_keys if getattr(self._get_field(k), "_ct_opaque", True))
+        if self._child_keys:
+            # Вкладені ChangeTracker порівнюємо, лише якщо вони не можуть гарантувати відсутність змін
+            keys.update(k for k in self._child_keys if not self._is_clean_child(k))
+        return keys
+
+    def _is_clean_child(self, key: str) -> bool:
+        value = self._get_field(key)
+        return isinstance(value, ChangeTrackerBase) and not value._dirty_keys and value._is_observable()
+
+    def _is_observable(self) -> bool:
+        """
+        Чи бачить об'єкт усі зміни свого стану (та стану вкладених ChangeTracker) без порівняння:
+        увімкнено dirty_tracking, базовий стан синхронізований і немає полів, які можуть змінитися непомітно
+        (мутабельні значення, "непрозорі" контейнери, вкладені об'єкти без dirty_tracking).
+
+        Позитивний результат запам'ятовується міткою _observable в усіх перевірених об'єктах, тож повторна перевірка
+        коштує O(1). Подія, яка може зробити об'єкт "непомітним", скидає мітку в ньому та в батьках (_reset_observable).
+        """
+        if self._observable:
+            return True
+        visited = {}
+        if not self._check_observable(visited):
+            return False
+        # Об'єкти з thread_safe змінюються з інших потоків — для піддерев з ними результат не запам'ятовується
+        if all(node._lock is None for node in visited.values()):
+            for node in visited.values():
+                node._observable = True
+        return True
+
+    def _check_observable(self, visiting: dict[int, "ChangeTrackerBase"]) -> bool:
+        if self._observable:
+            return True
+        if self._dirty_keys is None or self._full_check or self._volatile_keys:
+            return False
+        if self._tracked_keys and any(getattr(self._get_field(k), "_ct_opaque", True) for k in self._tracked_keys):
+            return False
+        # Цикли між вкладеними об'єктами: об'єкт, що вже перевіряється, перевіряє себе сам
+        visiting[id(self)] = self
+        for key in self._child_keys:
+            child = self._get_field(key)
+            if not isinstance(child, ChangeTrackerBase):
+                return False
+            if id(child) not in visiting and not child._check_observable(visiting):
+                return False
+        return True
+
+    def _reset_observable(self) -> None:
+        """
+        Скидає мітку _observable об'єкта та батьків (і далі вгору). Мітку батька ставить лише перевірка, що пройшла
+        і цей об'єкт, тож поширення зупиняється на об'єктах без мітки.
+        """
+        if not self._observable:
+            return
+        self._observable = False
+        for parent, _ in self._get_parents():
+            parent._reset_observable()
+
+    def _classify_field(self, key: str, value: any) -> None:
+        """
+        Відносить поле до однієї з груп для режиму dirty_tracking:
+        відстежуваний контейнер (_tracked_keys), вкладений ChangeTracker (_child_keys),
+        мутабельне значення, що потребує повної перевірки (_volatile_keys),
+        або незмінне значення (перевіряється лише після присвоєння).
+        """
+        if self._tracked_keys is not None and self._is_own_container(key, value):
+            self._add_key("_tracked_keys", key)
+            self._volatile_keys.discard(key)
+            return
+        if self._tracked_keys is not None:
+            self._tracked_keys.discard(key)
+        if isinstance(value, ChangeTrackerBase):
+            # Вкладений ChangeTracker сам повідомляє про свої зміни через зворотне посилання
+            value._link_parent(self, key)
+            self._add_key("_child_keys", key)
+            self._volatile_keys.discard(key)
+            # Мітка _observable не враховує новий вкладений об'єкт
+            self._reset_observable()
+            return
+        self._child_keys.discard(key)
+        if is_immutable_value(value):
+            self._volatile_keys.discard(key)
+        else:
+            self._add_key("_volatile_keys", key)
+            self._reset_observable()
+
+    def _add_key(self, name: str, key: str) -> None:
+        """Додає key до множини службового атрибута name (_dirty_keys тощо); спільну порожню множину замінює власною."""
+        keys = getattr(self, name)
+        if keys is _NO_KEYS:
+            object.__setattr__(self, name, {key})
+        else:
+            keys.add(key)
+
+    def _is_own_container(self, key: str, value: any) -> bool:
+        return isinstance(value, TrackedContainer) and value._ct_parent is self and value._ct_field == key
+
+    def _on_container_change(self, key: str, container: TrackedContainer) -> None:
+        """
+        Викликається відстежуваним контейнером перед мутацією.
+        Фіксує "знімок" базового стану поля (якщо зберігалось лише посилання) та позначає поле як "брудне".
+        """
+        with self._lock or _NO_LOCK:
+            self._invalidate_caches()
+            baseline = self._original_data.get(key)
+            if type(baseline) is _TrackedBaseline and baseline.container is container:
+                self._original_data[key] = self._get_field_snapshot(container)
+            if self._dirty_keys is not None:
+                self._add_key("_dirty_keys", key)
+                self._notify_parents_dirty()
+
+    def _on_container_opaque(self) -> None:
+        """Викликається відстежуваним контейнером поля, що став "непрозорим": його мутації вже не видно."""
+        self._reset_observable()
+
+    def _invalidate_caches(self) -> None:
+        """Скидає кеші, що залежать від поточного стану полів: хеш стану та результат get_changed_data()."""
+        self._hash_cache = None
+        self._changes_cache = None
+
+    def _link_parent(self, parent: "ChangeTrackerBase", field: str) -> None:
+        """Запам'ятовує, що об'єкт є значенням поля field батьківського ChangeTracker (слабке посилання)."""
+        for link, link_field in self._parent_links:
+            if link_field == field and link() is parent:
+                return
+        self._parent_links = self._parent_links + ((weakref.ref(parent), field),)
+
+    def _get_parents(self) -> list[tuple["ChangeTrackerBase", str]]:
+        """Повертає живих батьків, у полі яких об'єкт досі зберігається, та видаляє застарілі посилання."""
+        parents = []
+        links = []
+        for link, field in self._parent_links:
+            parent = link()
+            if parent is not None and parent._get_field(field) is self:
+                parents.append((parent, field))
+                links.append((link, field))
+        if len(links) != len(self._parent_links):
+            self._parent_links = tuple(links)
+        return parents
+
+    def _notify_parents_dirty(self) -> None:
+        """
+        Позначає поле з цим об'єктом "брудним" у батьківських ChangeTracker (і далі вгору).
+        Поширення зупиняється на батьках, де поле вже позначене, тож кожна зміна коштує O(1) у середньому.
+        Блокування батьків (thread_safe) не захоплюються: мітка, що загубилась під час коміту батька,
+        відновлюється перевіркою _is_clean_child(), адже сам об'єкт лишається "брудним".
+        """
+        if not self._parent_links:
+            return
+        for parent, field in self._get_parents():
+            dirty_keys = parent._dirty_keys
+            if dirty_keys is None or (field in dirty_keys and parent._hash_cache is None and parent._changes_cache is None):
+                continue
+            parent._add_key("_dirty_keys", field)
+            parent._invalidate_caches()
+            parent._notify_parents_dirty()
+
+    def _notify_parents_commit(self, skip: set[int], memo: SnapshotMemo) -> None:
+        """
+        Після коміту власного стану оновлює базовий стан батьків (і далі вгору): у знімку поля з цим об'єктом
+        замінюється лише його піддерево, тож батьки не вважають уже закомічені зміни незакоміченими.
+        Батьки з skip (закомічені разом з об'єктом) та їхні предки пропускаються: їхній стан уже актуальний.
+        """
+        if not self._parent_links:
+            return
+        seen = {id(self)}
+        # (вузол, шлях полів від вузла до цього об'єкта, ланцюг об'єктів від вузла до цього об'єкта)
+        stack = [(self, (), ())]
+        while stack:
+            node, path, chain = stack.pop()
+            for parent, field in node._get_parents():
+                if id(parent) in seen or id(parent) in skip:
+                    continue
+                seen.add(id(parent))
+                parent_path = (field,) + path
+                parent_chain = (parent,) + chain
+                parent._patch_child_baseline(parent_path, parent_chain, self, memo)
+                stack.append((parent, parent_path, parent_chain))
+
+    def _patch_child_baseline(self, path: tuple[str, ...], chain: tuple, child: "ChangeTrackerBase", memo: SnapshotMemo) -> None:
+        """
+        Замінює у базовому стані піддерево за шляхом path (поле, поля вкладених об'єктів) на знімок child.
+        chain — об'єкти від self до батька child: знімок будується відносно self (для SnapshotRef у циклах).
+        """
+        with self._commit_guard():
+            key = path[0]
+            if type(self._original_data.get(key)) is not dict:
+                # Поля hash_only та поля, яких немає в базовому стані, не оновлюються
+                return
+            for node in chain:
+                memo.push(node)
+            try:
+                snapshot = memo.visit(child, memo.snapshots, self._make_field_snapshot)
+            finally:
+                for node in reversed(chain):
+                    memo.pop(node)
+
+            with self._lock or _NO_LOCK:
+                patched = _replace_snapshot_path(self._original_data.get(key), path[1:], snapshot)
+                if patched is None:
+                    return
+                self._original_data[key] = patched
+                self._changes_cache = None
+                if self._original_hashes is not None:
+                    self._original_hashes.pop(key, None)
+                # Прямий вкладений об'єкт закомічено разом з усіма вкладеними — поле синхронізоване
+                if len(path) == 1 and self._dirty_keys is not None:
+                    self._dirty_keys.discard(key)
+
+    def _release_container(self, key: str) -> None:
+        """Від'єднує відстежуваний контейнер від поля перед його перезаписом або видаленням."""
+        value = self._get_field(key)
+        if self._is_own_container(key, value):
+            self._on_container_change(key, value)
+            value._ct_attach(None, None)
 
     def get_change_log(self) -> ChangeTrackerLogs:
+        """
+        Повертає повну історію зафіксованих змін.
+        ChangeTrackerLogs.data — це ChangeLogStore: записи ChangeTrackerLog створюються лише під час читання.
+        """
         return ChangeTrackerLogs(data=self._changed_log)
 
-    def _get_filtered_data(self, data: dict[str, any] = None) -> dict[str, any]:
-        return get_filtered_data(
-            data=data, 
-            include_mode=self._include_mode, 
-            exclude_fields=self._SYSTEM_KEYS
-        )
+    def compact_change_log(self, keep_commits: int = 0) -> None:
+        """
+        Згортає всі коміти журналу змін, крім останніх keep_commits, в один коміт-чекпоінт
+        з чистими змінами кожного поля (див. retention.fold_states).
+        """
+        with self._commit_guard():
+            fold_count = len(self._changed_log.commits) - keep_commits
+            if fold_count <= 1:
+                return
+            self._fold_change_log(fold_count)
+
+    def _fold_change_log(self, fold_count: int) -> None:
+        """
+        Згортає перші fold_count комітів журналу в коміт-чекпоінт і зберігає повний стан після останнього
+        згорнутого коміту, щоб state_at() для решти комітів не залежав від згорнутих записів.
+        Чекпоінт будується зі станів (стан перед журналом -> стан після останнього згорнутого коміту),
+        тож записи PATH/ELEMENTS згортаються коректно — в один запис на поле.
+        """
+        commits = self._changed_log.commits
+        first, last = commits[0], commits[fold_count - 1]
+        last_folded = last.commit_id
+        state = self._replay(fold_count - 1)
+        logs = fold_states(self._checkpoints.get(None, {}), state)
+        self._changed_log.replace_head(fold_count, logs, commit_id=last_folded, timestamp=last.timestamp, init=first.init)
+
+        # Чекпоінти згорнутих комітів більше не потрібні
+        self._checkpoints = {
+            commit_id: checkpoint for commit_id, checkpoint in self._checkpoints.items()
+            if commit_id is not None and commit_id in self._changed_log.commit_ids
+        }
+        if last_folded in self._changed_log.commit_ids:
+            self._checkpoints[last_folded] = state
+        else:
+            # Згорнуті коміти не дали чистих змін — стан після них стає початковим станом журналу
+            self._checkpoints[None] = state
+
+    def state_at(self, at: Union[str, datetime]) -> dict[str, any]:
+        """
+        Повертає стан відстежуваних полів об'єкта після коміту.
+
+        :param at: ID коміту або час: для часу береться останній коміт, зроблений не пізніше нього.
+        :return: Новий словник поле -> "знімок" значення (глибока копія, її зміна не впливає на журнал).
+        :raises KeyError: Якщо коміту немає в журналі (зокрема, якщо він згорнутий політикою зберігання)
+            або час передує першому коміту.
+
+        Стан відтворюється з найближчого попереднього чекпоінта та записів комітів після нього
+        (не більше checkpoint_interval комітів), а не з усієї історії.
+        """
+        with self._commit_guard():
+            if isinstance(at, datetime):
+                commit_number = self._changed_log.find_commit_at(at)
+            else:
+                commit_number = self._changed_log.find_commit(at)
+            return copy.deepcopy(self._replay(commit_number))
+
+    def revert_to(self, at: Union[str, datetime]) -> ChangeTrackerLogs:
+        """
+        Повертає відстежувані поля об'єкта до стану після коміту (див. state_at()).
+        Поля, яких тоді не було, видаляються. Вкладені ChangeTracker та об'єкти з __dict__ оновлюються на місці.
+        Зміни не комітяться автоматично: щоб зафіксувати повернення, викличте commit().
+
+        :param at: ID коміту або час.
+        :return: ChangeTrackerLogs — зміни відносно останнього коміту (як get_changed_data()).
+        """
+        with self.locked():
+            _restore_state(self, self.state_at(at))
+            return self.get_changed_data()
+
+    def get_delta(self, since: Union[str, datetime] = None) -> ChangeTrackerDelta:
+        """
+        Повертає компактну дельту змін (ChangeTrackerDelta) для реплікації стану в інший екземпляр (apply_delta()).
+
+        :param since: Якщо не вказано — незакомічені зміни (як get_changed_data()).
+            Інакше — зафіксовані зміни після коміту since (ID або час, як у state_at()) до останнього коміту;
+            commit_id та timestamp дельти — останнього коміту.
+        :return: ChangeTrackerDelta — операції лише для змінених значень: зміна одного ключа чи елемента
+            списку — одна операція, а не старе й нове значення поля цілком.
+
+        Для полів hash_only старе значення невідоме, тому незакомічена зміна такого поля передається цілком (replace).
+        """
+        if since is None:
+            ops = []
+            for log in self.get_changed_data(diff_mode=ChangeTrackerDiffMode.FIELD).data:
+                if log.action == ChangeTrackerAction.CREATED:
+                    ops.append((ADD, (log.field,), log.new_value))
+                elif log.action == ChangeTrackerAction.DELETED:
+                    ops.append((REMOVE, (log.field,), None))
+                elif log.field in self._hash_only_fields:
+                    ops.append((REPLACE, (log.field,), log.new_value))
+                else:
+                    ops.extend(diff_ops((log.field,), log.old_value, log.new_value))
+            return ChangeTrackerDelta(ops=ops)
+
+        with self._commit_guard():
+            if isinstance(since, datetime):
+                commit_number = self._changed_log.find_commit_at(since)
+            else:
+                commit_number = self._changed_log.find_commit(since)
+            commits = self._changed_log.commits
+            last = commits[-1]
+            # Знімки незмінених полів спільні для обох станів і не обходяться (diff_ops)
+            ops = list(diff_ops((), self._replay(commit_number), self._replay(len(commits) - 1)))
+            return ChangeTrackerDelta(ops=ops, commit_id=last.commit_id, timestamp=last.timestamp)
+
+    def apply_delta(self, delta: ChangeTrackerDelta, commit_id: str = None, timestamp: datetime = None) -> ChangeTrackerLogs:
+        """
+        Застосовує дельту (get_delta() іншого екземпляра) до полів об'єкта та до його базового стану і фіксує її як коміт.
+
+        :param delta: ChangeTrackerDelta (або ChangeTrackerDelta.decode(...)).
+        :param commit_id: ID коміту. Якщо не вказано — commit_id дельти, а якщо його немає — генерується автоматично.
+        :param timestamp: Час коміту. Якщо не вказано — час дельти або поточний час.
+        :return: ChangeTrackerLogs — записи коміту (по одному на змінене поле, як у commit()).
+
+        Опис:
+            - Базовий стан змінених полів оновлюється операціями дельти (копіюються лише вузли на їхніх шляхах),
+              без повторного "знімка" об'єкта. Відстежувані контейнери змінюються на місці, тож їхній базовий
+              стан знову лише посилання на контейнер.
+            - Операції всередині вкладених ChangeTracker застосовуються до них самих (коміт з тим самим commit_id).
+            - Незакомічені локальні зміни інших полів лишаються незакоміченими. Поля, яких об'єкт не відстежує
+              (фільтр полів), пропускаються.
+            - Очікується, що поля мають ті самі типи, що й у джерела: значення записуються як копії "знімків",
+              а вкладені ChangeTracker та об'єкти з __dict__ оновлюються на місці.
+        """
+        if commit_id is None:
+            commit_id = delta.commit_id if delta.commit_id is not None else str(uuid.uuid4())
+        if timestamp is None:
+            timestamp = delta.timestamp if delta.timestamp is not None else datetime.now()
+        logs = self._apply_delta(delta.ops, commit_id=commit_id, timestamp=timestamp, visited=set())
+        return ChangeTrackerLogs(data=logs)
+
+    def _apply_delta(self, ops: list[tuple[str, tuple, any]], commit_id: str, timestamp: datetime, visited: set[int]) -> list[ChangeTrackerLog]:
+        visited.add(id(self))
+        # id вкладеного ChangeTracker -> (об'єкт, операції відносно нього)
+        children = {}
+        with self.locked():
+            dirty_before = None if self._dirty_keys is None else set(self._dirty_keys)
+            field_ops = {}
+            for op, path, value in ops:
+                if self._filter_plan.allows(path[0]):
+                    field_ops.setdefault(path[0], []).append((op, path, value))
+
+            new_filtered_data, snapshots, hashes, logs = {}, {}, {}, []
+            for key, key_ops in field_ops.items():
+                baseline = self._original_data.get(key, MISSING)
+                if type(baseline) is _TrackedBaseline:
+                    # Фіксуємо старий стан контейнера до його зміни (як перед першою мутацією)
+                    baseline = self._get_field_snapshot(baseline.container)
+                    self._original_data[key] = baseline
+                hashed = type(baseline) is _HashedBaseline
+
+                for op, path, value in key_ops:
+                    self._apply_live_op(op, path, value, children)
+
+                fields = self._get_fields()
+                if key in fields:
+                    new_filtered_data[key] = fields[key]
+                if hashed:
+                    # Для hash_only полів старого значення немає — новий стан береться з поля
+                    old_value = None
+                    new_value = self._get_field_snapshot(fields[key]) if key in fields else MISSING
+                    value_hash = self._get_field_hash(new_value) if new_value is not MISSING else None
+                    hashes[key] = value_hash
+                    if new_value is not MISSING:
+                        snapshots[key] = _HashedBaseline(value_hash) if value_hash is not None else new_value
+                else:
+                    old_value = baseline
+                    new_value = patch_snapshot(baseline, [(op, path[1:], value) for op, path, value in key_ops])
+                    hashes[key] = None
+                    if new_value is not MISSING:
+                        snapshots[key] = new_value
+
+                if baseline is MISSING and new_value is MISSING:
+                    continue
+                if baseline is MISSING:
+                    logs.append(ChangeTrackerLog(field=key, old_value=None, new_value=new_value, action=ChangeTrackerAction.CREATED))
+                elif new_value is MISSING:
+                    logs.append(ChangeTrackerLog(field=key, old_value=old_value, new_value=None, action=ChangeTrackerAction.DELETED))
+                elif hashed or not values_equal(old_value, new_value):
+                    logs.append(ChangeTrackerLog(field=key, old_value=old_value, new_value=new_value, action=ChangeTrackerAction.CHANGED))
+
+            self._clear_delta_dirty(field_ops.keys(), dirty_before)
+            prepared = _PreparedCommit(
+                own_state=not self._full_check,
+                keys=set(field_ops),
+                new_filtered_data=new_filtered_data,
+                logs=logs,
+                snapshots=snapshots,
+                hashes=hashes,
+                diff_mode=ChangeTrackerDiffMode.FIELD,
+                # Мітки "брудних" полів не скидаються: незакомічені зміни інших полів лишаються
+                captured_dirty=set() if self._dirty_keys is not None else None
+            )
+            self._apply_prepared(prepared, init=False, commit_id=commit_id, timestamp=timestamp, write_sink=True)
+
+        # Вкладені об'єкти — після звільнення блокування (як у _commit)
+        for child, child_ops in children.values():
+            if id(child) not in visited:
+                child._apply_delta(child_ops, commit_id=commit_id, timestamp=timestamp, visited=visited)
+        if children:
+            # Зміни вкладених об'єктів позначили поля "брудними", але базовий стан уже містить їх
+            with self._lock or _NO_LOCK:
+                self._clear_delta_dirty(field_ops.keys(), dirty_before)
+                self._invalidate_caches()
+
+        if logs:
+            self._notify_parents_commit(skip=visited, memo=SnapshotMemo())
+        return logs
+
+    def _clear_delta_dirty(self, keys, dirty_before: set[str]) -> None:
+        """Знімає мітки "брудних" полів, поставлені apply_delta() (поля, що були "брудними" раніше, лишаються)."""
+        if dirty_before is None:
+            return
+        for key in keys:
+            if key not in dirty_before:
+                self._dirty_keys.discard(key)
+
+    def _apply_live_op(self, op: str, path: tuple, value: any, children: dict[int, tuple]) -> None:
+        """
+        Застосовує операцію дельти до самих полів. Операції всередині вкладеного ChangeTracker
+        (і заміна його стану цілком) відкладаються в children — він застосує їх до себе сам.
+        """
+        node = self
+        for index, token in enumerate(path):
+            if node is not self and isinstance(node, ChangeTrackerBase):
+                children.setdefault(id(node), (node, []))[1].append((op, path[index:], value))
+                return
+            if index == len(path) - 1:
+                break
+            node = getattr(node, token) if not isinstance(node, (dict, list)) else node[token]
+
+        key = path[-1]
+        if isinstance(node, (dict, list)):
+            current = node[key] if op == REPLACE else None
+        else:
+            current = getattr(node, key, None)
+        if op == REPLACE and isinstance(current, ChangeTrackerBase) and type(value) is dict:
+            child_ops = children.setdefault(id(current), (current, []))[1]
+            current_keys = current._get_filtered_data(data=current._get_fields()).keys()
+            child_ops.extend((REMOVE, (k,), None) for k in current_keys - value.keys())
+            child_ops.extend((REPLACE if k in current_keys else ADD, (k,), v) for k, v in value.items())
+            return
+
+        if op != REMOVE:
+            # Знімок лишається в базовому стані, тож поле отримує власну копію
+            value = _restore_value(current, value if is_immutable_value(value) else copy.deepcopy(value))
+        if isinstance(node, list):
+            if op == REMOVE:
+                del node[key]
+            elif op == ADD:
+                node.insert(key, value)
+            else:
+                node[key] = value
+        elif isinstance(node, dict):
+            if op == REMOVE:
+                del node[key]
+            else:
+                node[key] = value
+        elif op == REMOVE:
+            delattr(node, key)
+        else:
+            setattr(node, key, value)
+
+    def _replay(self, commit_number: int) -> dict[str, any]:
+        """Відтворює стан після коміту commit_number з найближчого чекпоінта. Значення не копіюються."""
+        commits = self._changed_log.commits
+        start = commit_number
+        while start >= 0 and type(self._checkpoints.get(commits[start].commit_id)) is not dict:
+            start -= 1
+        if start >= 0:
+            state = dict(self._checkpoints[commits[start].commit_id])
+        else:
+            state = dict(self._checkpoints.get(None, {}))
+
+        for number in range(start + 1, commit_number + 1):
+            checkpoint = self._checkpoints.get(commits[number].commit_id)
+            if checkpoint is not None:
+                # _FieldCheckpoint коміту, записи якого не відтворюються
+                for key, value in checkpoint.fields.items():
+                    if value is MISSING:
+                        state.pop(key, None)
+                    else:
+                        state[key] = value
+                continue
+            # Записи коміту (поля цілком або шляхи PATH/ELEMENTS) як операції над станом; копіюються лише вузли на їхніх шляхах
+            entries = [(split_path(log.field), log) for log in self._changed_log.commit_logs(number)]
+            state = patch_snapshot(state, _replay_ops(state, entries, (), 0))
+        return state
+
+    def _set_checkpoint(self, commit_id: str, state: dict[str, any]) -> None:
+        if self._checkpoints is _NO_CHECKPOINTS:
+            self._checkpoints = {}
+        self._checkpoints[commit_id] = state
 
-    def _get_field_snapshot(self, value):
+    def _make_checkpoint(self, prepared: "_PreparedCommit", keys: set[str] = None) -> dict[str, any]:
+        """
+        Повертає стан об'єкта після щойно застосованого коміту на основі _original_data.
+        "Знімки" в _original_data не змінюються після коміту, тому достатньо поверхневої копії.
+
+        :param keys: Якщо вказано, повертається стан лише цих полів (MISSING — поля немає в базовому стані).
+        """
+        if keys is None:
+            items = self._original_data.items()
+        else:
+            items = ((key, self._original_data.get(key, MISSING)) for key in keys)
+        state = {}
+        for key, value in items:
+            if type(value) is _TrackedBaseline:
+                value = self._get_field_snapshot(value.container)
+            elif type(value) is _HashedBaseline:
+                # Для hash_only полів базовий стан не містить значення — беремо поточне
+                value = self._get_field_snapshot(prepared.new_filtered_data.get(key, self._get_field(key)))
+            state[key] = value
+        return state
+
+    def _get_filtered_data(self, data: dict[str, any] = None, keys: set[str] = None) -> dict[str, any]:
+        return self._filter_plan.filter(data, keys=keys)
+
+    def _get_fields(self, copy: bool = False) -> dict[str, any]:
+        """
+        Поточні атрибути об'єкта (разом зі службовими — їх відкидає фільтр полів): для ChangeTracker — сам __dict__,
+        з copy=True — його копія. SlottedChangeTracker щоразу повертає новий словник зі значень слотів.
+        """
+        return dict(self.__dict__) if copy else self.__dict__
+
+    def _get_field(self, key: str, default: any = None) -> any:
+        """Значення атрибута key (default, якщо атрибут не встановлено)."""
+        return self.__dict__.get(key, default)
+
+    def __setattr__(self, name: str, value: any) -> None:
+        # Перехоплення вмикається для класу першим об'єктом з dirty_tracking, track_containers або thread_safe
+        # (_intercept_attributes); інші об'єкти класу присвоюють напряму (_set_field).
+        # До виклику ChangeTracker.__init__ службових полів ще немає; блокування — лише в _extras (thread_safe)
+        lock = getattr(self, "_extras", _NO_EXTRAS).lock
+        if lock is None:
+            self._set_field(name, value)
+        else:
+            with lock:
+                self._set_field(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        lock = getattr(self, "_extras", _NO_EXTRAS).lock
+        if lock is None:
+            self._del_field(name)
+        else:
+            with lock:
+                self._del_field(name)
+
+    def __getstate__(self) -> dict[str, any]:
+        """
+        Стан для pickle та copy (зокрема для передачі в інший процес): без блокувань, слабких посилань на батьків
+        і приймача журналу — відновлений об'єкт не пише в приймач (див. _ChangeTrackerConfig.__reduce__).
+        Відстежувані контейнери зберігаються як звичайні list/dict (базовий стан — як "знімок") і знову обгортаються
+        під час відновлення.
+        """
+        state = self._get_state()
+        # Замість блокувань — лише ознака thread_safe.
+        # Таймер coalescing не переноситься: відкладені зміни лишаються незакоміченими до наступного commit()
+        state["_lock"] = self._lock is not None
+        del state["_extras"]
+        state["_parent_links"] = ()
+        state["_hash_cache"] = None
+        state["_changes_cache"] = None
+        state["_observable"] = False
+        # Спільні порожні значення (MappingProxyType) не серіалізуються
+        if self._checkpoints:
+            state["_checkpoints"] = dict(self._checkpoints)
+        if self._changes_stats:
+            state["_changes_stats"] = dict(self._changes_stats)
+        state["_original_data"] = {
+            key: self._get_field_snapshot(value.container) if type(value) is _TrackedBaseline else value
+            for key, value in self._original_data.items()
+        }
+        return state
+
+    def __setstate__(self, state: dict[str, any]) -> None:
+        thread_safe = state.pop("_lock")
+        object.__setattr__(self, "_extras", _NO_EXTRAS)
+        # Атрибути встановлюються без __setattr__ (без міток "брудних" полів)
+        for key, value in state.items():
+            object.__setattr__(self, key, value)
+        if thread_safe:
+            object.__setattr__(self, "_lock", threading.RLock())
+            object.__setattr__(self, "_commit_lock", threading.RLock())
+        if thread_safe or self._dirty_keys is not None:
+            _intercept_attributes(type(self))
+        # Налаштування та план фільтрації знову спільні для класу та конфігурації
+        config = self._config
+        plan = config.filter_plan
+        object.__setattr__(self, "_config", _get_config(
+            get_filter_plan(type(self), plan.include_mode, plan.include_fields, plan.exclude_fields),
+            config.hash_only_fields,
+            config.diff_mode,
+            config.retention,
+            config.sink,
+            config.checkpoint_interval,
+            config.instrumentation,
+            config.coalescing,
+            config.cache_changed_data
+        ))
+        if self._tracked_keys is not None:
+            for key in self._tracked_keys:
+                if key in state:
+                    object.__setattr__(self, key, wrap_value(state[key], self, key))
+        if self._dirty_keys is not None:
+            # Зворотні посилання вкладених ChangeTracker не переносяться: наступне порівняння повне і відновлює їх
+            object.__setattr__(self, "_full_check", True)
+
+    def _get_state(self) -> dict[str, any]:
+        """Усі атрибути об'єкта (поля та службові) для __getstate__()."""
+        return dict(self.__dict__)
+
+    def _set_field(self, name: str, value: any) -> None:
+        dirty_keys = getattr(self, "_dirty_keys", None)
+        if dirty_keys is None or not self._config.filter_plan.allows(name):
+            object.__setattr__(self, name, value)
+            return
+
+        if self._tracked_keys is not None and self._get_field(name) is not value:
+            self._release_container(name)
+            value = wrap_value(value, self, name)
+        object.__setattr__(self, name, value)
+        if dirty_keys is _NO_KEYS:
+            object.__setattr__(self, "_dirty_keys", {name})
+        else:
+            dirty_keys.add(name)
+        self._invalidate_caches()
+        self._classify_field(name, value)
+        self._notify_parents_dirty()
+
+    def _del_field(self, name: str) -> None:
+        dirty_keys = getattr(self, "_dirty_keys", None)
+        if dirty_keys is not None and self._filter_plan.allows(name):
+            if self._tracked_keys is not None:
+                self._release_container(name)
+                self._tracked_keys.discard(name)
+            self._add_key("_dirty_keys", name)
+            self._invalidate_caches()
+            self._volatile_keys.discard(name)
+            self._child_keys.discard(name)
+            self._notify_parents_dirty()
+        object.__delattr__(self, name)
+
+    def _get_field_snapshot(self, value, memo: SnapshotMemo = None):
         """
         Повертає сериалізований стан ("знімок") поля, для подальшого порівння змін в мутабельних полях.
 
+        - Якщо для типу значення зареєстровано обробник зі snapshot (див. registry.register_type_handler), використовує його.
         - Якщо значення є екземпляром ChangeTracker, рекурсивно отримує його сериалізовану копію.
         - Якщо значення є списком або словником, повертає його глибоку копію.
         - Для простих типів повертає значення як є.
 
+        Кожен об'єкт обходиться один раз за memo (SnapshotMemo): спільні підоб'єкти отримують один і той самий знімок,
+        а цикли (наприклад, посилання вкладеного ChangeTracker на батька) — SnapshotRef.
+
         Використовується для порівняння стану полів при визначенні змін.
         """
-        if isinstance(value, ChangeTracker):
+        if is_immutable_value(value):
+            return value
+        if memo is None:
+            memo = SnapshotMemo()
+        return memo.visit(value, memo.snapshots, self._make_field_snapshot)
+
+    def _matches_snapshot(self, value, snapshot, active: dict[int, int] = None) -> bool:
+        """
+        Чи дорівнює "знімок" значення (_get_field_snapshot(value)) даному знімку — без створення нового знімка.
+        Обходить словники, списки та вкладені ChangeTracker; решта значень порівнюється через їхні знімки.
+        active — id об'єктів на шляху обходу -> рівень (як у SnapshotMemo): цикли відповідають SnapshotRef.
+        """
+        if is_immutable_value(value):
+            return values_equal(snapshot, value)
+        if active is None:
+            active = {id(self): 0}
+        level = active.get(id(value))
+        if level is not None:
+            return snapshot == SnapshotRef(len(active) - level)
+        handler = get_type_handler(type(value))
+        if isinstance(value, ChangeTrackerBase) and (handler is None or handler.snapshot is None):
+            items = value._get_filtered_data(data=value._get_fields())
+        elif type(value) in (dict, list, TrackedDict, TrackedList) and handler is None:
+            items = value
+        else:
+            return values_equal(snapshot, self._get_field_snapshot(value))
+        if isinstance(items, list):
+            if type(snapshot) is not list or len(snapshot) != len(items):
+                return False
+            pairs = zip(items, snapshot)
+        else:
+            if type(snapshot) is not dict or snapshot.keys() != items.keys():
+                return False
+            pairs = ((item, snapshot[key]) for key, item in items.items())
+        active[id(value)] = len(active)
+        try:
+            return all(self._matches_snapshot(item, item_snapshot, active) for item, item_snapshot in pairs)
+        finally:
+            del active[id(value)]
+
+    def _make_field_snapshot(self, value, memo: SnapshotMemo):
+        handler = get_type_handler(type(value))
+        if handler is not None and handler.snapshot is not None:
+            return handler.snapshot(value)
+        if isinstance(value, ChangeTrackerBase):
             # Для вкладених ChangeTracker — рекурсивно отримуємо стан
-            filtered_data = value._get_filtered_data(data=value.__dict__)
-            return {k: self._get_field_snapshot(v) for k, v in filtered_data.items()}
+            filtered_data = value._get_filtered_data(data=value._get_fields())
+            return {k: self._get_field_snapshot(v, memo) for k, v in filtered_data.items()}
         elif isinstance(value, dict):
-            return {k: self._get_field_snapshot(v) for k, v in value.items()}
+            return {k: self._get_field_snapshot(v, memo) for k, v in value.items()}
         elif isinstance(value, list):
-            return [self._get_field_snapshot(v) for v in value]
+            return [self._get_field_snapshot(v, memo) for v in value]
         elif hasattr(value, "to_dict"):
             return value.to_dict()
         elif hasattr(value, "__dict__"):
             # Можна додати фільтрацію службових полів
-            return {k: self._get_field_snapshot(v) for k, v in value.__dict__.items() if not k.startswith("_")}
+            return {k: self._get_field_snapshot(v, memo) for k, v in value.__dict__.items() if not k.startswith("_")}
         elif hasattr(value, "__dataclass_fields__"):
             return asdict(value)
         else:
@@ -292,5 +1998,202 @@ class ChangeTracker:
             return value
 
 
+    def _get_field_hash(self, value, memo: SnapshotMemo = None) -> int:
+        """
+        Повертає структурний хеш поля без створення "знімка" (той самий обхід, що й _get_field_snapshot).
+        Для однакових знімків хеші однакові: _get_field_hash(v) == structural_hash(_get_field_snapshot(v)).
+        Повертає None, якщо хеш обчислити неможливо (нехешовані значення) — тоді поле порівнюється повністю.
+
+        Хеші відстежуваних контейнерів та вкладених ChangeTracker кешуються, поки вони не змінились
+        (лише якщо їхній граф не посилається на об'єкти вище них — інакше хеш залежить від місця обходу).
+        """
+        if is_immutable_value(value):
+            return hash_scalar(value)
+        if isinstance(value, ChangeTrackerBase):
+            cached = value._hash_cache
+            if cached is not None:
+                return cached
+        elif isinstance(value, TrackedContainer) and not value._ct_opaque and value._ct_hash is not None:
+            return value._ct_hash
+
+        if memo is None:
+            memo = SnapshotMemo()
+        value_hash = memo.visit(value, memo.hashes, self._make_field_hash, hash_scalar)
+        # thread_safe або обхід в executor (acommit): хеш обчислюється паралельно зі змінами і може застаріти ще до запису в кеш
+        if memo.is_closed(value, memo.hashes) and self._lock is None and not memo.concurrent:
+            if isinstance(value, ChangeTrackerBase):
+                if value._can_cache_hash():
+                    value._hash_cache = value_hash
+            elif isinstance(value, TrackedContainer) and not value._ct_opaque:
+                value._ct_hash = value_hash
+        return value_hash
+
+    def _make_field_hash(self, value, memo: SnapshotMemo) -> int:
+        handler = get_type_handler(type(value))
+        if handler is not None and (handler.hash is not None or handler.snapshot is not None):
+            # Без хеш-функції обробника хеш значення невідомий
+            return handler.hash(value) if handler.hash is not None else None
+        if isinstance(value, ChangeTrackerBase):
+            filtered_data = value._get_filtered_data(data=value._get_fields())
+            return hash_mapping((k, self._get_field_hash(v, memo)) for k, v in filtered_data.items())
+        elif isinstance(value, dict):
+            return hash_mapping((k, self._get_field_hash(v, memo)) for k, v in value.items())
+        elif isinstance(value, list):
+            return hash_sequence(self._get_field_hash(v, memo) for v in value)
+        elif hasattr(value, "to_dict"):
+            return structural_hash(value.to_dict())
+        elif hasattr(value, "__dict__"):
+            return hash_mapping((k, self._get_field_hash(v, memo)) for k, v in value.__dict__.items() if not k.startswith("_"))
+        elif hasattr(value, "__dataclass_fields__"):
+            return structural_hash(asdict(value))
+        else:
+            return hash_scalar(value)
+
+    def _can_cache_hash(self) -> bool:
+        """
+        Хеш стану можна кешувати, лише якщо будь-яка зміна полів гарантовано скидає кеш:
+        увімкнено dirty_tracking і немає полів з мутабельними значеннями, змін яких ChangeTracker не бачить.
+        Хеш об'єкта з thread_safe не кешується: його можуть змінити під час обчислення.
+        """
+        return self._lock is None and self._is_observable()
+
     # def __repr__(self) -> str:
-    #     return f"{self.__class__.__name__}({self.__dict__})" 
\ No newline at end of file
+    #     return f"{self.__class__.__name__}({self.__dict__})" 
+
+
+# Службові поля як готовий frozenset: ключ плану фільтра не перебудовується для кожного об'єкта
+_SYSTEM_FIELDS = frozenset(ChangeTrackerBase._SYSTEM_KEYS)
+
+class ChangeTracker(ChangeTrackerBase):
+
+    """
+    Клас ChangeTracker призначений для відстеження змін у даних об'єкта. 
+    Він дозволяє фіксувати початковий стан, зберігати історію змін (створення, оновлення, видалення полів), 
+    а також фільтрувати поля для відстеження за допомогою режимів включення (ChangeTrackerIncludeMode) та списку дозволених полів. 
+    Клас зберігає журнал змін із детальною інформацією про кожну зміну, 
+    включаючи старе та нове значення, час зміни, тип дії та ознаку ініціалізації.
+
+    Поля та службові атрибути зберігаються в __dict__ об'єкта; для класів зі __slots__ — див. SlottedChangeTracker.
+    """
+
+
+def _restore_state(tracker: ChangeTrackerBase, state: dict[str, any]) -> None:
+    """Встановлює відстежувані поля ChangeTracker відповідно до "знімка" стану та видаляє зайві."""
+    current = tracker._get_filtered_data(data=tracker._get_fields())
+    for key in current.keys() - state.keys():
+        delattr(tracker, key)
+    for key, value in state.items():
+        setattr(tracker, key, _restore_value(current.get(key), value))
+
+
+def _restore_value(current: any, snapshot: any) -> any:
+    """
+    Повертає значення поля, відновлене зі "знімка".
+    Вкладені ChangeTracker та об'єкти з __dict__ (знімок яких — словник) оновлюються на місці, решта замінюється знімком.
+    """
+    if type(snapshot) is SnapshotRef:
+        # Циклічне посилання: об'єкт, на який воно вказує, відновлюється на місці
+        return current
+    if type(snapshot) is not dict:
+        return snapshot
+    if isinstance(current, ChangeTrackerBase):
+        _restore_state(current, snapshot)
+        return current
+    if (
+        not isinstance(current, (dict, list))
+        and not hasattr(current, "to_dict")
+        and hasattr(current, "__dict__")
+        and not isinstance(current, type)
+    ):
+        for key in [k for k in current.__dict__ if not k.startswith("_") and k not in snapshot]:
+            delattr(current, key)
+        for key, value in snapshot.items():
+            setattr(current, key, _restore_value(getattr(current, key, None), value))
+        return current
+    return snapshot
+
+
+def _replace_snapshot_path(snapshot: dict, path: tuple[str, ...], value: any) -> dict:
+    """
+    Повертає копію знімка, у якій значення за шляхом path замінене на value (копіюються лише словники на шляху,
+    бо знімки можуть бути спільними). Повертає None, якщо шляху в знімку немає.
+    """
+    if not path:
+        return value
+    if type(snapshot) is not dict or path[0] not in snapshot:
+        return None
+    inner = _replace_snapshot_path(snapshot[path[0]], path[1:], value)
+    if inner is None:
+        return None
+    return {**snapshot, path[0]: inner}
+
+
+def _is_replayable(logs: list[ChangeTrackerLog], diff_mode: ChangeTrackerDiffMode) -> bool:
+    """Чи відтворюють записи коміту стан після нього (_replay_ops): шляхи PATH/ELEMENTS мають розбиратися split_path."""
+    if diff_mode == ChangeTrackerDiffMode.FIELD:
+        # Назва поля з "." або "[" розбиралась би як шлях
+        return not any("." in log.field or "[" in log.field for log in logs)
+    return all(split_path(log.field) is not None for log in logs)
+
+
+def _replay_ops(node: any, entries: list[tuple[tuple, ChangeTrackerLog]], path: tuple, depth: int) -> list[tuple[str, tuple, any]]:
+    """
+    Перетворює записи журналу відносно знімка node на операції для delta.patch_snapshot (шляхи — відносно стану).
+
+    :param entries: Пари (розібраний шлях запису, запис); шляхи починаються з path, depth — довжина path.
+    У списках видалення та переміщення посилаються на старі індекси, решта записів — на нові (див. diff.diff_lists),
+    а patch_snapshot застосовує операції по черзі: спершу видаляємо з кінця, потім вставляємо за зростанням нових індексів.
+    Елементи, що лишились, зберігають порядок, тож вкладені записи нового індексу застосовуються до відповідного
+    старого елемента.
+    """
+    ops = []
+    if type(node) is list:
+        removed, inserted, replaced, nested = set(), {}, {}, {}
+        for tokens, log in entries:
+            index = tokens[depth]
+            if len(tokens) > depth + 1:
+                nested.setdefault(index, []).append((tokens, log))
+            elif log.action == ChangeTrackerAction.DELETED:
+                removed.add(index)
+            elif log.action == ChangeTrackerAction.CREATED:
+                inserted[index] = log.new_value
+            elif log.action == ChangeTrackerAction.MOVED:
+                removed.add(log.old_value)
+                inserted[index] = node[log.old_value]
+            else:
+                replaced[index] = log.new_value
+        ops.extend((REMOVE, path + (index,), None) for index in sorted(removed, reverse=True))
+        ops.extend((ADD, path + (index,), inserted[index]) for index in sorted(inserted))
+        ops.extend((REPLACE, path + (index,), value) for index, value in replaced.items())
+        if nested:
+            kept = [index for index in range(len(node)) if index not in removed]
+            new_indexes = [index for index in range(len(kept) + len(inserted)) if index not in inserted]
+            sources = dict(zip(new_indexes, kept))
+            for index, child_entries in nested.items():
+                if index in sources:
+                    ops.extend(_replay_ops(node[sources[index]], child_entries, path + (index,), depth + 1))
+        return ops
+
+    groups = {}
+    for tokens, log in entries:
+        groups.setdefault(tokens[depth], []).append((tokens, log))
+    for key, child_entries in groups.items():
+        tokens, log = child_entries[0]
+        if len(tokens) == depth + 1:
+            # Значення за ключем створене, видалене або замінене цілком
+            if log.action == ChangeTrackerAction.DELETED:
+                if key in node:
+                    ops.append((REMOVE, path + (key,), None))
+            else:
+                ops.append((REPLACE, path + (key,), log.new_value))
+        elif type(node) is dict and key in node:
+            ops.extend(_replay_ops(node[key], child_entries, path + (key,), depth + 1))
+    return ops
+
+
+def _root_field(path: str) -> str:
+    """Назва поля об'єкта для запису журналу (у PATH/ELEMENTS — перший сегмент шляху, наприклад "address.city" -> "address")."""
+    for index, char in enumerate(path):
+        if char == "." or char == "[":
+            return path[:index]
+    return path
@@ -0,0 +1,192 @@
+# delta.py — компактні дельти змін для реплікації стану (операції на кшталт JSON Patch)
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Iterator
+import copy
+import json
+
+from .diff import MAX_EDIT_DISTANCE, MISSING, _element_hash, _myers
+from .registry import values_equal
+from .sinks import _json_default
+
+# Типи операцій збігаються з JSON Patch (RFC 6902)
+ADD = "add"
+REMOVE = "remove"
+REPLACE = "replace"
+
+# Коди операцій у компактному кодуванні (encode/decode)
+_OP_CODES = {ADD: 0, REMOVE: 1, REPLACE: 2}
+_OP_NAMES = {code: op for op, code in _OP_CODES.items()}
+
+
+@dataclass
+class ChangeTrackerDelta:
+    """
+    Дельта змін об'єкта: список операцій (операція, шлях, значення).
+
+    Шлях — кортеж: назва поля, далі ключі словників, індекси списків та назви полів вкладених об'єктів
+    (("address", "city"), ("tags", 2)). Значення — "знімок" (як у журналі змін), для remove — None.
+    Операції застосовуються по черзі: індекси списків відповідають стану після попередніх операцій.
+    """
+    ops: list[tuple[str, tuple, Any]] = field(default_factory=list)
+    commit_id: str = None
+    timestamp: datetime = None
+
+    def to_json_patch(self) -> list[dict]:
+        """Повертає операції у форматі JSON Patch (RFC 6902): {"op", "path", "value"} зі шляхом JSON Pointer."""
+        return [
+            {"op": op, "path": _json_pointer(path)} if op == REMOVE else {"op": op, "path": _json_pointer(path), "value": value}
+            for op, path, value in self.ops
+        ]
+
+    def encode(self) -> bytes:
+        """
+        Компактне кодування дельти (JSON без пробілів, коди операцій замість назв) для передачі між вузлами.
+        Ключі шляхів мають бути str або int. Значення, які не підтримуються JSON, кодуються як у sinks
+        (datetime — ISO-рядок, set/tuple — список, решта — repr) і не відновлюються decode().
+        """
+        timestamp = self.timestamp.isoformat() if self.timestamp is not None else None
+        ops = [[_OP_CODES[op], list(path)] if op == REMOVE else [_OP_CODES[op], list(path), value] for op, path, value in self.ops]
+        return json.dumps([self.commit_id, timestamp, ops], ensure_ascii=False, separators=(",", ":"), default=_json_default).encode()
+
+    @classmethod
+    def decode(cls, data: bytes) -> "ChangeTrackerDelta":
+        """Відновлює дельту, закодовану encode()."""
+        commit_id, timestamp, ops = json.loads(data)
+        return cls(
+            ops=[(_OP_NAMES[op[0]], tuple(op[1]), op[2] if len(op) > 2 else None) for op in ops],
+            commit_id=commit_id,
+            timestamp=datetime.fromisoformat(timestamp) if timestamp is not None else None
+        )
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+
+def _json_pointer(path: tuple) -> str:
+    return "".join("/" + str(token).replace("~", "~0").replace("/", "~1") for token in path)
+
+
+def diff_ops(path: tuple, old: Any, new: Any) -> Iterator[tuple[str, tuple, Any]]:
+    """
+    Порівнює два "знімки" і повертає мінімальні операції дельти, що перетворюють old на new.
+
+    :param path: Шлях до поточного значення (кортеж).
+    :param old: Старий знімок або MISSING.
+    :param new: Новий знімок або MISSING.
+    :return: Ітератор кортежів (операція, шлях, значення).
+
+    Словники порівнюються за ключами. У списках відкидаються спільні початок і кінець, решта порівнюється
+    алгоритмом Myers, як у diff_lists: вставка чи видалення елемента — одна операція, де б вони не були,
+    незалежно від довжини списку (без переміщень — їх немає серед операцій дельти). Якщо редагувань більше
+    за MAX_EDIT_DISTANCE, решта порівнюється за позиціями. Однакові об'єкти (спільні знімки незмінених полів)
+    не обходяться.
+    """
+    if old is new:
+        return
+    if old is MISSING:
+        yield ADD, path, new
+    elif new is MISSING:
+        yield REMOVE, path, None
+    elif type(old) is dict and type(new) is dict:
+        for key, old_value in old.items():
+            if key in new:
+                yield from diff_ops(path + (key,), old_value, new[key])
+            else:
+                yield REMOVE, path + (key,), None
+        for key, new_value in new.items():
+            if key not in old:
+                yield ADD, path + (key,), new_value
+    elif type(old) is list and type(new) is list:
+        yield from _diff_list_ops(path, old, new)
+    elif not values_equal(old, new):
+        yield REPLACE, path, new
+
+
+def _diff_list_ops(path: tuple, old: list, new: list) -> Iterator[tuple[str, tuple, Any]]:
+    old_end, new_end = len(old), len(new)
+
+    # Спільний початок і кінець
+    start = 0
+    limit = min(old_end, new_end)
+    while start < limit and values_equal(old[start], new[start]):
+        start += 1
+    while old_end > start and new_end > start and values_equal(old[old_end - 1], new[new_end - 1]):
+        old_end -= 1
+        new_end -= 1
+    # Швидкий шлях: лише вставки або лише видалення
+    if start == old_end or start == new_end:
+        yield from _diff_positions(path, old, new, start, old_end, new_end)
+        return
+
+    old_hashes = [_element_hash(v) for v in old[start:old_end]]
+    new_hashes = [_element_hash(v) for v in new[start:new_end]]
+    def same(old_index: int, new_index: int) -> bool:
+        return old_hashes[old_index] == new_hashes[new_index] and values_equal(old[start + old_index], new[start + new_index])
+
+    script = _myers(len(old_hashes), len(new_hashes), same, MAX_EDIT_DISTANCE)
+    if script is None:
+        yield from _diff_positions(path, old, new, start, old_end, new_end)
+        return
+
+    # Індекс у списку після попередніх операцій. Редагування між однаковими елементами групуються:
+    # пари видалення+вставка — заміни, решта — видалення та вставки на поточній позиції
+    index = start
+    group_deleted, group_inserted = [], []
+    for op, old_index, new_index in script + [("=", None, None)]:
+        if op == "-":
+            group_deleted.append(start + old_index)
+        elif op == "+":
+            group_inserted.append(start + new_index)
+        else:
+            for old_index, new_index in zip(group_deleted, group_inserted):
+                yield from diff_ops(path + (index,), old[old_index], new[new_index])
+                index += 1
+            paired = min(len(group_deleted), len(group_inserted))
+            for _ in group_deleted[paired:]:
+                yield REMOVE, path + (index,), None
+            for new_index in group_inserted[paired:]:
+                yield ADD, path + (index,), new[new_index]
+                index += 1
+            group_deleted, group_inserted = [], []
+            index += 1
+
+
+def _diff_positions(path: tuple, old: list, new: list, start: int, old_end: int, new_end: int) -> Iterator[tuple[str, tuple, Any]]:
+    common = min(old_end, new_end) - start
+    for index in range(start, start + common):
+        yield from diff_ops(path + (index,), old[index], new[index])
+    # Зайві елементи видаляються з кінця, щоб не зсувати індекси ще не видалених
+    for index in range(old_end - 1, start + common - 1, -1):
+        yield REMOVE, path + (index,), None
+    for index in range(start + common, new_end):
+        yield ADD, path + (index,), new[index]
+
+
+def patch_snapshot(snapshot: Any, ops: list[tuple[str, tuple, Any]]) -> Any:
+    """
+    Повертає знімок після застосування операцій (шляхи — відносно snapshot; порожній шлях — саме значення).
+    Вихідний знімок не змінюється: копіюються лише словники та списки на шляхах операцій, кожен один раз,
+    бо знімки можуть бути спільними (журнал змін, чекпоінти). Якщо значення видалене, повертає MISSING.
+    """
+    holder = [snapshot]
+    # id копії -> копія (посилання не дає повторно використати id для іншого об'єкта)
+    copied = {}
+    for op, path, value in ops:
+        node, key = holder, 0
+        for token in path:
+            child = node[key]
+            if id(child) not in copied:
+                child = copy.copy(child)
+                copied[id(child)] = child
+                node[key] = child
+            node, key = child, token
+        if not path:
+            holder[0] = MISSING if op == REMOVE else value
+        elif op == REMOVE:
+            del node[key]
+        elif op == ADD and type(node) is list:
+            node.insert(key, value)
+        else:
+            node[key] = value
+    return holder[0]
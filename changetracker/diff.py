@@ -0,0 +1,280 @@
+# diff.py — порівняння "знімків" на рівні шляхів (address.city, items[3].price)
+from typing import Any, Callable, Iterator, Optional
+import ast
+
+from .hashing import structural_hash
+from .registry import get_type_handler, values_equal
+
+# Позначка відсутнього значення (поле/ключ/елемент не існує)
+MISSING = object()
+
+# Тип операції збігається зі значеннями ChangeTrackerAction
+CREATED = "created"
+DELETED = "deleted"
+CHANGED = "changed"
+MOVED = "moved"
+
+# Максимальна кількість редагувань для пошуку Myers. Якщо списки відрізняються сильніше,
+# порівняння елементів виконується за позиціями (дешево, але без вставок і переміщень).
+MAX_EDIT_DISTANCE = 2000
+
+
+def join_key(path: str, key: Any) -> str:
+    """
+    Додає ключ словника до шляху: рядкові ключі-ідентифікатори через крапку (address.city),
+    решта — у квадратних дужках через repr (data['a.b'], data[1]).
+    """
+    if isinstance(key, str) and key.isidentifier():
+        return f"{path}.{key}"
+    return f"{path}[{key!r}]"
+
+
+def join_index(path: str, index: int) -> str:
+    """Додає індекс елемента списку до шляху: items[3]."""
+    return f"{path}[{index}]"
+
+
+def split_path(path: str) -> Optional[tuple]:
+    """
+    Розбирає шлях, складений join_key/join_index, на кортеж: назва поля, далі ключі та індекси
+    ("items[3].price" -> ("items", 3, "price")). Повертає None, якщо шлях не розбирається
+    (наприклад, діапазони data[3:7] від обробників diff або ключі, repr яких не є літералом).
+    """
+    if "." not in path and "[" not in path:
+        return (path,)
+    tokens = []
+    index = _name_end(path, 0)
+    tokens.append(path[:index])
+    while index < len(path):
+        if path[index] == ".":
+            end = _name_end(path, index + 1)
+            tokens.append(path[index + 1:end])
+            index = end
+            continue
+        # Ключ у квадратних дужках — repr; сам repr може містити "]", тож шукаємо найкоротший літерал
+        end = path.find("]", index)
+        while end != -1:
+            text = path[index + 1:end]
+            if end + 1 == len(path) or path[end + 1] in ".[":
+                if text.isdigit():
+                    tokens.append(int(text))
+                    break
+                try:
+                    tokens.append(ast.literal_eval(text))
+                    break
+                except (ValueError, SyntaxError, MemoryError, RecursionError):
+                    pass
+            end = path.find("]", end + 1)
+        if end == -1:
+            return None
+        index = end + 1
+    return tuple(tokens)
+
+
+def _name_end(path: str, start: int) -> int:
+    """Кінець сегмента-ідентифікатора шляху, що починається з start (наступна "." або "[")."""
+    for index in range(start, len(path)):
+        if path[index] == "." or path[index] == "[":
+            return index
+    return len(path)
+
+
+def diff_paths(path: str, old: Any, new: Any, elements: bool = False) -> Iterator[tuple[str, str, Any, Any]]:
+    """
+    Рекурсивно порівнює два "знімки" і повертає зміни на рівні листків.
+
+    :param path: Шлях до поточного значення (для поля — назва поля).
+    :param old: Старий знімок або MISSING.
+    :param new: Новий знімок або MISSING.
+    :param elements: Якщо True, списки порівнюються поелементно (diff_lists: вставки, видалення, заміни, переміщення),
+        інакше — за позиціями.
+    :return: Ітератор кортежів (операція, шлях, старе значення, нове значення).
+        Для створених/видалених значень відсутня сторона дорівнює None.
+
+    Якщо обидва значення — словники, порівнюються їхні ключі; якщо списки — елементи за позиціями.
+    Створене або видалене піддерево повертається одним записом на його шляху.
+    Для типів із зареєстрованим обробником diff (див. registry) зміни формує обробник.
+    """
+    if old is MISSING:
+        yield CREATED, path, None, new
+    elif new is MISSING:
+        yield DELETED, path, old, None
+    elif type(old) is dict and type(new) is dict:
+        for key, old_value in old.items():
+            yield from diff_paths(join_key(path, key), old_value, new.get(key, MISSING), elements)
+        for key, new_value in new.items():
+            if key not in old:
+                yield CREATED, join_key(path, key), None, new_value
+    elif type(old) is list and type(new) is list:
+        if elements:
+            yield from diff_lists(path, old, new)
+        else:
+            yield from _diff_positions(path, old, new, 0, 0, len(old), len(new), elements)
+    elif not values_equal(old, new):
+        handler = get_type_handler(type(new))
+        if handler is not None and handler.diff is not None:
+            yield from handler.diff(path, old, new)
+        else:
+            yield CHANGED, path, old, new
+
+
+def _diff_positions(path: str, old: list, new: list, old_start: int, new_start: int, old_end: int, new_end: int, elements: bool):
+    """Порівнює ділянки списків за позиціями; індекси в шляху — з нового списку (для видалених — зі старого)."""
+    old_count = old_end - old_start
+    new_count = new_end - new_start
+    for offset in range(max(old_count, new_count)):
+        if offset < old_count and offset < new_count:
+            yield from diff_paths(join_index(path, new_start + offset), old[old_start + offset], new[new_start + offset], elements)
+        elif offset < old_count:
+            yield DELETED, join_index(path, old_start + offset), old[old_start + offset], None
+        else:
+            yield CREATED, join_index(path, new_start + offset), None, new[new_start + offset]
+
+
+def diff_lists(path: str, old: list, new: list) -> Iterator[tuple[str, str, Any, Any]]:
+    """
+    Поелементне порівняння двох списків-"знімків".
+
+    :return: Ітератор кортежів (операція, шлях, старе значення, нове значення), де операція:
+        - created — елемент вставлено; шлях містить індекс у новому списку;
+        - deleted — елемент видалено; шлях містить індекс у старому списку;
+        - changed — елемент замінено (для вкладених структур — зміни на рівні листків); індекс у новому списку;
+        - moved — елемент переміщено; шлях містить індекс у новому списку,
+          old_value — старий індекс, new_value — новий індекс.
+
+    Спочатку відкидаються спільні початок і кінець списків (швидкі шляхи для чистого додавання в кінець
+    та обрізання), потім для решти виконується алгоритм Myers над структурними хешами елементів.
+    Однаковий хеш — лише підказка: елементи вважаються однаковими, якщо вони ще й рівні (values_equal).
+    Видалення та вставки однакових елементів об'єднуються в переміщення.
+    """
+    old_end, new_end = len(old), len(new)
+
+    # Спільний початок
+    start = 0
+    limit = min(old_end, new_end)
+    while start < limit and values_equal(old[start], new[start]):
+        start += 1
+
+    # Швидкі шляхи: додавання в кінець / обрізання
+    if start == old_end:
+        for index in range(start, new_end):
+            yield CREATED, join_index(path, index), None, new[index]
+        return
+    if start == new_end:
+        for index in range(start, old_end):
+            yield DELETED, join_index(path, index), old[index], None
+        return
+
+    # Спільний кінець
+    while old_end > start and new_end > start and values_equal(old[old_end - 1], new[new_end - 1]):
+        old_end -= 1
+        new_end -= 1
+
+    old_hashes = [_element_hash(v) for v in old[start:old_end]]
+    new_hashes = [_element_hash(v) for v in new[start:new_end]]
+    def same(old_index: int, new_index: int) -> bool:
+        return old_hashes[old_index] == new_hashes[new_index] and values_equal(old[start + old_index], new[start + new_index])
+
+    script = _myers(len(old_hashes), len(new_hashes), same, MAX_EDIT_DISTANCE)
+    if script is None:
+        yield from _diff_positions(path, old, new, start, start, old_end, new_end, True)
+        return
+
+    # Групуємо редагування між однаковими елементами: пари видалення+вставка — це заміни
+    deleted, inserted = [], []
+    for op, old_index, new_index in script:
+        if op == "-":
+            deleted.append(start + old_index)
+        elif op == "+":
+            inserted.append(start + new_index)
+
+    old_by_hash = {}
+    for old_index in deleted:
+        old_by_hash.setdefault(old_hashes[old_index - start], []).append(old_index)
+
+    # Переміщення: видалений і вставлений елементи однакові (хеш та значення)
+    moved_old, moved_new = set(), set()
+    for new_index in inserted:
+        candidates = old_by_hash.get(new_hashes[new_index - start])
+        old_index = next((index for index in candidates or () if values_equal(old[index], new[new_index])), None)
+        if old_index is not None:
+            candidates.remove(old_index)
+            moved_old.add(old_index)
+            moved_new.add(new_index)
+            yield MOVED, join_index(path, new_index), old_index, new_index
+
+    # Решту редагувань обробляємо групами між однаковими елементами
+    group_deleted, group_inserted = [], []
+    for op, old_index, new_index in script + [("=", None, None)]:
+        if op == "-":
+            if start + old_index not in moved_old:
+                group_deleted.append(start + old_index)
+        elif op == "+":
+            if start + new_index not in moved_new:
+                group_inserted.append(start + new_index)
+        else:
+            for old_index, new_index in zip(group_deleted, group_inserted):
+                yield from diff_paths(join_index(path, new_index), old[old_index], new[new_index], True)
+            paired = min(len(group_deleted), len(group_inserted))
+            for old_index in group_deleted[paired:]:
+                yield DELETED, join_index(path, old_index), old[old_index], None
+            for new_index in group_inserted[paired:]:
+                yield CREATED, join_index(path, new_index), None, new[new_index]
+            group_deleted, group_inserted = [], []
+
+
+def _element_hash(value: Any) -> Any:
+    value_hash = structural_hash(value)
+    # Елементи з невідомим хешем ніколи не вважаються однаковими
+    return object() if value_hash is None else value_hash
+
+
+def _myers(old_count: int, new_count: int, same: Callable[[int, int], bool], max_distance: int) -> Optional[list[tuple[str, int, int]]]:
+    """
+    Алгоритм Myers (O((N+M)·D)) над елементами; same(i, j) — чи однакові old[i] та new[j].
+
+    :return: Список редагувань у прямому порядку: ("=", i, j), ("-", i, None), ("+", None, j)
+        або None, якщо кількість редагувань перевищує max_distance.
+    """
+    v = {1: 0}
+    trace = []
+    for distance in range(min(old_count + new_count, max_distance) + 1):
+        trace.append(v.copy())
+        for k in range(-distance, distance + 1, 2):
+            if k == -distance or (k != distance and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < old_count and y < new_count and same(x, y):
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= old_count and y >= new_count:
+                return _myers_backtrack(trace, old_count, new_count)
+    return None
+
+
+def _myers_backtrack(trace: list[dict[int, int]], x: int, y: int) -> list[tuple[str, int, int]]:
+    script = []
+    for distance in range(len(trace) - 1, -1, -1):
+        v = trace[distance]
+        k = x - y
+        if k == -distance or (k != distance and v[k - 1] < v[k + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[prev_k]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            script.append(("=", x, y))
+        if distance > 0:
+            if x == prev_x:
+                script.append(("+", None, prev_y))
+            else:
+                script.append(("-", prev_x, None))
+        x, y = prev_x, prev_y
+    script.reverse()
+    return script
@@ -0,0 +1,95 @@
+# filtering.py — скомпільований план фільтрації полів для ChangeTracker
+from enum import Enum
+from typing import Iterable, Literal
+from weakref import WeakKeyDictionary
+
+
+class ChangeTrackerIncludeMode(Enum):
+    ALL = "__all"
+    ONLY_PUBLIC = "__only_public"
+    ONLY_PRIVATE = "__only_private"
+
+
+class FieldFilterPlan:
+    """
+    Скомпільований фільтр полів для однієї конфігурації (режим включення, include_fields, exclude_fields).
+
+    Рішення для кожного ключа обчислюється один раз і зберігається в множинах дозволених та заборонених ключів,
+    тож повторна фільтрація зводиться до перевірки входження. Нові ключі (наприклад, поля, додані після
+    ініціалізації) обчислюються під час першої появи.
+    Якщо задано include_fields, фільтр перебирає лише ці поля, а не всі атрибути об'єкта.
+    """
+
+    __slots__ = ("include_mode", "include_fields", "exclude_fields", "_allowed", "_denied")
+
+    def __init__(self, include_mode: ChangeTrackerIncludeMode, include_fields: Literal[tuple[str, ...], "*"], exclude_fields: frozenset[str]):
+        self.include_mode = include_mode
+        self.include_fields = "*"
+        self.exclude_fields = exclude_fields
+        self._allowed = set()
+        self._denied = set(exclude_fields)
+        if include_fields != "*":
+            # Лише поля, які дозволяє також режим включення та exclude_fields
+            self.include_fields = tuple(key for key in include_fields if self.allows(key))
+            self._allowed = set(self.include_fields)
+
+    def allows(self, key: str) -> bool:
+        """Чи відстежується поле key."""
+        if key in self._allowed:
+            return True
+        if key in self._denied:
+            return False
+        allowed = self._decide(key)
+        (self._allowed if allowed else self._denied).add(key)
+        return allowed
+
+    def _decide(self, key: str) -> bool:
+        if self.include_fields != "*" and key not in self.include_fields:
+            return False
+        if self.include_mode == ChangeTrackerIncludeMode.ONLY_PUBLIC and key.startswith("_"):
+            return False
+        if self.include_mode == ChangeTrackerIncludeMode.ONLY_PRIVATE and not key.startswith("_"):
+            return False
+        return key not in self.exclude_fields
+
+    def filter(self, data: dict[str, any], keys: Iterable[str] = None) -> dict[str, any]:
+        """
+        Повертає відстежувані поля словника data.
+
+        :param data: Словник з даними (зазвичай __dict__ об'єкта).
+        :param keys: Якщо вказано, перевіряються лише ці ключі.
+        """
+        if keys is None and self.include_fields != "*":
+            keys = self.include_fields
+        if keys is not None:
+            return {key: data[key] for key in keys if key in data and self.allows(key)}
+
+        allowed = self._allowed
+        result = {}
+        for key, value in data.items():
+            if key in allowed or (key not in self._denied and self.allows(key)):
+                result[key] = value
+        return result
+
+
+# Плани кешуються для кожного класу та конфігурації і звільняються разом із класом
+_PLANS = WeakKeyDictionary()
+
+
+def get_filter_plan(
+    cls: type,
+    include_mode: ChangeTrackerIncludeMode,
+    include_fields: Literal[list[str], "*"] = "*",
+    exclude_fields: Iterable[str] = ()
+) -> FieldFilterPlan:
+    """Повертає спільний FieldFilterPlan для класу та конфігурації фільтра (створює під час першого виклику)."""
+    if include_fields != "*":
+        include_fields = tuple(dict.fromkeys(include_fields))
+    config = (include_mode, include_fields, frozenset(exclude_fields))
+    plans = _PLANS.get(cls)
+    if plans is None:
+        plans = _PLANS[cls] = {}
+    plan = plans.get(config)
+    if plan is None:
+        plan = plans[config] = FieldFilterPlan(*config)
+    return plan
@@ -0,0 +1,130 @@
+# hashing.py — структурні (Merkle-подібні) хеші "знімків" полів для changetracker
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Any, Iterable, Optional
+import struct
+
+from .registry import get_type_handler
+
+# Мітки типів вузлів, щоб [] і {} (та інші різні структури з однаковим вмістом) мали різні хеші
+_MAPPING_TAG = b"m"
+_SEQUENCE_TAG = b"l"
+_TUPLE_TAG = b"t"
+_SET_TAG = b"e"
+
+# Хеші — 128-бітні дайджести BLAKE2b. Цілі числа з цього діапазону є власними хешами (без дайджесту):
+# різні числа мають різні хеші, а збіг із дайджестом іншого значення практично неможливий
+_SMALL_INT = 1 << 62
+_MASK = (1 << 128) - 1
+
+
+def digest(*parts: bytes) -> int:
+    """128-бітний дайджест BLAKE2b частин як ціле число (стійкий до колізій, однаковий у всіх процесах)."""
+    return int.from_bytes(blake2b(b"".join(parts), digest_size=16).digest(), "little")
+
+
+def _encode(value_hash: int) -> bytes:
+    return (value_hash & _MASK).to_bytes(16, "little")
+
+
+def _hash_int(value: int) -> int:
+    if -_SMALL_INT < value < _SMALL_INT:
+        return value
+    return digest(b"i", value.to_bytes(value.bit_length() // 8 + 1, "little", signed=True))
+
+
+_NONE_HASH = digest(b"n")
+
+
+def hash_scalar(value: Any) -> Optional[int]:
+    """
+    Повертає хеш простого значення або None, якщо значення не хешується.
+    None означає "хеш невідомий" — такі поля порівнюються повністю.
+
+    На відміну від вбудованого hash(), хеш кодує тип і саме значення (hash(-1) == hash(-2), а hash_scalar — ні).
+    Рівні числа (1, 1.0, True) мають однаковий хеш, як і для ==. Значення інших типів хешуються через
+    власний __hash__ разом з назвою типу.
+    """
+    value_type = type(value)
+    if value_type is str:
+        return digest(b"s", value.encode("utf-8", "surrogatepass"))
+    if value_type is int or value_type is bool:
+        return _hash_int(int(value))
+    if value_type is float:
+        if value.is_integer():
+            return _hash_int(int(value))
+        return digest(b"f", struct.pack("<d", value))
+    if value is None:
+        return _NONE_HASH
+    if value_type is bytes:
+        return digest(b"y", value)
+    if value_type is tuple:
+        return hash_sequence((hash_scalar(item) for item in value), tag=_TUPLE_TAG)
+    if isinstance(value, (set, frozenset)):
+        return _hash_unordered((hash_scalar(item) for item in value), tag=_SET_TAG)
+    try:
+        return digest(b"o", value_type.__qualname__.encode(), _encode(hash(value)))
+    except TypeError:
+        return None
+
+
+# Ключі словників (назви полів тощо) повторюються в багатьох об'єктах — їхні хеші кешуються
+_hash_key = lru_cache(maxsize=4096)(hash_scalar)
+
+
+def _hash_unordered(hashes: Iterable[Optional[int]], tag: bytes) -> Optional[int]:
+    # Сума дайджестів не залежить від порядку, а дайджест кожного елемента не дає передбачуваних колізій
+    total = 0
+    for value_hash in hashes:
+        if value_hash is None:
+            return None
+        total += digest(_encode(value_hash))
+    return digest(tag, _encode(total))
+
+
+def hash_mapping(items: Iterable[tuple[Any, Optional[int]]]) -> Optional[int]:
+    """
+    Комбінує хеші значень словника (пари ключ — хеш значення) у хеш вузла.
+    Не залежить від порядку ключів, як і порівняння словників: пари впорядковуються за хешем ключа.
+    """
+    pairs = []
+    for key, value_hash in items:
+        if value_hash is None:
+            return None
+        key_hash = _hash_key(key)
+        if key_hash is None:
+            return None
+        pairs.append((key_hash, value_hash))
+    pairs.sort()
+    parts = [_MAPPING_TAG]
+    for key_hash, value_hash in pairs:
+        parts.append(_encode(key_hash))
+        parts.append(_encode(value_hash))
+    return digest(*parts)
+
+
+def hash_sequence(hashes: Iterable[Optional[int]], tag: bytes = _SEQUENCE_TAG) -> Optional[int]:
+    """Комбінує хеші елементів списку у хеш вузла (з урахуванням порядку)."""
+    state = blake2b(tag, digest_size=16)
+    for value_hash in hashes:
+        if value_hash is None:
+            return None
+        state.update(_encode(value_hash))
+    return int.from_bytes(state.digest(), "little")
+
+
+def structural_hash(snapshot: Any) -> Optional[int]:
+    """
+    Обчислює структурний хеш уже сформованого "знімка" (dict/list/прості значення).
+    Для однакових (==) знімків хеші однакові (для значень інших типів — якщо однаковий тип);
+    різні хеші гарантують, що знімки різні. Різні знімки з однаковим хешем можливі лише
+    через колізію 128-бітного дайджесту або власного __hash__ значення.
+    """
+    if isinstance(snapshot, dict):
+        return hash_mapping((k, structural_hash(v)) for k, v in snapshot.items())
+    if isinstance(snapshot, list):
+        return hash_sequence(structural_hash(v) for v in snapshot)
+    handler = get_type_handler(type(snapshot))
+    if handler is not None and handler.hash is not None:
+        return handler.hash(snapshot)
+    return hash_scalar(snapshot)
@@ -0,0 +1,154 @@
+# instrumentation.py — хуки комітів та метрики фаз коміту ChangeTracker
+from array import array
+from typing import Any, Callable
+import sys
+import threading
+import time
+
+
+def _no_clock() -> float:
+    return 0.0
+
+
+class CommitMetrics:
+    """
+    Метрики одного коміту одного об'єкта (передаються в post_commit).
+
+    Лічильники:
+        - fields_scanned — відфільтровані поля, взяті до порівняння (з dirty_tracking — лише кандидати);
+        - fields_changed — змінені поля; entries_logged — записи журналу (у PATH/ELEMENTS їх може бути більше);
+        - snapshot_nodes — вузли (контейнери та об'єкти), обійдені для "знімків" і хешів; скаляри не враховуються;
+        - child_commits — вкладені ChangeTracker, закомічені рекурсивно (разом з їхніми вкладеними);
+        - baseline_bytes / log_bytes — приблизний розмір _original_data та _changed_log після коміту
+          (лише з measure_memory=True, інакше None).
+    Час фаз (секунди, лише з timings=True, інакше None): capture — фільтрація полів та вибір ключів,
+    diff — "знімки" та порівняння, apply — оновлення базового стану, журналу та приймача,
+    children — рекурсивні коміти вкладених об'єктів, total — увесь коміт.
+    """
+
+    __slots__ = (
+        "commit_id", "fields_scanned", "fields_changed", "entries_logged", "snapshot_nodes", "child_commits",
+        "baseline_bytes", "log_bytes", "capture_seconds", "diff_seconds", "apply_seconds", "children_seconds",
+        "total_seconds", "clock", "started"
+    )
+
+    _COUNTERS = ("fields_scanned", "fields_changed", "entries_logged", "snapshot_nodes", "child_commits")
+    _TIMINGS = ("capture_seconds", "diff_seconds", "apply_seconds", "children_seconds", "total_seconds")
+
+    def __init__(self, timings: bool):
+        self.commit_id = None
+        self.fields_scanned = 0
+        self.fields_changed = 0
+        self.entries_logged = 0
+        self.snapshot_nodes = 0
+        self.child_commits = 0
+        self.baseline_bytes = None
+        self.log_bytes = None
+        self.capture_seconds = 0.0
+        self.diff_seconds = 0.0
+        self.apply_seconds = 0.0
+        self.children_seconds = 0.0
+        self.total_seconds = 0.0
+        # Без timings час не вимірюється: фази викликають clock(), що завжди повертає 0
+        self.clock = time.perf_counter if timings else _no_clock
+        self.started = self.clock()
+
+    @property
+    def timed(self) -> bool:
+        return self.clock is not _no_clock
+
+    def as_dict(self) -> dict[str, Any]:
+        """Плаский словник для експорту в систему метрик (час — None, якщо timings вимкнено)."""
+        result = {"commit_id": self.commit_id}
+        for name in self._COUNTERS:
+            result[name] = getattr(self, name)
+        result["baseline_bytes"] = self.baseline_bytes
+        result["log_bytes"] = self.log_bytes
+        for name in self._TIMINGS:
+            result[name] = getattr(self, name) if self.timed else None
+        return result
+
+
+class ChangeTrackerInstrumentation:
+    """
+    Хуки та метрики комітів (ChangeTracker(instrumentation=...)). Один екземпляр можна передати багатьом об'єктам:
+    метрики кожного коміту передаються в post_commit, а сумарні значення накопичуються в as_dict().
+
+    :param pre_commit: pre_commit(tracker) — перед комітом об'єкта, до зняття посилань на поля
+        (хук може змінити поля — зміни потраплять у цей коміт).
+    :param post_commit: post_commit(tracker, logs, metrics) — після коміту об'єкта та його вкладених ChangeTracker;
+        logs — записи коміту самого об'єкта (порожній список, якщо змін немає), metrics — CommitMetrics.
+    :param timings: Вимірювати час фаз коміту.
+    :param measure_memory: Після кожного коміту оцінювати розмір _original_data та _changed_log (обхід усього стану —
+        помітно сповільнює коміт, тож лише для діагностики).
+
+    Без instrumentation (за замовчуванням) коміт виконує лише перевірку на None.
+    Хуки викликаються для commit(), acommit() та commit_many()/commit_parallel().
+    """
+
+    def __init__(self, pre_commit: Callable = None, post_commit: Callable = None, timings: bool = True, measure_memory: bool = False):
+        self.pre_commit = pre_commit
+        self.post_commit = post_commit
+        self.timings = timings
+        self.measure_memory = measure_memory
+        self._lock = threading.Lock()
+        self._totals = {}
+
+    def begin(self, tracker) -> CommitMetrics:
+        if self.pre_commit is not None:
+            self.pre_commit(tracker)
+        return CommitMetrics(self.timings)
+
+    def end(self, tracker, logs: list, metrics: CommitMetrics) -> None:
+        metrics.total_seconds = metrics.clock() - metrics.started
+        if self.measure_memory:
+            metrics.baseline_bytes = approximate_size(tracker._original_data)
+            metrics.log_bytes = approximate_size(tracker._changed_log)
+        with self._lock:
+            totals = self._totals
+            totals["commits"] = totals.get("commits", 0) + 1
+            for name, value in metrics.as_dict().items():
+                if name != "commit_id" and value is not None:
+                    totals[name] = totals.get(name, 0) + value
+        if self.post_commit is not None:
+            self.post_commit(tracker, logs, metrics)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Сумарні метрики всіх комітів (commits — кількість комітів; розміри — сума останніх оцінок)."""
+        with self._lock:
+            return dict(self._totals)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals = {}
+
+
+def approximate_size(value: Any) -> int:
+    """
+    Приблизний розмір значення в байтах (sys.getsizeof з обходом словників, списків, кортежів, множин, масивів
+    та атрибутів об'єктів). Спільні об'єкти враховуються один раз.
+    """
+    seen = set()
+    total = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif isinstance(item, (str, bytes, bytearray, array)):
+            continue
+        elif hasattr(item, "__slots__"):
+            for cls in type(item).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    if hasattr(item, slot):
+                        stack.append(getattr(item, slot))
+        elif hasattr(item, "__dict__") and not isinstance(item, type):
+            stack.append(item.__dict__)
+    return total
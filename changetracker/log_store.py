@@ -0,0 +1,240 @@
+# log_store.py — компактне зберігання журналу змін ChangeTracker
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from datetime import datetime
+import sys
+
+from .logs import ChangeTrackerAction, ChangeTrackerLog
+
+# Дії журналу кодуються одним байтом — індексом у цьому кортежі
+_ACTIONS = tuple(ChangeTrackerAction)
+_ACTION_CODES = {action: code for code, action in enumerate(_ACTIONS)}
+_NO_POSITIONS = array("I")
+
+
+class CommitRecord:
+    """Дані коміту, спільні для всіх його записів: ID, час, ознака ініціалізації та позиція першого запису."""
+
+    __slots__ = ("commit_id", "timestamp", "init", "start")
+
+    def __init__(self, commit_id: str, timestamp: datetime, init: bool, start: int):
+        self.commit_id = commit_id
+        self.timestamp = timestamp
+        self.init = init
+        self.start = start
+
+
+class _LogIndexes:
+    """Індекси ChangeLogStore. Будуються під час першого пошуку та доповнюються записами, доданими після нього."""
+
+    __slots__ = ("commit_numbers", "timestamps", "field_positions", "action_positions", "entries")
+
+    def __init__(self):
+        self.commit_numbers = {}
+        self.timestamps = []
+        self.field_positions = {}
+        self.action_positions = {}
+        # Кількість записів, уже внесених до field_positions та action_positions
+        self.entries = 0
+
+
+class ChangeLogStore(Sequence):
+    """
+    Компактне сховище журналу змін.
+
+    Кожен коміт зберігається один раз (CommitRecord), а записи змін — у паралельних масивах:
+    назви полів (інтерновані рядки), старі та нові значення, код дії (1 байт) та індекс коміту (4 байти).
+    Об'єкти ChangeTrackerLog створюються лише під час читання (ітерація, індексація), тому зміна
+    отриманого ChangeTrackerLog не впливає на сховище.
+
+    Індекси commit_id -> номер коміту та впорядкований список часу комітів дозволяють знайти коміт за ID або часом
+    без перебору записів (коміти вважаються доданими в порядку часу). Індекси поле -> позиції записів та
+    дія -> позиції записів (зростаючі масиви) використовуються запитами (query.py). Індекси будуються під час
+    першого пошуку, а не під час додавання: журнали, які не читають (мільйони дрібних об'єктів з init-комітом),
+    не тримають їх.
+    """
+
+    __slots__ = ("_commits", "_fields", "_old_values", "_new_values", "_actions", "_commit_index", "_indexes")
+
+    def __init__(self, logs: list[ChangeTrackerLog] = None):
+        self._commits = []
+        self._fields = []
+        self._old_values = []
+        self._new_values = []
+        self._actions = array("B")
+        self._commit_index = array("I")
+        # None — індекси ще не потрібні (_get_indexes)
+        self._indexes = None
+        if logs:
+            self.extend(logs)
+
+    def append_commit(self, logs: list[ChangeTrackerLog], commit_id: str, timestamp: datetime, init: bool) -> None:
+        """Додає записи одного коміту. Поля commit_id, timestamp та init записів ігноруються."""
+        if not logs:
+            return
+        commit_number = len(self._commits)
+        self._commits.append(CommitRecord(commit_id, timestamp, init, len(self._fields)))
+        for log in logs:
+            field = log.field
+            if type(field) is str:
+                field = sys.intern(field)
+            self._fields.append(field)
+            self._old_values.append(log.old_value)
+            self._new_values.append(log.new_value)
+            self._actions.append(_ACTIONS.index(log.action))
+            self._commit_index.append(commit_number)
+
+    def extend(self, logs: list[ChangeTrackerLog]) -> None:
+        """Додає готові записи, групуючи їх за commit_id (записи одного коміту мають йти поспіль)."""
+        group = []
+        for log in logs:
+            if group and group[0].commit_id != log.commit_id:
+                self.append_commit(group, group[0].commit_id, group[0].timestamp, group[0].init)
+                group = []
+            group.append(log)
+        if group:
+            self.append_commit(group, group[0].commit_id, group[0].timestamp, group[0].init)
+
+    def replace(self, logs: list[ChangeTrackerLog]) -> None:
+        """Замінює весь вміст сховища."""
+        self.__init__(logs)
+
+    def replace_head(self, commit_count: int, logs: list[ChangeTrackerLog], commit_id: str, timestamp: datetime, init: bool) -> None:
+        """
+        Замінює перші commit_count комітів одним комітом із записами logs (без записів — лише видаляє їх).
+        Використовується при компактизації: решта записів переноситься з масивів без створення ChangeTrackerLog.
+        Індекси будуються заново під час наступного пошуку.
+        """
+        start = self.commit_start(commit_count)
+        commits = self._commits[commit_count:]
+        fields = self._fields[start:]
+        old_values = self._old_values[start:]
+        new_values = self._new_values[start:]
+        actions = self._actions[start:]
+        commit_index = self._commit_index[start:]
+
+        self.__init__()
+        self.append_commit(logs, commit_id, timestamp, init)
+        position_shift = len(self._fields) - start
+        number_shift = len(self._commits) - commit_count
+        for record in commits:
+            self._commits.append(CommitRecord(record.commit_id, record.timestamp, record.init, record.start + position_shift))
+        self._fields.extend(fields)
+        self._old_values.extend(old_values)
+        self._new_values.extend(new_values)
+        self._actions.extend(actions)
+        self._commit_index.extend(array("I", [number + number_shift for number in commit_index]))
+
+    def _get_indexes(self, entries: bool = False) -> _LogIndexes:
+        """Повертає індекси, доповнені комітами (і, якщо entries=True, записами), доданими після попереднього пошуку."""
+        indexes = self._indexes
+        if indexes is None:
+            indexes = self._indexes = _LogIndexes()
+        timestamps = indexes.timestamps
+        for number in range(len(timestamps), len(self._commits)):
+            record = self._commits[number]
+            indexes.commit_numbers[record.commit_id] = number
+            timestamps.append(record.timestamp)
+        if entries:
+            for position in range(indexes.entries, len(self._fields)):
+                for index, key in ((indexes.field_positions, self._fields[position]), (indexes.action_positions, self._actions[position])):
+                    positions = index.get(key)
+                    if positions is None:
+                        positions = index[key] = array("I")
+                    positions.append(position)
+            indexes.entries = len(self._fields)
+        return indexes
+
+    def commit_fields(self, commit_number: int) -> list[str]:
+        """Повертає поля (шляхи) записів коміту за його порядковим номером."""
+        commit_range = self.commit_range(commit_number)
+        return self._fields[commit_range.start:commit_range.stop]
+
+    @property
+    def commits(self) -> list[CommitRecord]:
+        return self._commits
+
+    @property
+    def commit_ids(self):
+        """ID комітів журналу (представлення ключів індексу, перевірка входження за O(1))."""
+        return self._get_indexes().commit_numbers.keys()
+
+    def find_commit(self, commit_id: str) -> int:
+        """Повертає порядковий номер коміту за його ID (KeyError, якщо коміту немає в журналі)."""
+        return self._get_indexes().commit_numbers[commit_id]
+
+    def find_commit_at(self, timestamp: datetime) -> int:
+        """Повертає номер останнього коміту, зробленого не пізніше timestamp (KeyError, якщо такого немає)."""
+        commit_number = bisect_right(self._get_indexes().timestamps, timestamp) - 1
+        if commit_number < 0:
+            raise KeyError(timestamp)
+        return commit_number
+
+    def commit_logs(self, commit_number: int) -> list[ChangeTrackerLog]:
+        """Повертає записи коміту за його порядковим номером."""
+        return [self._make_log(index) for index in self.commit_range(commit_number)]
+
+    def commit_range(self, commit_number: int) -> range:
+        """Повертає діапазон позицій записів коміту за його порядковим номером."""
+        start = self._commits[commit_number].start
+        if commit_number + 1 < len(self._commits):
+            return range(start, self._commits[commit_number + 1].start)
+        return range(start, len(self._fields))
+
+    def commit_start(self, commit_number: int) -> int:
+        """Повертає позицію першого запису коміту (для номера після останнього коміту — кількість записів)."""
+        if commit_number < len(self._commits):
+            return self._commits[commit_number].start
+        return len(self._fields)
+
+    def commits_between(self, start: datetime = None, end: datetime = None) -> range:
+        """Повертає діапазон номерів комітів, зроблених у проміжку start <= час < end (межа None — без обмеження)."""
+        timestamps = self._get_indexes().timestamps
+        first = bisect_left(timestamps, start) if start is not None else 0
+        last = bisect_left(timestamps, end) if end is not None else len(self._commits)
+        return range(first, max(first, last))
+
+    def field_positions(self, field: str) -> array:
+        """Повертає зростаючий масив позицій записів поля (порожній, якщо записів немає). Масив не можна змінювати."""
+        return self._get_indexes(entries=True).field_positions.get(field, _NO_POSITIONS)
+
+    def action_positions(self, action: ChangeTrackerAction) -> array:
+        """Повертає зростаючий масив позицій записів з дією action. Масив не можна змінювати."""
+        return self._get_indexes(entries=True).action_positions.get(_ACTION_CODES[action], _NO_POSITIONS)
+
+    def _make_log(self, index: int) -> ChangeTrackerLog:
+        commit = self._commits[self._commit_index[index]]
+        return ChangeTrackerLog(
+            field=self._fields[index],
+            old_value=self._old_values[index],
+            new_value=self._new_values[index],
+            action=_ACTIONS[self._actions[index]],
+            init=commit.init,
+            timestamp=commit.timestamp,
+            commit_id=commit.commit_id
+        )
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._make_log(i) for i in range(*index.indices(len(self._fields)))]
+        if index < 0:
+            index += len(self._fields)
+        if not 0 <= index < len(self._fields):
+            raise IndexError("change log index out of range")
+        return self._make_log(index)
+
+    def __iter__(self):
+        for index in range(len(self._fields)):
+            yield self._make_log(index)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ChangeLogStore, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(entries={len(self)}, commits={len(self._commits)})"
@@ -0,0 +1,61 @@
+# logs.py — записи журналу змін changetracker
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+
+
+class ChangeTrackerAction(Enum):
+    CREATED = "created"
+    DELETED = "deleted"
+    CHANGED = "changed"
+    # Переміщення елемента списку (ChangeTrackerDiffMode.ELEMENTS): old_value — старий індекс, new_value — новий
+    MOVED = "moved"
+
+
+@dataclass
+class ChangeTrackerLog:
+    field: str
+    old_value: any
+    new_value: any
+    action: ChangeTrackerAction
+    init: bool = None
+    timestamp: datetime = None
+    commit_id: int = None
+
+
+@dataclass
+class ChangeTrackerLogs:
+    data: list[ChangeTrackerLog]
+
+    def query(self) -> "ChangeLogQuery":
+        """
+        Повертає лінивий запит до записів (ChangeLogQuery) з фільтрами field(), action(), commit(), between(), init(),
+        які можна поєднувати ланцюжком. Для журналу змін (get_change_log()) запит використовує індекси сховища
+        і не перебирає всі записи.
+        """
+        # Імпорт тут: query.py залежить від log_store.py, який імпортує цей модуль
+        from .query import ChangeLogQuery
+        return ChangeLogQuery(self.data)
+
+    def get_filtered_data(self, filter_action: ChangeTrackerAction = None, filter_init: bool = None) -> list[ChangeTrackerLog]:
+        """
+        Повертає відфільтрований список журналів змін (ChangeTrackerLog) відповідно до заданих фільтрів.
+
+        :param filter_action: Якщо вказано, повертає лише зміни з відповідним типом дії (створення, видалення, зміна).
+        :param filter_init: 
+            Якщо True — повертає лише ініціалізаційні зміни. 
+            Якщо False — повертає лише зміни після ініціалізації. 
+            Якщо None — повертає всі зміни незалежно від ознаки ініціалізації.
+        :return: list[ChangeTrackerLog] - Відфільтрований список журналів змін.
+
+        Обидва фільтри застосовуються разом. Для довільних фільтрів та потокового читання використовуйте query().
+        """
+        if filter_action is None and filter_init is None:
+            return self.data
+
+        query = self.query()
+        if filter_action is not None:
+            query = query.action(filter_action)
+        if filter_init is not None:
+            query = query.init(filter_init)
+        return query.to_list()
@@ -0,0 +1,102 @@
+# memo.py — таблиця ідентичності для обходу графа об'єктів під час створення "знімків" та хешів
+from typing import Any, Callable
+
+
+class SnapshotRef:
+    """
+    Посилання на об'єкт, який уже обходиться вище в тому самому "знімку" (цикл у графі об'єктів).
+    up — на скільки рівнів вкладеності вгору знаходиться цей об'єкт від місця посилання.
+
+    Посилання відносне, тож знімок однакового графа однаковий незалежно від того, з якого об'єкта почато обхід.
+    """
+
+    __slots__ = ("up",)
+
+    def __init__(self, up: int):
+        self.up = up
+
+    def __eq__(self, other) -> bool:
+        return type(other) is SnapshotRef and other.up == self.up
+
+    def __hash__(self) -> int:
+        return hash((SnapshotRef, self.up))
+
+    def __repr__(self) -> str:
+        return f"SnapshotRef(up={self.up})"
+
+
+# Позначка відсутнього запису в таблиці (None — допустимий результат, наприклад невідомий хеш)
+_MISSING = object()
+
+
+class SnapshotMemo:
+    """
+    Таблиця ідентичності (id об'єкта -> результат) для одного коміту або порівняння.
+
+    Кожен об'єкт обходиться один раз: повторні посилання на нього (з інших полів або з вкладених ChangeTracker,
+    які комітяться рекурсивно) отримують уже готовий "знімок" чи хеш. Об'єкт, який зустрівся повторно під час
+    власного обходу, замінюється на SnapshotRef.
+    Результат запам'ятовується, лише якщо піддерево об'єкта не посилається на об'єкти вище нього ("закрите"):
+    знімок із посиланням назовні залежить від місця, з якого його обійшли.
+
+    Ідентичність (id) стабільна лише поки об'єкти живі, тому таблиця використовується в межах однієї операції.
+
+    :param concurrent: Обхід виконується паралельно зі змінами об'єктів (в іншому потоці):
+        хеші не кешуються в самих об'єктах, бо можуть застаріти ще до запису.
+    """
+
+    __slots__ = ("snapshots", "hashes", "concurrent", "visits", "_active", "_stack")
+
+    def __init__(self, concurrent: bool = False):
+        self.snapshots = {}
+        self.hashes = {}
+        self.concurrent = concurrent
+        # Кількість обчислених вузлів (для метрик коміту, див. instrumentation.CommitMetrics.snapshot_nodes)
+        self.visits = 0
+        # id об'єкта, що обходиться зараз -> його рівень у стеку
+        self._active = {}
+        # Для кожного рівня — найменший рівень, на який посилається його піддерево
+        self._stack = []
+
+    def push(self, value: Any) -> None:
+        """Позначає об'єкт як такий, що обходиться (корінь обходу — ChangeTracker, поля якого порівнюються)."""
+        self._active[id(value)] = len(self._stack)
+        self._stack.append(len(self._stack))
+
+    def pop(self, value: Any) -> int:
+        """Завершує обхід об'єкта і повертає найменший рівень, на який посилається його піддерево."""
+        del self._active[id(value)]
+        low = self._stack.pop()
+        if self._stack and low < self._stack[-1]:
+            self._stack[-1] = low
+        return low
+
+    def visit(self, value: Any, table: dict, compute: Callable[[Any, "SnapshotMemo"], Any], make_ref: Callable[[SnapshotRef], Any] = None) -> Any:
+        """
+        Повертає результат для value з таблиці table або обчислює його через compute(value, memo).
+        Для циклічного посилання повертає SnapshotRef (або make_ref(SnapshotRef), якщо вказано).
+        """
+        key = id(value)
+        result = table.get(key, _MISSING)
+        if result is not _MISSING:
+            return result
+        level = self._active.get(key)
+        if level is not None:
+            if level < self._stack[-1]:
+                self._stack[-1] = level
+            ref = SnapshotRef(len(self._stack) - level)
+            return ref if make_ref is None else make_ref(ref)
+
+        self.visits += 1
+        self.push(value)
+        try:
+            result = compute(value, self)
+        finally:
+            low = self.pop(value)
+        if low >= len(self._stack):
+            table[key] = result
+        return result
+
+    def is_closed(self, value: Any, table: dict) -> bool:
+        """Чи запам'ятований результат для value (тобто його піддерево не посилається назовні)."""
+        return id(value) in table
@@ -0,0 +1,200 @@
+# parallel.py — пошук змін великих наборів ChangeTracker у пулі процесів
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from typing import Iterable
+import io
+import os
+import pickle
+
+from .bulk import collect_trackers, commit_prepared
+from .core import ChangeTracker, ChangeTrackerBase, ChangeTrackerDiffMode, _PreparedCommit, _TrackedBaseline, _root_field
+from .filtering import ChangeTrackerIncludeMode, get_filter_plan
+from .logs import ChangeTrackerLogs
+from .memo import SnapshotMemo
+
+
+class _RemoteTracker(ChangeTracker):
+    """
+    ChangeTracker у процесі пулу: лише відфільтровані поля оригіналу, без журналу та службових міток.
+    Знімки та хеші будуються тим самим обходом (_make_field_snapshot/_make_field_hash), тож збігаються з оригіналом.
+    """
+
+    # Службові мітки, потрібні _diff() та обходу вкладених об'єктів. Атрибути класу замінюють властивості ChangeTracker,
+    # що читають спільні налаштування (_config), — _hash_only_fields кожного завдання встановлюється в __dict__
+    _lock = None
+    _dirty_keys = None
+    _hash_cache = None
+    _hash_only_fields = frozenset()
+
+    def __init__(self):
+        pass
+
+    def __setstate__(self, state: dict[str, any]) -> None:
+        self.__dict__.update(state)
+
+
+# Поля вже відфільтровані планом оригіналу — у процесі пулу відкидаються лише службові мітки
+_RemoteTracker._filter_plan = get_filter_plan(_RemoteTracker, ChangeTrackerIncludeMode.ALL, exclude_fields=ChangeTracker._SYSTEM_KEYS)
+
+
+class _PayloadPickler(pickle.Pickler):
+    """Серіалізує ChangeTracker (зокрема вкладені) як _RemoteTracker з відфільтрованими полями."""
+
+    def reducer_override(self, obj):
+        if isinstance(obj, ChangeTrackerBase):
+            # Стан передається окремо від конструктора — цикли між об'єктами серіалізуються коректно
+            return _RemoteTracker, (), obj._get_filtered_data(data=obj._get_fields())
+        return NotImplemented
+
+
+def _dumps(jobs: list) -> bytes:
+    buffer = io.BytesIO()
+    _PayloadPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(jobs)
+    return buffer.getvalue()
+
+
+def _diff_chunk(payload: bytes) -> list[tuple]:
+    """
+    Виконується в процесі пулу: порівнює поля кожного об'єкта частини з переданим базовим станом.
+    Повертає для кожного об'єкта (записи, нові знімки полів, що мають записи, хеші).
+    Знімки полів без змін не пересилаються назад: батьківський процес лишає власний базовий стан.
+    """
+    memo = SnapshotMemo(concurrent=True)
+    results = []
+    for tracker, keys, baseline, hashes, hash_only_fields, diff_mode in pickle.loads(payload):
+        tracker.__dict__.update(_original_data=baseline, _original_hashes=hashes, _hash_only_fields=hash_only_fields)
+        new_filtered_data = tracker._get_filtered_data(data=tracker.__dict__, keys=keys)
+        logs, snapshots, new_hashes = tracker._diff(new_filtered_data, keys=keys, diff_mode=diff_mode, memo=memo)
+        changed = {_root_field(log.field) for log in logs}
+        results.append((logs, {key: value for key, value in snapshots.items() if key in changed}, new_hashes))
+    return results
+
+
+def _make_job(tracker: ChangeTrackerBase, prepared: _PreparedCommit) -> tuple:
+    """
+    Повертає завдання для процесу пулу: лише ключі, що потребують порівняння, та їхній базовий стан.
+    Незмінені відстежувані контейнери (copy-on-write) не пересилаються — одразу записуються в prepared.snapshots.
+    """
+    data = prepared.new_filtered_data
+    original_data = tracker._original_data
+    keys = set(data) | set(original_data) if prepared.keys is None else set(prepared.keys)
+    prepared.snapshots = {}
+    baseline = {}
+    for key in list(keys):
+        if key not in original_data:
+            continue
+        value = original_data[key]
+        if type(value) is _TrackedBaseline:
+            if value.container is data.get(key) and not value.container._ct_opaque and key not in (tracker._dirty_keys or ()):
+                prepared.snapshots[key] = value
+                keys.discard(key)
+                continue
+            value = tracker._get_field_snapshot(value.container)
+        baseline[key] = value
+    if not keys:
+        return None
+    hashes = None
+    if tracker._original_hashes is not None:
+        hashes = {key: tracker._original_hashes[key] for key in keys if key in tracker._original_hashes}
+    # Список зберігає порядок ключів батьківського процесу: порядок записів не залежить від процесу пулу
+    return tracker, list(keys), baseline, hashes, tracker._hash_only_fields, prepared.diff_mode
+
+
+def _diff_in_pool(prepared: list[tuple[ChangeTrackerBase, _PreparedCommit]], executor: Executor, max_workers: int, chunk_size: int) -> None:
+    """
+    Заповнює logs, snapshots та hashes підготовлених комітів, порівнюючи об'єкти в пулі процесів.
+    Частини обробляються паралельно, а результати зливаються в порядку об'єктів — результат детермінований.
+    """
+    jobs = []
+    for tracker, prepared_commit in prepared:
+        prepared_commit.logs = []
+        prepared_commit.hashes = {}
+        job = _make_job(tracker, prepared_commit)
+        if job is not None:
+            jobs.append((tracker, prepared_commit, job))
+    if not jobs:
+        return
+
+    workers = max_workers or getattr(executor, "_max_workers", None) or os.cpu_count() or 1
+    if chunk_size is None:
+        # Кілька частин на процес вирівнюють навантаження, якщо об'єкти різного розміру
+        chunk_size = max(1, -(-len(jobs) // (workers * 4)))
+    payloads = [_dumps([job for _, _, job in jobs[i:i + chunk_size]]) for i in range(0, len(jobs), chunk_size)]
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        chunks = list(executor.map(_diff_chunk, payloads))
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    results = (result for chunk in chunks for result in chunk)
+    for (tracker, prepared_commit, job), (logs, snapshots, hashes) in zip(jobs, results):
+        # Поля без записів не змінились: базовий стан завдання — той самий об'єкт, що й у _original_data
+        # (для відстежуваних контейнерів — знімок, з яким порівнював процес пулу)
+        changed = {_root_field(log.field) for log in logs}
+        _, keys, baseline, *_ = job
+        for key in keys:
+            if key not in changed and key in baseline:
+                snapshots[key] = baseline[key]
+        prepared_commit.logs = logs
+        prepared_commit.snapshots.update(snapshots)
+        prepared_commit.hashes = hashes
+
+
+def commit_parallel(
+    trackers: Iterable[ChangeTrackerBase],
+    executor: Executor = None,
+    max_workers: int = None,
+    chunk_size: int = None,
+    init: bool = False,
+    commit_id: str = None,
+    timestamp: datetime = None,
+    diff_mode: ChangeTrackerDiffMode = None
+) -> ChangeTrackerLogs:
+    """
+    Як commit_many(), але "знімки" та порівняння виконуються в пулі процесів.
+
+    :param trackers: Об'єкти для коміту (разом із вкладеними ChangeTracker).
+    :param executor: Пул процесів (наприклад, ProcessPoolExecutor), який можна використовувати повторно.
+        Якщо не вказано, створюється ProcessPoolExecutor на час виклику.
+    :param max_workers: Кількість процесів для нового пулу (за замовчуванням — кількість ядер).
+    :param chunk_size: Кількість об'єктів в одній частині. За замовчуванням — приблизно чотири частини на процес.
+    :return: ChangeTrackerLogs — об'єднаний журнал змін усіх об'єктів (у порядку collect_trackers()).
+    Решта параметрів — як у commit_many().
+
+    Опис:
+        - Для кожного об'єкта в процес пулу передаються лише поля, які потрібно порівняти, та їхній базовий стан
+          (pickle, вкладені ChangeTracker — лише відфільтровані поля). Об'єкти без "брудних" полів не передаються.
+        - Нові базові стани повертаються в батьківський процес і застосовуються так само, як у commit_many():
+          атомарно, під одним commit_id, з оновленням батьків поза набором.
+        - Значення полів мають серіалізуватися pickle. Обробники типів (register_type_handler) мають бути
+          зареєстровані в процесах пулу (наприклад, під час імпорту модуля).
+    """
+    def diff_all(prepared: list[tuple[ChangeTrackerBase, _PreparedCommit]]) -> None:
+        _diff_in_pool(prepared, executor, max_workers, chunk_size)
+
+    return commit_prepared(collect_trackers(trackers), diff_all, init=init, commit_id=commit_id, timestamp=timestamp, diff_mode=diff_mode)
+
+
+def get_changed_data_parallel(
+    trackers: Iterable[ChangeTrackerBase],
+    executor: Executor = None,
+    max_workers: int = None,
+    chunk_size: int = None,
+    diff_mode: ChangeTrackerDiffMode = None
+) -> list[ChangeTrackerLogs]:
+    """
+    Як get_changed_data() для кожного з об'єктів, але порівняння виконується в пулі процесів (див. commit_parallel()).
+
+    :return: Список ChangeTrackerLogs у порядку trackers (вкладені ChangeTracker окремо не порівнюються).
+    """
+    trackers = list(trackers)
+    prepared = []
+    for tracker in trackers:
+        with tracker._commit_guard():
+            prepared.append((tracker, tracker._capture_commit(new_data=None, diff_mode=diff_mode, detach_dirty=False)))
+    _diff_in_pool(prepared, executor, max_workers, chunk_size)
+    return [ChangeTrackerLogs(data=prepared_commit.logs) for _, prepared_commit in prepared]
@@ -0,0 +1,187 @@
+# query.py — ліниві запити до журналу змін з використанням індексів ChangeLogStore
+from bisect import bisect_left
+from datetime import datetime
+from typing import Iterator, Sequence
+
+from .log_store import _ACTION_CODES, ChangeLogStore
+from .logs import ChangeTrackerAction, ChangeTrackerLog
+
+# Фільтр не задано
+_ANY = object()
+
+
+class ChangeLogQuery:
+    """
+    Лінивий запит до записів журналу змін (ChangeTrackerLogs.query()).
+
+    Кожен фільтр повертає новий запит, тож їх можна поєднувати ланцюжком; записи обчислюються лише під час ітерації
+    (по одному, без проміжних списків). Для ChangeLogStore (get_change_log()) запит не перебирає весь журнал:
+        - commit() та between() обмежують діапазон позицій записів (індекс commit_id та бінарний пошук за часом);
+        - field() та action() беруть готові масиви позицій з індексів сховища;
+    перебирається найменший із кандидатів, решта фільтрів перевіряються для кожної його позиції за O(1).
+    Для звичайного списку записів (get_changed_data()) фільтри перевіряються перебором.
+
+    ```python
+    logs.query().field("balance").between(start, end).action(ChangeTrackerAction.CHANGED).count()
+    ```
+    """
+
+    __slots__ = ("_data", "_field", "_action", "_commit_id", "_start", "_end", "_init", "_empty")
+
+    def __init__(self, data: Sequence[ChangeTrackerLog]):
+        self._data = data
+        self._field = _ANY
+        self._action = _ANY
+        self._commit_id = _ANY
+        self._start = None
+        self._end = None
+        self._init = _ANY
+        # Суперечливі фільтри (наприклад, два різні поля) — результат порожній
+        self._empty = False
+
+    def _copy(self) -> "ChangeLogQuery":
+        query = ChangeLogQuery(self._data)
+        for slot in self.__slots__[1:]:
+            setattr(query, slot, getattr(self, slot))
+        return query
+
+    def _with(self, name: str, value) -> "ChangeLogQuery":
+        query = self._copy()
+        current = getattr(self, name)
+        if current is not _ANY and current != value:
+            query._empty = True
+        setattr(query, name, value)
+        return query
+
+    def field(self, field: str) -> "ChangeLogQuery":
+        """Лише записи поля field (для PATH/ELEMENTS — точний шлях, наприклад "address.city")."""
+        return self._with("_field", field)
+
+    def action(self, action: ChangeTrackerAction) -> "ChangeLogQuery":
+        """Лише записи з дією action."""
+        return self._with("_action", action)
+
+    def commit(self, commit_id: str) -> "ChangeLogQuery":
+        """Лише записи коміту commit_id."""
+        return self._with("_commit_id", commit_id)
+
+    def init(self, init: bool) -> "ChangeLogQuery":
+        """True — лише ініціалізаційні записи, False — лише записи після ініціалізації."""
+        return self._with("_init", init)
+
+    def between(self, start: datetime = None, end: datetime = None) -> "ChangeLogQuery":
+        """Лише записи комітів, зроблених у проміжку start <= timestamp < end. Повторний виклик звужує проміжок."""
+        query = self._copy()
+        if start is not None and (query._start is None or start > query._start):
+            query._start = start
+        if end is not None and (query._end is None or end < query._end):
+            query._end = end
+        return query
+
+    def __iter__(self) -> Iterator[ChangeTrackerLog]:
+        if self._empty:
+            return
+        if isinstance(self._data, ChangeLogStore):
+            store = self._data
+            for position in self._positions(store):
+                yield store._make_log(position)
+        else:
+            for log in self._data:
+                if self._matches(log):
+                    yield log
+
+    def count(self) -> int:
+        """Кількість записів. Для ChangeLogStore без перевірок окремих записів — без їх перебору."""
+        if self._empty:
+            return 0
+        if isinstance(self._data, ChangeLogStore):
+            candidates, checks = self._plan(self._data)
+            if not checks:
+                return min(len(candidate) for candidate in candidates)
+            return sum(1 for _ in self._positions(self._data))
+        return sum(1 for _ in self)
+
+    def first(self) -> ChangeTrackerLog:
+        """Перший запис (у порядку журналу) або None."""
+        return next(iter(self), None)
+
+    def to_list(self) -> list[ChangeTrackerLog]:
+        return list(self)
+
+    def _matches(self, log: ChangeTrackerLog) -> bool:
+        return (
+            (self._field is _ANY or log.field == self._field)
+            and (self._action is _ANY or log.action == self._action)
+            and (self._commit_id is _ANY or log.commit_id == self._commit_id)
+            and (self._init is _ANY or log.init == self._init)
+            and (self._start is None or (log.timestamp is not None and log.timestamp >= self._start))
+            and (self._end is None or (log.timestamp is not None and log.timestamp < self._end))
+        )
+
+    def _plan(self, store: ChangeLogStore) -> tuple[list, list]:
+        """
+        Повертає кандидатів (діапазон позицій та зрізи масивів індексів у ньому) і фільтри,
+        які треба перевірити для кожної позиції найменшого кандидата.
+        """
+        low, high = 0, len(store)
+        if self._commit_id is not _ANY:
+            if self._commit_id not in store.commit_ids:
+                return [range(0)], []
+            positions = store.commit_range(store.find_commit(self._commit_id))
+            low, high = max(low, positions.start), min(high, positions.stop)
+        if self._start is not None or self._end is not None:
+            commits = store.commits_between(self._start, self._end)
+            low, high = max(low, store.commit_start(commits.start)), min(high, store.commit_start(commits.stop))
+        high = max(low, high)
+
+        candidates = [range(low, high)]
+        indexed = []
+        if self._field is not _ANY:
+            indexed.append(("field", store.field_positions(self._field)))
+        if self._action is not _ANY:
+            indexed.append(("action", store.action_positions(self._action)))
+        for name, positions in indexed:
+            candidates.append(_PositionSlice(positions, bisect_left(positions, low), bisect_left(positions, high)))
+
+        # Найменший кандидат перебирається, решта індексованих фільтрів перевіряються для кожної позиції
+        driver = min(range(len(candidates)), key=lambda i: len(candidates[i]))
+        checks = [name for i, (name, _) in enumerate(indexed, start=1) if i != driver]
+        if self._init is not _ANY:
+            checks.append("init")
+        candidates.insert(0, candidates.pop(driver))
+        return candidates, checks
+
+    def _positions(self, store: ChangeLogStore) -> Iterator[int]:
+        candidates, checks = self._plan(store)
+        fields, actions, commit_index, commits = store._fields, store._actions, store._commit_index, store.commits
+        field = self._field
+        action_code = _ACTION_CODES[self._action] if self._action is not _ANY else None
+        init = self._init
+        check_field, check_action, check_init = "field" in checks, "action" in checks, "init" in checks
+        for position in candidates[0]:
+            if check_field and fields[position] != field:
+                continue
+            if check_action and actions[position] != action_code:
+                continue
+            if check_init and commits[commit_index[position]].init != init:
+                continue
+            yield position
+
+
+class _PositionSlice:
+    """Частина зростаючого масиву позицій [start, stop) без копіювання."""
+
+    __slots__ = ("positions", "start", "stop")
+
+    def __init__(self, positions: Sequence[int], start: int, stop: int):
+        self.positions = positions
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __iter__(self) -> Iterator[int]:
+        positions = self.positions
+        for index in range(self.start, self.stop):
+            yield positions[index]
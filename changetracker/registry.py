@@ -0,0 +1,173 @@
+# registry.py — реєстр обробників типів: "знімок", порівняння, diff та хеш значень окремих типів
+from hashlib import blake2b
+from typing import Any, Callable, Iterator, Optional
+
+
+class TypeHandler:
+    """
+    Обробник значень одного типу. Будь-яка з функцій може бути None — тоді використовується стандартна поведінка.
+
+    :param snapshot: value -> "знімок" значення (незалежна від оригіналу копія).
+    :param equals: (old_snapshot, new_snapshot) -> bool. Викликається, лише якщо обидва знімки обробляє цей обробник.
+    :param diff: (path, old_snapshot, new_snapshot) -> ітератор кортежів (операція, шлях, старе, нове)
+        для режимів PATH/ELEMENTS (див. diff.diff_paths). Викликається лише для різних знімків.
+    :param hash: value -> int або None (хеш невідомий). Має давати однаковий результат для значення та його знімка.
+    """
+
+    __slots__ = ("snapshot", "equals", "diff", "hash")
+
+    def __init__(self, snapshot: Callable = None, equals: Callable = None, diff: Callable = None, hash: Callable = None):
+        self.snapshot = snapshot
+        self.equals = equals
+        self.diff = diff
+        self.hash = hash
+
+
+# Обробники, зареєстровані для точних типів
+_HANDLERS: dict[type, TypeHandler] = {}
+# Кеш пошуку за MRO: тип -> обробник найближчого зареєстрованого предка (або None)
+_RESOLVED: dict[type, Optional[TypeHandler]] = {}
+# Обробники для необов'язкових залежностей реєструються під час першої появи значення з відповідного модуля,
+# тож імпорт changetracker не імпортує numpy
+_LAZY_MODULES: dict[str, Callable[[], None]] = {}
+
+
+def register_type_handler(
+    cls: type,
+    snapshot: Callable[[Any], Any] = None,
+    equals: Callable[[Any, Any], bool] = None,
+    diff: Callable[[str, Any, Any], Iterator[tuple[str, str, Any, Any]]] = None,
+    hash: Callable[[Any], Optional[int]] = None
+) -> TypeHandler:
+    """
+    Реєструє обробник для типу cls та його підкласів (якщо для підкласу немає власного обробника).
+    Повторна реєстрація замінює попередній обробник.
+
+        register_type_handler(pandas.DataFrame, snapshot=lambda df: df.copy(), equals=lambda a, b: a.equals(b))
+    """
+    handler = TypeHandler(snapshot=snapshot, equals=equals, diff=diff, hash=hash)
+    _HANDLERS[cls] = handler
+    _RESOLVED.clear()
+    return handler
+
+
+def unregister_type_handler(cls: type) -> None:
+    """Видаляє обробник типу cls (якщо він був зареєстрований)."""
+    _HANDLERS.pop(cls, None)
+    _RESOLVED.clear()
+
+
+def get_type_handler(cls: type) -> Optional[TypeHandler]:
+    """Повертає обробник для типу cls: зареєстрований для нього або для найближчого предка за MRO."""
+    try:
+        return _RESOLVED[cls]
+    except KeyError:
+        pass
+    loader = _LAZY_MODULES.pop(cls.__module__.partition(".")[0], None)
+    if loader is not None:
+        loader()
+    handler = None
+    for base in cls.__mro__:
+        handler = _HANDLERS.get(base)
+        if handler is not None:
+            break
+    _RESOLVED[cls] = handler
+    return handler
+
+
+def values_equal(old: Any, new: Any) -> bool:
+    """
+    Порівнює два "знімки" з урахуванням зареєстрованих обробників.
+    Якщо стандартне порівняння неоднозначне (наприклад, масиви NumPy всередині словника),
+    словники та списки порівнюються поелементно.
+    """
+    handler = get_type_handler(type(new))
+    if handler is not None and handler.equals is not None and get_type_handler(type(old)) is handler:
+        return handler.equals(old, new)
+    try:
+        return bool(old == new)
+    except (ValueError, TypeError):
+        pass
+    if type(old) is dict and type(new) is dict:
+        return old.keys() == new.keys() and all(values_equal(value, new[key]) for key, value in old.items())
+    if type(old) is list and type(new) is list:
+        return len(old) == len(new) and all(values_equal(a, b) for a, b in zip(old, new))
+    return False
+
+
+# --- bytes / bytearray / memoryview ---
+
+def _bytes_hash(value) -> int:
+    # Те саме кодування, що й hashing.hash_scalar для bytes
+    return int.from_bytes(blake2b(b"y" + bytes(value), digest_size=16).digest(), "little")
+
+
+def _bytes_diff(path: str, old: Any, new: Any) -> Iterator[tuple[str, str, Any, Any]]:
+    """Повертає одну зміну для діапазону між спільними початком і кінцем: data[3:7]."""
+    if not isinstance(old, bytes):
+        yield "changed", path, old, new
+        return
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]:
+        start += 1
+    end = 0
+    while end < limit - start and old[-1 - end] == new[-1 - end]:
+        end += 1
+    yield "changed", f"{path}[{start}:{len(new) - end}]", old[start:len(old) - end], new[start:len(new) - end]
+
+
+register_type_handler(bytes, diff=_bytes_diff, hash=_bytes_hash)
+# Мутабельні буфери фіксуються як незмінні bytes
+register_type_handler(bytearray, snapshot=bytes, diff=_bytes_diff, hash=_bytes_hash)
+register_type_handler(memoryview, snapshot=memoryview.tobytes, diff=_bytes_diff, hash=_bytes_hash)
+
+
+# --- NumPy ---
+
+def _register_numpy() -> None:
+    import numpy
+
+    # Обробник, зареєстрований користувачем, не замінюємо
+    if numpy.ndarray in _HANDLERS:
+        return
+
+    def snapshot(value):
+        return value.copy()
+
+    def equals(old, new):
+        return (
+            old.shape == new.shape
+            and old.dtype == new.dtype
+            and bool(numpy.array_equal(old, new))
+        )
+
+    def diff(path, old, new):
+        """
+        Векторизоване порівняння масивів однакової форми: повертає діапазони змінених елементів
+        (arr[3:7], для багатовимірних масивів — індекси у "сплющеному" масиві) лише зі зміненими значеннями.
+        """
+        if not isinstance(old, numpy.ndarray) or old.shape != new.shape or old.dtype != new.dtype:
+            yield "changed", path, old, new
+            return
+        old_flat, new_flat = old.reshape(-1), new.reshape(-1)
+        changed = numpy.flatnonzero(old_flat != new_flat)
+        if changed.size == 0:
+            return
+        # Межі неперервних діапазонів змінених індексів
+        breaks = numpy.flatnonzero(numpy.diff(changed) != 1)
+        starts = numpy.concatenate(([changed[0]], changed[breaks + 1]))
+        stops = numpy.concatenate((changed[breaks], [changed[-1]])) + 1
+        for start, stop in zip(starts.tolist(), stops.tolist()):
+            yield "changed", f"{path}[{start}:{stop}]", old_flat[start:stop].copy(), new_flat[start:stop].copy()
+
+    def value_hash(value):
+        if value.dtype.hasobject:
+            return None
+        header = f"{value.dtype.str}{value.shape}".encode()
+        return int.from_bytes(blake2b(b"a" + header + value.tobytes(), digest_size=16).digest(), "little")
+
+    register_type_handler(numpy.ndarray, snapshot=snapshot, equals=equals, diff=diff, hash=value_hash)
+
+
+_LAZY_MODULES["numpy"] = _register_numpy
@@ -0,0 +1,87 @@
+# retention.py — обмеження розміру журналу змін та його компактизація
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from .log_store import ChangeLogStore
+from .logs import ChangeTrackerAction, ChangeTrackerLog
+from .registry import values_equal
+
+# Журнал, що перевищив обмеження, згортається на 1/_FOLD_SLACK нижче за нього: згортання (перебудова сховища,
+# O(записів)) виконується пакетами, а не після кожного коміту, тож у середньому коштує O(1) на коміт
+_FOLD_SLACK = 4
+
+
+@dataclass(frozen=True)
+class ChangeTrackerRetention:
+    """
+    Політика зберігання журналу змін ChangeTracker.
+
+    Коли журнал перевищує будь-яке з обмежень, найстаріші коміти згортаються в один коміт-"чекпоінт"
+    з чистими (net) змінами кожного поля (див. fold_states). Згортається із запасом — на чверть обмеження більше,
+    ніж потрібно, тож наступні коміти якийсь час не згортаються.
+
+    :param max_entries: Максимальна кількість записів у журналі (разом із записами чекпоінта).
+    :param max_age: Максимальний вік коміту; старші коміти згортаються в чекпоінт.
+    :param max_commits: Кількість останніх комітів, що зберігаються окремо (без урахування чекпоінта).
+    """
+    max_entries: int = None
+    max_age: timedelta = None
+    max_commits: int = None
+
+
+def fold_states(before: dict[str, any], after: dict[str, any]) -> list[ChangeTrackerLog]:
+    """
+    Записи коміту-"чекпоінта", що згортає кілька комітів: по одному запису на поле (як у режимі FIELD) —
+    від стану поля перед першим згорнутим комітом (before) до стану після останнього (after).
+    Поле, створене і потім видалене, або повернуте до початкового значення, з чекпоінта зникає.
+    Записи PATH/ELEMENTS згорнутих комітів не переносяться: чекпоінт містить поля цілком.
+    commit_id, timestamp та init чекпоінта задає сховище (ChangeLogStore.replace_head).
+    """
+    result = []
+    for field, new_value in after.items():
+        if field not in before:
+            result.append(ChangeTrackerLog(field=field, old_value=None, new_value=new_value, action=ChangeTrackerAction.CREATED))
+        elif not values_equal(before[field], new_value):
+            result.append(ChangeTrackerLog(field=field, old_value=before[field], new_value=new_value, action=ChangeTrackerAction.CHANGED))
+    for field, old_value in before.items():
+        if field not in after:
+            result.append(ChangeTrackerLog(field=field, old_value=old_value, new_value=None, action=ChangeTrackerAction.DELETED))
+    return result
+
+
+def exceeds_retention(logs: ChangeLogStore, retention: ChangeTrackerRetention, now: datetime) -> bool:
+    """Швидка перевірка, чи порушує журнал хоча б одне з обмежень: O(1) за записами комітів сховища."""
+    if not logs:
+        return False
+    commits = logs.commits
+    return (
+        (retention.max_entries is not None and len(logs) > retention.max_entries)
+        or (retention.max_age is not None and commits[0].timestamp < now - retention.max_age)
+        or (retention.max_commits is not None and len(commits) > retention.max_commits + 1)
+    )
+
+
+def get_retention_fold_count(logs: ChangeLogStore, retention: ChangeTrackerRetention, now: datetime) -> int:
+    """
+    Повертає кількість найстаріших комітів, які потрібно згорнути, щоб журнал відповідав політиці із запасом
+    (_FOLD_SLACK). Використовує лише записи комітів сховища, без створення ChangeTrackerLog.
+    """
+    commits = logs.commits
+    fold_count = 0
+    if retention.max_commits is not None:
+        fold_count = max(fold_count, len(commits) - (retention.max_commits - retention.max_commits // _FOLD_SLACK))
+    if retention.max_age is not None:
+        border = now - (retention.max_age - retention.max_age / _FOLD_SLACK)
+        fold_count = max(fold_count, logs.commits_between(end=border).stop)
+
+    if retention.max_entries is not None:
+        # Згортаємо коміти один за одним, поки журнал не вміститься в обмеження.
+        # Розмір чекпоінта оцінюємо згори кількістю різних полів (шляхів) у згорнутих комітах.
+        limit = retention.max_entries - retention.max_entries // _FOLD_SLACK
+        fields = set()
+        for number in range(fold_count):
+            fields.update(logs.commit_fields(number))
+        while fold_count < len(commits) and (len(fields) if fold_count else 0) + len(logs) - logs.commit_start(fold_count) > limit:
+            fields.update(logs.commit_fields(fold_count))
+            fold_count += 1
+    return fold_count
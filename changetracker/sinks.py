@@ -0,0 +1,263 @@
+# sinks.py — збереження журналу змін поза пам'яттю (JSONL, SQLite) з пакетним записом
+from abc import ABC, abstractmethod
+from datetime import datetime
+from enum import Enum
+from typing import Iterator
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .logs import ChangeTrackerAction, ChangeTrackerLog
+
+
+class ChangeLogFsyncPolicy(Enum):
+    # Не викликати fsync (дані потрапляють на диск, коли вирішить ОС)
+    NEVER = "never"
+    # fsync після кожного скидання пакета
+    FLUSH = "flush"
+    # fsync лише під час закриття
+    CLOSE = "close"
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, Enum):
+        return value.value
+    return repr(value)
+
+
+def log_to_record(log: ChangeTrackerLog) -> dict:
+    """
+    Перетворює ChangeTrackerLog на словник, придатний для JSON.
+    Значення, які не підтримуються JSON, зберігаються як repr (читання назад їх не відновлює).
+    """
+    return {
+        "commit_id": log.commit_id,
+        "timestamp": log.timestamp.isoformat() if log.timestamp is not None else None,
+        "init": log.init,
+        "field": log.field,
+        "action": log.action.value,
+        "old_value": log.old_value,
+        "new_value": log.new_value,
+    }
+
+
+def record_to_log(record: dict) -> ChangeTrackerLog:
+    """Відновлює ChangeTrackerLog зі словника, створеного log_to_record."""
+    timestamp = record.get("timestamp")
+    return ChangeTrackerLog(
+        field=record["field"],
+        old_value=record.get("old_value"),
+        new_value=record.get("new_value"),
+        action=ChangeTrackerAction(record["action"]),
+        init=record.get("init"),
+        timestamp=datetime.fromisoformat(timestamp) if timestamp is not None else None,
+        commit_id=record.get("commit_id")
+    )
+
+
+class ChangeLogSink(ABC):
+    """
+    Базовий клас приймача журналу змін. ChangeTracker.commit() передає в write() записи кожного коміту.
+
+    Нащадки реалізують write(); flush() та close() за замовчуванням нічого не роблять.
+    Підтримує протокол контекстного менеджера (close() під час виходу).
+    """
+
+    @abstractmethod
+    def write(self, logs: list[ChangeTrackerLog]) -> None:
+        """Приймає записи одного коміту."""
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class BufferedChangeLogSink(ChangeLogSink):
+    """
+    Приймач з буфером: записи накопичуються в пам'яті та записуються пакетами через _write_batch().
+
+    :param batch_size: Кількість записів, після якої буфер скидається.
+    :param flush_interval: Максимальний час (у секундах) між скиданнями. Перевіряється під час write(),
+        окремого таймера немає. None — скидати лише за batch_size, flush() або close().
+
+    Записи з різних потоків (thread_safe, acommit() в executor) серіалізуються блокуванням приймача.
+    Після close() write() кидає ValueError. Нащадки реалізують _write_batch() та звільняють ресурси в _close().
+    """
+
+    def __init__(self, batch_size: int = 1000, flush_interval: float = None):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.closed = False
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
+
+    def write(self, logs: list[ChangeTrackerLog]) -> None:
+        with self._lock:
+            if self.closed:
+                raise ValueError(f"{type(self).__name__} is closed")
+            self._buffer.extend(logs)
+            if len(self._buffer) >= self.batch_size or (
+                self.flush_interval is not None and time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._buffer:
+                return
+            batch, self._buffer = self._buffer, []
+            self._write_batch(batch)
+
+    def close(self) -> None:
+        with self._lock:
+            if self.closed:
+                return
+            self.flush()
+            self._close()
+            self.closed = True
+
+    @abstractmethod
+    def _write_batch(self, logs: list[ChangeTrackerLog]) -> None:
+        """Записує пакет записів (під блокуванням приймача)."""
+
+    def _close(self) -> None:
+        pass
+
+
+class JsonlChangeLogSink(BufferedChangeLogSink):
+    """
+    Приймач, що дописує журнал змін у файл JSON Lines (один запис на рядок, лише додавання в кінець).
+
+    :param path: Шлях до файлу.
+    :param fsync: Політика fsync (ChangeLogFsyncPolicy).
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000, flush_interval: float = None, fsync: ChangeLogFsyncPolicy = ChangeLogFsyncPolicy.NEVER):
+        super().__init__(batch_size=batch_size, flush_interval=flush_interval)
+        self.path = path
+        self.fsync = fsync
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _write_batch(self, logs: list[ChangeTrackerLog]) -> None:
+        # Один виклик write() на пакет
+        self._file.write("".join(
+            json.dumps(log_to_record(log), ensure_ascii=False, default=_json_default) + "\n" for log in logs
+        ))
+        self._file.flush()
+        if self.fsync == ChangeLogFsyncPolicy.FLUSH:
+            os.fsync(self._file.fileno())
+
+    def _close(self) -> None:
+        if self.fsync != ChangeLogFsyncPolicy.NEVER:
+            os.fsync(self._file.fileno())
+        self._file.close()
+
+    def read(self) -> Iterator[ChangeTrackerLog]:
+        """Потоково читає записи з файлу (див. read_jsonl_change_log). Незаписаний буфер спершу скидається."""
+        self.flush()
+        return read_jsonl_change_log(self.path)
+
+
+def read_jsonl_change_log(path: str) -> Iterator[ChangeTrackerLog]:
+    """Потоково читає файл JSON Lines, записаний JsonlChangeLogSink, повертаючи ChangeTrackerLog по одному."""
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield record_to_log(json.loads(line))
+
+
+class SqliteChangeLogSink(BufferedChangeLogSink):
+    """
+    Приймач, що дописує журнал змін у таблицю SQLite. Кожен пакет записується однією транзакцією (executemany).
+
+    :param path: Шлях до файлу бази даних.
+    :param table: Назва таблиці (створюється, якщо не існує).
+    :param fsync: Політика fsync: FLUSH — PRAGMA synchronous=FULL (синхронізується кожен пакет), NEVER та CLOSE —
+        synchronous=OFF; для CLOSE файл бази синхронізується (fsync) один раз під час close().
+    """
+
+    def __init__(self, path: str, table: str = "change_log", batch_size: int = 1000, flush_interval: float = None, fsync: ChangeLogFsyncPolicy = ChangeLogFsyncPolicy.NEVER):
+        super().__init__(batch_size=batch_size, flush_interval=flush_interval)
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table!r}")
+        self.path = path
+        self.table = table
+        self.fsync = fsync
+        # Пакети можуть записуватися з executor або інших потоків (послідовно, під блокуванням приймача)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(f"PRAGMA synchronous={'FULL' if fsync == ChangeLogFsyncPolicy.FLUSH else 'OFF'}")
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, commit_id TEXT, timestamp TEXT, init INTEGER, "
+            "field TEXT, action TEXT, old_value TEXT, new_value TEXT)"
+        )
+        self._connection.commit()
+
+    def _write_batch(self, logs: list[ChangeTrackerLog]) -> None:
+        rows = []
+        for log in logs:
+            record = log_to_record(log)
+            rows.append((
+                record["commit_id"], record["timestamp"], record["init"], record["field"], record["action"],
+                json.dumps(record["old_value"], ensure_ascii=False, default=_json_default),
+                json.dumps(record["new_value"], ensure_ascii=False, default=_json_default),
+            ))
+        with self._connection:
+            self._connection.executemany(
+                f"INSERT INTO {self.table} (commit_id, timestamp, init, field, action, old_value, new_value) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def _close(self) -> None:
+        self._connection.close()
+        self._connection = None
+        if self.fsync == ChangeLogFsyncPolicy.CLOSE and self.path != ":memory:":
+            fd = os.open(self.path, os.O_RDWR)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def read(self) -> Iterator[ChangeTrackerLog]:
+        """Потоково читає записи з таблиці (див. read_sqlite_change_log). Незаписаний буфер спершу скидається."""
+        self.flush()
+        return read_sqlite_change_log(self.path, table=self.table)
+
+
+def read_sqlite_change_log(path: str, table: str = "change_log") -> Iterator[ChangeTrackerLog]:
+    """Потоково читає таблицю, записану SqliteChangeLogSink, у порядку запису."""
+    if not table.isidentifier():
+        raise ValueError(f"Invalid table name: {table!r}")
+    connection = sqlite3.connect(path)
+    try:
+        cursor = connection.execute(
+            f"SELECT commit_id, timestamp, init, field, action, old_value, new_value FROM {table} ORDER BY id"
+        )
+        for commit_id, timestamp, init, field, action, old_value, new_value in cursor:
+            yield record_to_log({
+                "commit_id": commit_id,
+                "timestamp": timestamp,
+                "init": None if init is None else bool(init),
+                "field": field,
+                "action": action,
+                "old_value": json.loads(old_value),
+                "new_value": json.loads(new_value),
+            })
+    finally:
+        connection.close()
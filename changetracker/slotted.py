@@ -0,0 +1,85 @@
+# slotted.py — ChangeTracker для класів зі __slots__ (без __dict__ в екземплярах)
+from .core import ChangeTrackerBase
+
+# Службові атрибути ChangeTracker, які SlottedChangeTracker зберігає у слотах. Решта (налаштування та рідко потрібний
+# стан) — властивості ChangeTrackerBase, що читають слоти _config та _extras
+_SYSTEM_SLOTS = tuple(key for key in ChangeTrackerBase._SYSTEM_KEYS if key not in vars(ChangeTrackerBase))
+
+# Позначка невстановленого слота
+_UNSET = object()
+
+
+class SlottedChangeTracker(ChangeTrackerBase):
+    """
+    ChangeTracker для моделей зі __slots__: поля та службові атрибути зберігаються у слотах, екземпляр не має __dict__.
+    Підходить для мільйонів дрібних об'єктів у пам'яті. Налаштування (фільтр полів, приймач журналу, retention тощо)
+    займають один слот зі спільним для конфігурації об'єктом, а рідко потрібний стан (чекпоінти, блокування,
+    статистика кешу) — ще один слот, порожній до першого використання. Журнал змін без записів спільний для всіх
+    об'єктів, а множини dirty_tracking створюються під час першого додавання ключа. Тож накладні витрати — кілька
+    слотів та базовий стан (_original_data; з deferred_baseline=True — без копій незмінних значень).
+
+    Відстежувані поля — слоти підкласів (у порядку оголошення) або явний список _tracked_fields.
+    Фільтри полів (include_mode, include_fields, exclude_fields) застосовуються до них так само, як у ChangeTracker.
+    API та поведінка — як у ChangeTracker (спільний базовий клас ChangeTrackerBase), але це не підклас ChangeTracker:
+    isinstance(value, ChangeTrackerBase) перевіряє обидва види.
+
+    ```python
+    class Point(SlottedChangeTracker):
+        __slots__ = ("x", "y")
+
+        def __init__(self, x, y):
+            self.x = x
+            self.y = y
+            super().__init__(dirty_tracking=True)
+    ```
+
+    Підклас без власних __slots__ отримує __dict__: його атрибути теж відстежуються, але економії пам'яті немає.
+    """
+
+    __slots__ = _SYSTEM_SLOTS + ("__weakref__",)
+
+    # Явний список відстежуваних полів (None — усі слоти підкласів)
+    _tracked_fields: tuple[str, ...] = None
+    # Поля класу, обчислені під час створення підкласу
+    _field_names: tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_names = tuple(cls._tracked_fields) if cls._tracked_fields is not None else _get_slot_names(cls)
+
+    def _get_fields(self, copy: bool = False) -> dict[str, any]:
+        fields = {}
+        for name in self._field_names:
+            value = getattr(self, name, _UNSET)
+            if value is not _UNSET:
+                fields[name] = value
+        extra = getattr(self, "__dict__", None)
+        if extra:
+            fields.update(extra)
+        return fields
+
+    def _get_field(self, key: str, default: any = None) -> any:
+        return getattr(self, key, default)
+
+    def _get_state(self) -> dict[str, any]:
+        state = self._get_fields()
+        for name in _SYSTEM_SLOTS:
+            state[name] = getattr(self, name)
+        return state
+
+
+def _get_slot_names(cls: type) -> tuple[str, ...]:
+    """Слоти класу та його предків (без службових слотів SlottedChangeTracker, __dict__ та __weakref__)."""
+    names = {}
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name in ("__dict__", "__weakref__") or name in _SYSTEM_SLOTS:
+                continue
+            if name.startswith("__") and not name.endswith("__"):
+                # Приватні імена слотів зберігаються "скаліченими" (_Class__name)
+                name = f"_{klass.__name__.lstrip('_')}{name}"
+            names[name] = None
+    return tuple(names)
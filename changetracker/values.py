@@ -0,0 +1,19 @@
+# values.py — допоміжні перевірки значень полів для changetracker
+from datetime import datetime
+from decimal import Decimal
+
+
+# Типи, значення яких не можуть змінитися "на місці" (in-place).
+# Поля з такими значеннями змінюються лише через присвоєння, тому в режимі dirty_tracking
+# їх не потрібно повторно перевіряти, якщо поле не було позначене як змінене.
+_IMMUTABLE_TYPES = frozenset({
+    int, float, complex, bool, str, bytes, type(None), Decimal, datetime,
+})
+
+
+def is_immutable_value(value: any) -> bool:
+    """
+    Перевіряє, чи є значення незмінним (скаляр), тобто чи може воно змінитися лише через присвоєння поля.
+    Використовується точна перевірка типу: підкласи вважаються потенційно мутабельними.
+    """
+    return type(value) in _IMMUTABLE_TYPES
@@ -0,0 +1,23 @@
+import pytest
+
+from changetracker.core import ChangeTrackerBase
+
+
+@pytest.fixture
+def count_snapshots(monkeypatch):
+    """
+    Повертає функцію, що починає рахувати виклики методу створення "знімків" ChangeTracker
+    (за замовчуванням _get_field_snapshot) і повертає список значень, для яких його викликали.
+    """
+    def start(method: str = "_get_field_snapshot") -> list:
+        calls = []
+        original = getattr(ChangeTrackerBase, method)
+
+        def counting(self, value, *args):
+            calls.append(value)
+            return original(self, value, *args)
+
+        monkeypatch.setattr(ChangeTrackerBase, method, counting)
+        return calls
+
+    return start
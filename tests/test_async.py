@@ -0,0 +1,171 @@
+import asyncio
+import threading
+
+from changetracker.core import ChangeTracker
+from changetracker.sinks import ChangeLogSink
+
+
+class Address(ChangeTracker):
+    def __init__(self, city, **kwargs):
+        self.city = city
+        super().__init__(**kwargs)
+
+
+class User(ChangeTracker):
+    def __init__(self, **kwargs):
+        self.name = "Alice"
+        self.tags = ["a"]
+        self.address = Address("Kyiv", dirty_tracking=kwargs.get("track_containers", False))
+        super().__init__(**kwargs)
+
+
+class ListSink(ChangeLogSink):
+    def __init__(self):
+        self.logs = []
+        self.threads = set()
+
+    def write(self, logs):
+        self.threads.add(threading.get_ident())
+        self.logs.extend(logs)
+
+
+def _fields(changes):
+    return sorted(log.field for log in changes.data)
+
+
+def test_acommit_matches_commit():
+    async def main():
+        u = User(track_containers=True)
+        u.name = "Bob"
+        u.tags.append("b")
+        u.address.city = "Lviv"
+        assert _fields(await u.aget_changed_data()) == ["address", "name", "tags"]
+        logs = await u.acommit(commit_id="second")
+        assert _fields(logs) == ["address", "name", "tags"]
+        assert u.get_changed_data().data == []
+        assert u.address.get_changed_data().data == []
+        assert u.state_at("second")["tags"] == ["a", "b"]
+
+    asyncio.run(main())
+
+
+def test_snapshots_and_sink_run_off_the_loop(monkeypatch):
+    threads = set()
+    original = ChangeTracker._make_field_snapshot
+
+    def recording(self, value, memo):
+        threads.add(threading.get_ident())
+        return original(self, value, memo)
+
+    async def main():
+        sink = ListSink()
+        u = User(sink=sink)
+        sink.threads.clear()
+        monkeypatch.setattr(ChangeTracker, "_make_field_snapshot", recording)
+        u.tags.append("b")
+        await u.acommit()
+        assert [log.field for log in sink.logs[-1:]] == ["tags"]
+        return sink
+
+    sink = asyncio.run(main())
+    assert threading.get_ident() not in threads
+    assert threading.get_ident() not in sink.threads
+
+
+def test_changes_during_acommit_stay_dirty(monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+    original = ChangeTracker._make_field_snapshot
+
+    def blocking(self, value, memo):
+        started.set()
+        release.wait(5)
+        return original(self, value, memo)
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        u = User(dirty_tracking=True)
+        u.name = "Bob"
+        u.tags.append("b")
+        monkeypatch.setattr(ChangeTracker, "_make_field_snapshot", blocking)
+        task = asyncio.create_task(u.acommit())
+        await loop.run_in_executor(None, started.wait, 5)
+        # Цикл подій не заблокований: змінюємо об'єкт, поки триває порівняння
+        u.name = "Carol"
+        release.set()
+        logs = await task
+        monkeypatch.setattr(ChangeTracker, "_make_field_snapshot", original)
+
+        assert {log.field: log.new_value for log in logs.data}["name"] == "Bob"
+        assert "name" in u._dirty_keys
+        changes = u.get_changed_data().data
+        assert [(log.field, log.old_value, log.new_value) for log in changes] == [("name", "Bob", "Carol")]
+
+    asyncio.run(main())
+
+
+def test_commit_order_is_preserved():
+    async def main():
+        u = User()
+        await asyncio.gather(*(u.acommit(new_data={"name": f"n{i}"}, commit_id=f"c{i}") for i in range(5)))
+        assert [record.commit_id for record in u._changed_log.commits][1:] == [f"c{i}" for i in range(5)]
+        assert [u.state_at(f"c{i}")["name"] for i in range(5)] == [f"n{i}" for i in range(5)]
+
+    asyncio.run(main())
+
+
+
+def test_concurrent_acommit_captures_state_at_call():
+    async def main():
+        u = User(dirty_tracking=True)
+        calls = []
+        for i in range(1, 30):
+            u.name = f"n{i}"
+            calls.append(u.acommit(commit_id=f"c{i}"))
+        await asyncio.gather(*calls)
+        assert [record.commit_id for record in u._changed_log.commits][1:] == [f"c{i}" for i in range(1, 30)]
+        assert [u.state_at(f"c{i}")["name"] for i in range(1, 30)] == [f"n{i}" for i in range(1, 30)]
+        assert u.get_changed_data().data == []
+        assert not u._queued_dirty
+
+    asyncio.run(main())
+
+
+def test_cancelled_acommit_keeps_dirty_fields():
+    async def main():
+        u = User(dirty_tracking=True)
+        u.name = "Bob"
+        lock = u._get_async_lock()
+        await lock.acquire()
+        task = asyncio.ensure_future(u.acommit())
+        # Коміт чекає черги, коли його скасовують
+        await asyncio.sleep(0)
+        task.cancel()
+        lock.release()
+        await asyncio.gather(task, return_exceptions=True)
+        assert "name" in u._dirty_keys
+        assert _fields(await u.acommit()) == ["name"]
+
+    asyncio.run(main())
+
+def test_aget_changed_data_uses_cache():
+    async def main():
+        u = User(track_containers=True)
+        u.name = "Bob"
+        first = await u.aget_changed_data()
+        second = await u.aget_changed_data()
+        assert _fields(first) == _fields(second) == ["name"]
+        assert u.changed_data_cache_info()["hits"] == 1
+
+    asyncio.run(main())
+
+
+def test_thread_safe_acommit():
+    async def main():
+        u = User(thread_safe=True)
+        u.name = "Bob"
+        assert _fields(await u.aget_changed_data()) == ["name"]
+        assert _fields(await u.acommit()) == ["name"]
+        assert u.get_changed_data().data == []
+
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+import pytest
+
+from changetracker.bulk import ChangeTrackerTransaction, collect_trackers, commit_many
+from changetracker.core import ChangeTracker
+from changetracker.sinks import ChangeLogSink
+
+
+class Address(ChangeTracker):
+    def __init__(self, city):
+        self.city = city
+        super().__init__()
+
+
+class User(ChangeTracker):
+    def __init__(self, name, address):
+        self.name = name
+        self.address = address
+        super().__init__()
+
+
+class Broken:
+    def to_dict(self):
+        raise RuntimeError("broken")
+
+
+def test_commit_many_uses_one_commit_id():
+    shared = Address("Kyiv")
+    users = [User(f"user{i}", shared) for i in range(3)]
+    for user in users:
+        user.name += "!"
+    shared.city = "Lviv"
+    result = commit_many(users)
+    assert len({log.commit_id for log in result.data}) == 1
+    # 3 імені + address у кожного користувача + city у спільної адреси (один раз)
+    assert len(result.data) == 3 + 3 + 1
+    assert all(user.get_changed_data().data == [] for user in users)
+    assert [log.field for log in shared.get_change_log().data if not log.init] == ["city"]
+
+
+def test_collect_trackers_visits_shared_and_cycles_once():
+    shared = Address("Kyiv")
+    first, second = User("a", shared), User("b", shared)
+    shared.owner = first
+    assert collect_trackers([first, second, first]) == [first, shared, second]
+
+
+def test_commit_many_is_atomic():
+    good = User("a", Address("Kyiv"))
+    bad = User("b", Address("Lviv"))
+    good.name = "changed"
+    bad.extra = Broken()
+    with pytest.raises(RuntimeError):
+        commit_many([good, bad])
+    assert [log.field for log in good.get_changed_data().data] == ["name"]
+
+
+def test_transaction():
+    user = User("a", Address("Kyiv"))
+    with ChangeTrackerTransaction() as transaction:
+        user.name = "b"
+        transaction.add(user)
+    assert [log.commit_id for log in transaction.result.data] == [transaction.commit_id]
+
+    with pytest.raises(ValueError):
+        with ChangeTrackerTransaction([user]):
+            user.name = "c"
+            raise ValueError()
+    assert [log.field for log in user.get_changed_data().data] == ["name"]
+
+
+def test_sink_error_does_not_leave_commit_partial():
+    class Sink(ChangeLogSink):
+        def __init__(self):
+            self.broken = False
+            self.calls = []
+
+        def write(self, logs):
+            if self.broken:
+                raise OSError("disk full")
+            self.calls.append(list(logs))
+
+    class Account(ChangeTracker):
+        def __init__(self, balance, sink):
+            self.balance = balance
+            super().__init__(sink=sink)
+
+    sinks = [Sink(), Sink(), Sink()]
+    accounts = [Account(100, sink) for sink in sinks]
+    sinks[1].broken = True
+    for account in accounts:
+        account.balance -= 10
+    with pytest.raises(OSError):
+        commit_many(accounts)
+
+    # Усі об'єкти закомічені, справні приймачі отримали свої записи
+    assert all(account.get_changed_data().data == [] for account in accounts)
+    assert [len(sink.calls) for sink in sinks] == [2, 1, 2]
+    assert sinks[2].calls[-1][0].new_value == 90
@@ -0,0 +1,75 @@
+from changetracker.core import ChangeTracker, ChangeTrackerDiffMode
+from changetracker.core import _NO_EXTRAS
+
+
+class Address(ChangeTracker):
+    def __init__(self, city):
+        self.city = city
+        super().__init__(dirty_tracking=True)
+
+
+class User(ChangeTracker):
+    def __init__(self, **kwargs):
+        self.name = "Alice"
+        self.tags = ["a"]
+        self.address = Address("Kyiv")
+        super().__init__(**kwargs)
+
+
+def _fields(changes):
+    return [log.field for log in changes.data]
+
+
+def test_repeated_calls_hit_cache():
+    u = User(track_containers=True)
+    u.name = "Bob"
+    first = u.get_changed_data()
+    second = u.get_changed_data()
+    assert _fields(first) == _fields(second) == ["name"]
+    assert first.data is not second.data
+    assert u.changed_data_cache_info() == {"hits": 1, "misses": 1, "bypassed": 0}
+
+
+def test_cache_invalidation():
+    u = User(track_containers=True)
+    assert _fields(u.get_changed_data()) == []
+
+    u.name = "Bob"
+    assert _fields(u.get_changed_data()) == ["name"]
+    u.tags.append("b")
+    assert sorted(_fields(u.get_changed_data())) == ["name", "tags"]
+    u.address.city = "Lviv"
+    assert sorted(_fields(u.get_changed_data())) == ["address", "name", "tags"]
+    del u.name
+    assert sorted(_fields(u.get_changed_data())) == ["address", "name", "tags"]
+    u.commit()
+    assert _fields(u.get_changed_data()) == []
+    assert u.changed_data_cache_info()["hits"] == 0
+
+
+def test_cache_is_per_diff_mode():
+    u = User(track_containers=True)
+    u.address.city = "Lviv"
+    assert _fields(u.get_changed_data()) == ["address"]
+    assert _fields(u.get_changed_data(diff_mode=ChangeTrackerDiffMode.PATH)) == ["address.city"]
+    assert u.changed_data_cache_info()["misses"] == 2
+
+
+def test_unobservable_objects_bypass_cache():
+    class Plain(User):
+        pass
+
+    u = Plain(dirty_tracking=True)
+    u.get_changed_data()
+    u.tags.append("b")
+    assert _fields(u.get_changed_data()) == ["tags"]
+    # Обхід кешу рахується для класу: об'єкт не отримує власної статистики
+    assert u._extras is _NO_EXTRAS
+    assert Plain(dirty_tracking=True).changed_data_cache_info() == {"hits": 0, "misses": 0, "bypassed": 2}
+
+
+def test_cache_can_be_disabled():
+    u = User(track_containers=True, cache_changed_data=False)
+    u.get_changed_data()
+    assert u.changed_data_cache_info() == {}
+    assert u._changes_cache is None
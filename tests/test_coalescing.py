@@ -0,0 +1,104 @@
+import pickle
+import time
+from datetime import timedelta
+
+import pytest
+
+from changetracker import ChangeTracker, ChangeTrackerAction, ChangeTrackerCoalescing, commit_many
+
+
+class Sensor(ChangeTracker):
+    def __init__(self, **kwargs):
+        self.value = 0
+        self.status = "ok"
+        super().__init__(**kwargs)
+
+
+def _entries(tracker, skip_init=True):
+    return [(log.field, log.old_value, log.new_value) for log in tracker.get_change_log().data if not (skip_init and log.init)]
+
+
+@pytest.mark.parametrize("options", [{}, {"dirty_tracking": True}, {"thread_safe": True, "hash_compare": True}])
+def test_count_threshold_logs_net_changes(options):
+    s = Sensor(coalescing=ChangeTrackerCoalescing(max_commits=3), **options)
+    # Init-коміт не відкладається
+    assert len(s.get_change_log().data) == 2
+
+    s.value = 1
+    assert s.commit() is False
+    s.value = 2
+    s.status = "warn"
+    assert s.commit() is False
+    s.status = "ok"
+    assert [log.field for log in s.get_changed_data().data] == ["value"]
+    assert s.commit(commit_id="c1") is True
+    assert _entries(s) == [("value", 0, 2)]
+    assert s.get_change_log().data[-1].commit_id == "c1"
+
+    # Лічильник починається заново; зміна, повернута до початкового значення, не логується
+    s.value = 5
+    s.commit()
+    s.value = 2
+    s.commit()
+    s.commit()
+    assert _entries(s) == [("value", 0, 2)]
+    assert s._pending_commit is None
+
+
+def test_max_delay_commits_on_next_call():
+    s = Sensor(coalescing=ChangeTrackerCoalescing(max_delay=timedelta(seconds=0.05)))
+    s.value = 1
+    assert s.commit() is False
+    time.sleep(0.06)
+    s.value = 2
+    assert s.commit() is True
+    assert _entries(s) == [("value", 0, 2)]
+
+
+def test_flush_uses_last_deferred_arguments():
+    s = Sensor(coalescing=ChangeTrackerCoalescing(max_commits=100))
+    assert s.flush().data == []
+    s.value = 1
+    s.commit(commit_id="a")
+    s.value = 2
+    s.commit(commit_id="b")
+    logs = s.flush()
+    assert [(log.field, log.new_value, log.commit_id, log.action) for log in logs.data] == [("value", 2, "b", ChangeTrackerAction.CHANGED)]
+    assert s.flush().data == []
+
+
+def test_timer_flushes_without_further_calls():
+    s = Sensor(coalescing=ChangeTrackerCoalescing(max_delay=timedelta(seconds=0.02), timer=True), thread_safe=True)
+    s.value = 1
+    assert s.commit() is False
+    s.value = 2
+    s.commit()
+    deadline = time.monotonic() + 5
+    while not _entries(s) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _entries(s) == [("value", 0, 2)]
+    assert s._pending_commit is None
+
+
+def test_invalid_timer_configuration():
+    with pytest.raises(ValueError):
+        ChangeTrackerCoalescing(timer=True)
+    with pytest.raises(ValueError):
+        Sensor(coalescing=ChangeTrackerCoalescing(max_delay=timedelta(seconds=1), timer=True))
+
+
+def test_explicit_commits_include_pending_changes():
+    sensors = [Sensor(coalescing=ChangeTrackerCoalescing(max_commits=10)) for _ in range(2)]
+    sensors[0].value = 1
+    sensors[0].commit()
+    logs = commit_many(sensors, commit_id="bulk")
+    assert [(log.field, log.new_value) for log in logs.data] == [("value", 1)]
+    assert sensors[0]._pending_commit is None
+    assert sensors[0].flush().data == []
+
+    # pickle: стан без відкладених викликів і таймера
+    sensors[1].value = 3
+    sensors[1].commit()
+    restored = pickle.loads(pickle.dumps(sensors[1]))
+    assert restored._pending_commit is None
+    assert [log.field for log in restored.get_changed_data().data] == ["value"]
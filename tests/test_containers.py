@@ -0,0 +1,90 @@
+import copy
+
+from changetracker.containers import TrackedDict, TrackedList
+from changetracker.core import ChangeTracker, _TrackedBaseline
+
+
+class Custom:
+    def __init__(self, x):
+        self.x = x
+
+
+class Doc(ChangeTracker):
+    def __init__(self, items, meta):
+        self.items = items
+        self.meta = meta
+        self.title = "doc"
+        super().__init__(track_containers=True)
+
+
+def test_containers_are_swapped_in():
+    doc = Doc([1, [2]], {"a": {"b": 1}})
+    assert type(doc.items) is TrackedList
+    assert type(doc.items[1]) is TrackedList
+    assert type(doc.meta["a"]) is TrackedDict
+    doc.items = [3]
+    assert type(doc.items) is TrackedList
+
+
+def test_baseline_keeps_reference_until_mutation():
+    doc = Doc(list(range(1000)), {"a": 1})
+    assert type(doc._original_data["items"]) is _TrackedBaseline
+    doc.items.append(1000)
+    assert doc._original_data["items"] == list(range(1000))
+    changes = doc.get_changed_data()
+    assert [(log.field, len(log.old_value), len(log.new_value)) for log in changes.data] == [("items", 1000, 1001)]
+    doc.commit()
+    assert type(doc._original_data["items"]) is _TrackedBaseline
+    assert doc.get_changed_data().data == []
+
+
+def test_unchanged_containers_are_not_copied(count_snapshots):
+    doc = Doc(list(range(1000)), {"a": 1})
+    doc.title = "new"
+    calls = count_snapshots()
+    changes = doc.get_changed_data()
+    assert [log.field for log in changes.data] == ["title"]
+    assert len(calls) == 1
+
+
+def test_nested_mutation_marks_field_dirty():
+    doc = Doc([{"price": 1}], {"a": {"b": 1}})
+    doc.items[0]["price"] = 2
+    doc.meta["a"].pop("b")
+    changes = {log.field: (log.old_value, log.new_value) for log in doc.get_changed_data().data}
+    assert changes == {
+        "items": ([{"price": 1}], [{"price": 2}]),
+        "meta": ({"a": {"b": 1}}, {"a": {}}),
+    }
+
+
+def test_reassigned_container_is_released():
+    doc = Doc([1], {})
+    old_items = doc.items
+    doc.items = [2]
+    old_items.append(5)
+    changes = doc.get_changed_data()
+    assert [(log.old_value, log.new_value) for log in changes.data] == [([1], [2])]
+
+
+def test_opaque_values_fall_back_to_full_check():
+    c = Custom(1)
+    doc = Doc([c], {})
+    c.x = 2
+    changes = doc.get_changed_data()
+    assert [(log.old_value, log.new_value) for log in changes.data] == [([{"x": 1}], [{"x": 2}])]
+
+
+def test_shared_container_is_seen_by_both_owners():
+    first = Doc([1], {})
+    second = Doc([], {})
+    second.items = first.items
+    first.items.append(2)
+    assert [log.new_value for log in first.get_changed_data().data] == [[1, 2]]
+    assert [log.new_value for log in second.get_changed_data().data] == [[1, 2]]
+
+
+def test_copies_are_plain_containers():
+    doc = Doc([[1]], {"a": 1})
+    assert type(copy.deepcopy(doc.items)) is list
+    assert type(copy.copy(doc.meta)) is dict
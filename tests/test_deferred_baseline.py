@@ -0,0 +1,121 @@
+import pytest
+
+from changetracker.core import ChangeTracker, ChangeTrackerDiffMode, _HashedBaseline, _TrackedBaseline
+from changetracker.sinks import ChangeLogSink
+
+
+class Address(ChangeTracker):
+    def __init__(self, city, **kwargs):
+        self.city = city
+        super().__init__(**kwargs)
+
+
+class User(ChangeTracker):
+    def __init__(self, **kwargs):
+        self.name = "Alice"
+        self.age = 30
+        self.tags = ["a", "b"]
+        self.meta = {"x": 1, "nested": {"y": [1]}}
+        self.address = Address("Kyiv", dirty_tracking=bool(kwargs.get("dirty_tracking") or kwargs.get("track_containers")))
+        super().__init__(**kwargs)
+
+
+class MemorySink(ChangeLogSink):
+    def __init__(self):
+        self.logs = []
+
+    def write(self, logs):
+        self.logs.extend(logs)
+
+
+MODES = [
+    pytest.param({}, id="full-compare"),
+    pytest.param({"dirty_tracking": True}, id="dirty-tracking"),
+    pytest.param({"track_containers": True}, id="tracked-containers"),
+    pytest.param({"hash_compare": True}, id="hash-compare"),
+    pytest.param({"hash_only_fields": ["meta"]}, id="hash-only"),
+    pytest.param({"diff_mode": ChangeTrackerDiffMode.PATH}, id="path-mode"),
+]
+
+INIT_OPTIONS = [
+    pytest.param({"init_log": False}, id="no-init-log"),
+    pytest.param({"deferred_baseline": True}, id="deferred"),
+    pytest.param({"deferred_baseline": True, "init_log": False}, id="deferred-no-init-log"),
+]
+
+
+def _entries(logs):
+    return sorted((log.field, repr(log.old_value), repr(log.new_value), log.action) for log in logs.data)
+
+
+def _mutate(u, step):
+    if step == 0:
+        u.name = "Bob"
+        u.tags.append("c")
+        u.meta["nested"]["y"].append(2)
+        u.address.city = "Lviv"
+    else:
+        del u.age
+        u.tags = ["z"]
+        u.meta["x"] = 2
+        u.extra = 1
+
+
+@pytest.mark.parametrize("options", INIT_OPTIONS)
+@pytest.mark.parametrize("mode", MODES)
+def test_same_diffs_as_init_commit(mode, options):
+    expected, actual = User(**mode), User(**mode, **options)
+    for step, commit_id in enumerate(["c1", "c2"]):
+        assert _entries(actual.get_changed_data()) == _entries(expected.get_changed_data()) == []
+        _mutate(expected, step)
+        _mutate(actual, step)
+        assert _entries(actual.get_changed_data()) == _entries(expected.get_changed_data())
+        expected.commit(commit_id=commit_id)
+        actual.commit(commit_id=commit_id)
+        assert actual.state_at(commit_id) == expected.state_at(commit_id)
+
+    # Без init-журналу немає лише записів CREATED для п'яти полів
+    skipped = 0 if options.get("init_log", True) else 5
+    assert len(actual.get_change_log().data) == len(expected.get_change_log().data) - skipped
+
+
+@pytest.mark.parametrize("options", INIT_OPTIONS)
+def test_revert_to_first_commit(options):
+    u = User(**options)
+    u.tags.append("c")
+    u.commit(commit_id="c1")
+    u.name = "Bob"
+    u.tags.clear()
+    u.commit(commit_id="c2")
+    u.revert_to("c1")
+    assert (u.name, u.tags, u.meta, u.address.city) == ("Alice", ["a", "b", "c"], {"x": 1, "nested": {"y": [1]}}, "Kyiv")
+
+
+def test_no_init_log_skips_log_and_sink():
+    sink = MemorySink()
+    u = User(init_log=False, sink=sink)
+    assert u.get_change_log().data == []
+    assert sink.logs == []
+    u.name = "Bob"
+    u.commit()
+    assert [(log.field, log.old_value, log.new_value) for log in sink.logs] == [("name", "Alice", "Bob")]
+
+
+def test_deferred_baseline_keeps_references():
+    u = User(deferred_baseline=True, init_log=False, track_containers=True, hash_only_fields=["age"])
+    # Незмінні значення — ті самі об'єкти, контейнери — copy-on-write, вкладений об'єкт — "знімок"
+    assert u._original_data["name"] is u.name
+    assert type(u._original_data["tags"]) is _TrackedBaseline and u._original_data["tags"].container is u.tags
+    assert type(u._original_data["age"]) is _HashedBaseline
+    assert u._original_data["address"] == {"city": "Kyiv"}
+    assert u.get_changed_data().data == []
+
+    u.tags.append("c")
+    assert u._original_data["tags"] == ["a", "b"]
+    assert [(log.field, log.old_value, log.new_value) for log in u.get_changed_data().data] == [("tags", ["a", "b"], ["a", "b", "c"])]
+
+
+def test_deferred_baseline_copies_untracked_containers():
+    u = User(deferred_baseline=True)
+    u.meta["nested"]["y"].append(2)
+    assert [(log.field, log.old_value) for log in u.get_changed_data().data] == [("meta", {"x": 1, "nested": {"y": [1]}})]
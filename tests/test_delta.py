@@ -0,0 +1,136 @@
+import pytest
+
+from changetracker.core import ChangeTracker, _TrackedBaseline
+from changetracker.delta import ChangeTrackerDelta, diff_ops, patch_snapshot
+
+
+class Address(ChangeTracker):
+    def __init__(self, city, **kwargs):
+        self.city = city
+        self.zip = "01001"
+        super().__init__(**kwargs)
+
+
+class User(ChangeTracker):
+    def __init__(self, **kwargs):
+        self.name = "Alice"
+        self.tags = ["a", "b", "c"]
+        self.meta = {"x": 1, "nested": {"y": [1, 2]}}
+        self.address = Address("Kyiv", dirty_tracking=bool(kwargs))
+        super().__init__(**kwargs)
+
+
+MODES = [
+    pytest.param({}, id="full-compare"),
+    pytest.param({"dirty_tracking": True}, id="dirty-tracking"),
+    pytest.param({"track_containers": True}, id="tracked-containers"),
+    pytest.param({"hash_compare": True}, id="hash-compare"),
+    pytest.param({"hash_only_fields": ["meta"]}, id="hash-only"),
+]
+
+
+def _state(tracker):
+    return {k: tracker._get_field_snapshot(v) for k, v in tracker._get_filtered_data(data=tracker.__dict__).items()}
+
+
+def _mutate(u):
+    u.name = "Bob"
+    u.tags.insert(0, "z")
+    u.meta["nested"]["y"].append(3)
+    del u.meta["x"]
+    u.address.city = "Lviv"
+    u.extra = 5
+
+
+def test_pending_delta_is_minimal():
+    u = User()
+    _mutate(u)
+    assert sorted(u.get_delta().ops, key=repr) == sorted([
+        ("replace", ("name",), "Bob"),
+        ("add", ("tags", 0), "z"),
+        ("add", ("meta", "nested", "y", 2), 3),
+        ("remove", ("meta", "x"), None),
+        ("replace", ("address", "city"), "Lviv"),
+        ("add", ("extra",), 5),
+    ], key=repr)
+
+
+@pytest.mark.parametrize("options", MODES)
+def test_apply_delta_replicates_state(options):
+    source, replica = User(**options), User(**options)
+    _mutate(source)
+    delta = ChangeTrackerDelta.decode(source.get_delta().encode())
+    logs = replica.apply_delta(delta, commit_id="c1")
+    source.commit(commit_id="c1")
+
+    assert sorted(log.field for log in logs.data) == ["address", "extra", "meta", "name", "tags"]
+    assert _state(replica) == _state(source)
+    assert replica.get_changed_data().data == []
+    assert replica.address.get_changed_data().data == []
+    assert replica.state_at("c1") == source.state_at("c1")
+    assert replica.address.state_at("c1") == source.address.state_at("c1")
+
+    # Після застосування нові зміни репліки видно як звичайно
+    replica.tags.append("q")
+    assert [log.field for log in replica.get_changed_data().data] == ["tags"]
+
+
+def test_committed_delta_since():
+    source, replica = User(), User()
+    source.tags.append("d")
+    source.commit(commit_id="c1")
+    replica.apply_delta(source.get_delta(since=source._changed_log.commits[0].commit_id))
+    source.tags.pop(0)
+    source.meta["x"] = 2
+    source.commit(commit_id="c2")
+
+    delta = source.get_delta(since="c1")
+    assert delta.commit_id == "c2"
+    assert sorted(delta.ops, key=repr) == sorted([("remove", ("tags", 0), None), ("replace", ("meta", "x"), 2)], key=repr)
+    replica.apply_delta(delta)
+    assert _state(replica) == _state(source)
+    assert [record.commit_id for record in replica._changed_log.commits][-1] == "c2"
+    assert source.get_delta(since="c2").ops == []
+
+
+def test_apply_delta_keeps_local_changes_and_copy_on_write():
+    source, replica = User(track_containers=True), User(track_containers=True)
+    source.tags.append("d")
+    replica.name = "Local"
+    replica.apply_delta(source.get_delta())
+
+    assert type(replica._original_data["tags"]) is _TrackedBaseline
+    assert [(log.field, log.new_value) for log in replica.get_changed_data().data] == [("name", "Local")]
+    # Значення поля — копія, а не знімок з базового стану
+    replica.tags.append("e")
+    assert sorted(log.field for log in replica.get_changed_data().data) == ["name", "tags"]
+    assert source.tags == ["a", "b", "c", "d"]
+
+
+def test_json_patch_and_encoding():
+    u = User()
+    u.meta["a/b"] = 1
+    u.tags.pop()
+    delta = u.get_delta()
+    assert sorted(delta.to_json_patch(), key=repr) == sorted([
+        {"op": "add", "path": "/meta/a~1b", "value": 1},
+        {"op": "remove", "path": "/tags/2"},
+    ], key=repr)
+    assert ChangeTrackerDelta.decode(delta.encode()) == delta
+    assert len(delta.encode()) < 60
+
+
+def test_patch_snapshot_does_not_change_source():
+    old = {"a": [1, 2, 3], "b": {"c": 1}}
+    new = {"a": [0, 1, 3, 4], "b": {"d": 2}}
+    ops = list(diff_ops((), old, new))
+    assert patch_snapshot(old, ops) == new
+    assert old == {"a": [1, 2, 3], "b": {"c": 1}}
+
+
+def test_list_insert_and_pop_are_single_ops():
+    old = {"items": [{"id": i} for i in range(50)]}
+    new = {"items": [{"id": -1}] + old["items"][:25] + old["items"][26:-1]}
+    ops = list(diff_ops((), old, new))
+    assert ops == [("add", ("items", 0), {"id": -1}), ("remove", ("items", 26), None), ("remove", ("items", 49), None)]
+    assert patch_snapshot(old, ops) == new
@@ -0,0 +1,137 @@
+from changetracker.core import ChangeTracker, ChangeTrackerAction, ChangeTrackerDiffMode
+from changetracker.diff import diff_lists, diff_paths, split_path
+from changetracker.registry import register_type_handler, unregister_type_handler
+
+
+class Address(ChangeTracker):
+    def __init__(self, city, street):
+        self.city = city
+        self.street = street
+        super().__init__()
+
+
+class User(ChangeTracker):
+    def __init__(self, name, address, items):
+        self.name = name
+        self.address = address
+        self.items = items
+        super().__init__()
+
+
+def _entries(logs):
+    return [(log.field, log.action, log.old_value, log.new_value) for log in logs.data]
+
+
+def test_diff_paths_reports_leaves():
+    old = {"a": {"b": 1, "c": [1, 2]}, "x-y": 1}
+    new = {"a": {"b": 2, "c": [1], "d": 3}, "x-y": 1}
+    assert list(diff_paths("f", old, new)) == [
+        ("changed", "f.a.b", 1, 2),
+        ("deleted", "f.a.c[1]", 2, None),
+        ("created", "f.a.d", None, 3),
+    ]
+    assert list(diff_paths("f", {"x-y": 1}, {"x-y": 2})) == [("changed", "f['x-y']", 1, 2)]
+
+
+def test_split_path():
+    assert split_path("name") == ("name",)
+    assert split_path("items[3].price") == ("items", 3, "price")
+    assert split_path("f['x-y'][1]") == ("f", "x-y", 1)
+    assert split_path("f['a]['].b") == ("f", "a][", "b")
+    assert split_path("f[(1, 'x')]") == ("f", (1, "x"))
+    assert split_path("data[3:7]") is None
+
+
+def test_path_mode_logs_only_changed_leaves():
+    user = User("Ivan", Address("Kyiv", "Khreshchatyk"), [{"price": 1}, {"price": 2}])
+    user.address.city = "Lviv"
+    del user.address.street
+    user.items[1]["price"] = 3
+    user.name = "Petro"
+    changes = sorted(_entries(user.get_changed_data(diff_mode=ChangeTrackerDiffMode.PATH)))
+    assert changes == [
+        ("address.city", ChangeTrackerAction.CHANGED, "Kyiv", "Lviv"),
+        ("address.street", ChangeTrackerAction.DELETED, "Khreshchatyk", None),
+        ("items[1].price", ChangeTrackerAction.CHANGED, 2, 3),
+        ("name", ChangeTrackerAction.CHANGED, "Ivan", "Petro"),
+    ]
+
+
+def test_path_mode_commit():
+    user = User("Ivan", Address("Kyiv", "Khreshchatyk"), [])
+    user.address.city = "Lviv"
+    user.items.append(1)
+    user.commit(diff_mode=ChangeTrackerDiffMode.PATH)
+    logs = [log for log in user.get_change_log().data if not log.init]
+    assert sorted((log.field, log.new_value) for log in logs) == [("address.city", "Lviv"), ("items[0]", 1)]
+    assert len({log.commit_id for log in logs}) == 1
+    assert user.get_changed_data().data == []
+
+
+def test_field_mode_is_default():
+    user = User("Ivan", Address("Kyiv", "Khreshchatyk"), [])
+    user.address.city = "Lviv"
+    assert [log.field for log in user.get_changed_data().data] == ["address"]
+
+
+def test_diff_lists_fast_paths_and_moves():
+    old = list(range(50000))
+    assert list(diff_lists("l", old, old + [7])) == [("created", "l[50000]", None, 7)]
+    assert list(diff_lists("l", old, old[:-2])) == [("deleted", "l[49998]", 49998, None), ("deleted", "l[49999]", 49999, None)]
+    assert list(diff_lists("l", [1, 2, 3, 4, 5], [1, 3, 2, 4, 6, 5])) == [("moved", "l[2]", 1, 2), ("created", "l[4]", None, 6)]
+    assert list(diff_lists("l", [1, 2, 3], [9, 2, 8])) == [("changed", "l[0]", 1, 9), ("changed", "l[2]", 3, 8)]
+    assert list(diff_lists("l", [1, 2, 3], [1, 3])) == [("deleted", "l[1]", 2, None)]
+
+
+def test_diff_lists_falls_back_to_positions(monkeypatch):
+    import changetracker.diff as diff
+    monkeypatch.setattr(diff, "MAX_EDIT_DISTANCE", 1)
+    assert list(diff_lists("l", [1, 2, 3], [4, 5, 6])) == [
+        ("changed", "l[0]", 1, 4), ("changed", "l[1]", 2, 5), ("changed", "l[2]", 3, 6),
+    ]
+
+
+def test_elements_mode_logs_list_operations():
+    user = User("Ivan", Address("Kyiv", "Khreshchatyk"), [{"price": 1}, {"price": 2}, {"price": 3}])
+    user.items.insert(0, {"price": 0})
+    user.items[2]["price"] = 20
+    changes = _entries(user.get_changed_data(diff_mode=ChangeTrackerDiffMode.ELEMENTS))
+    assert changes == [
+        ("items[0]", ChangeTrackerAction.CREATED, None, {"price": 0}),
+        ("items[2].price", ChangeTrackerAction.CHANGED, 2, 20),
+    ]
+
+
+def test_equal_hashes_are_confirmed_by_values(monkeypatch):
+    # hash(-1) == hash(-2) у CPython; однакові хеші всіх елементів — крайній випадок колізій
+    assert list(diff_lists("l", [0, -1, 5], [0, -2, 5])) == [("changed", "l[1]", -1, -2)]
+    import changetracker.diff as diff
+    monkeypatch.setattr(diff, "_element_hash", lambda value: 0)
+    assert list(diff_lists("l", [1, 2, 3, 4], [1, 9, 3, 8])) == [("changed", "l[1]", 2, 9), ("changed", "l[3]", 4, 8)]
+    assert list(diff_lists("l", [1, 2, 3], [3, 1, 2])) == [("moved", "l[0]", 2, 0)]
+
+
+def test_elements_mode_commits_colliding_values():
+    user = User("Ivan", Address("Kyiv", "Khreshchatyk"), [0, -1, 5])
+    user.items[1] = -2
+    user.commit(diff_mode=ChangeTrackerDiffMode.ELEMENTS)
+    assert _entries(user.get_change_log())[-1] == ("items[1]", ChangeTrackerAction.CHANGED, -1, -2)
+    assert user._original_data["items"] == [0, -2, 5]
+
+
+def test_path_mode_falls_back_to_field_when_handler_finds_nothing():
+    class Opaque:
+        def __init__(self, value):
+            self.value = value
+
+    register_type_handler(Opaque, snapshot=lambda o: Opaque(o.value), equals=lambda a, b: a.value == b.value, diff=lambda path, old, new: iter(()))
+    try:
+        user = User("Ivan", Address("Kyiv", "Khreshchatyk"), [])
+        user.name = Opaque(1)
+        user.commit()
+        user.name.value = 2
+        user.commit(diff_mode=ChangeTrackerDiffMode.PATH)
+        assert [(log.field, log.action, log.new_value.value) for log in user.get_change_log().data[-1:]] == [("name", ChangeTrackerAction.CHANGED, 2)]
+        assert user.get_changed_data().data == []
+    finally:
+        unregister_type_handler(Opaque)
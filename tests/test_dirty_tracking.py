@@ -0,0 +1,105 @@
+import pickle
+
+from changetracker.core import ChangeTracker, ChangeTrackerAction, ChangeTrackerBase
+
+
+class Wide(ChangeTracker):
+    def __init__(self, count):
+        for i in range(count):
+            setattr(self, f"f{i}", i)
+        self.items = [1, 2]
+        super().__init__(dirty_tracking=True)
+
+
+def test_only_dirty_fields_are_compared(count_snapshots):
+    w = Wide(100)
+    w.f5 = 500
+    calls = count_snapshots()
+    changes = w.get_changed_data()
+    assert [(log.field, log.old_value, log.new_value) for log in changes.data] == [("f5", 5, 500)]
+    # f5 + мутабельне поле items (повна перевірка як запасний варіант)
+    assert len(calls) == 2 + 2
+
+
+def test_commit_clears_dirty_keys():
+    w = Wide(10)
+    w.f1 = 11
+    w.commit()
+    assert w.get_changed_data().data == []
+    assert w.get_change_log().data[-1].field == "f1"
+    assert w._original_data["f1"] == 11
+
+
+def test_in_place_mutation_is_still_detected():
+    w = Wide(3)
+    w.items.append(3)
+    changes = w.get_changed_data()
+    assert [(log.field, log.new_value) for log in changes.data] == [("items", [1, 2, 3])]
+
+
+def test_created_and_deleted_fields():
+    w = Wide(3)
+    w.extra = "x"
+    del w.f0
+    actions = {log.field: log.action for log in w.get_changed_data().data}
+    assert actions == {"extra": ChangeTrackerAction.CREATED, "f0": ChangeTrackerAction.DELETED}
+    w.commit()
+    assert "f0" not in w._original_data
+    assert w.get_changed_data().data == []
+
+
+def test_reassigned_to_scalar_stops_full_check():
+    w = Wide(3)
+    w.items = 7
+    w.commit()
+    assert "items" not in w._volatile_keys
+
+
+def test_explicit_new_data_forces_full_check():
+    w = Wide(3)
+    w.commit(new_data={"f0": 0})
+    # Базовий стан тепер не відповідає атрибутам об'єкта — порівнюємо всі поля
+    fields = {log.field for log in w.get_changed_data().data}
+    assert fields == {"f1", "f2", "items"}
+
+
+def test_attribute_hooks_are_opt_in():
+    class Plain(ChangeTracker):
+        def __init__(self, **kwargs):
+            self.a = 1
+            super().__init__(**kwargs)
+
+    p = Plain()
+    # Без dirty_tracking присвоєння не перехоплюються
+    assert Plain.__dict__["__setattr__"] is object.__setattr__
+    p.a = 2
+    assert p._dirty_keys is None
+
+    d = Plain(dirty_tracking=True)
+    assert Plain.__dict__["__setattr__"] is ChangeTrackerBase.__setattr__
+    d.a = 2
+    assert d._dirty_keys == {"a"}
+    # Звичайні об'єкти класу після ввімкнення перехоплення поводяться як раніше
+    p.a = 3
+    assert [log.new_value for log in p.get_changed_data().data] == [3]
+
+
+def test_own_setattr_keeps_dirty_tracking():
+    class Custom(ChangeTracker):
+        def __init__(self):
+            self.a = 1
+            super().__init__(dirty_tracking=True)
+
+        def __setattr__(self, name, value):
+            super().__setattr__(name, value)
+
+    c = Custom()
+    c.a = 2
+    assert c._dirty_keys == {"a"}
+
+
+def test_unpickled_object_keeps_dirty_tracking():
+    w = pickle.loads(pickle.dumps(Wide(3)))
+    w.f1 = 11
+    assert w._dirty_keys == {"f1"}
+    assert [log.field for log in w.get_changed_data().data] == ["f1"]
@@ -0,0 +1,57 @@
+from changetracker.core import ChangeTracker, ChangeTrackerIncludeMode
+from changetracker.filtering import get_filter_plan
+
+
+class Wide(ChangeTracker):
+    def __init__(self, **kwargs):
+        for i in range(50):
+            setattr(self, f"f{i}", i)
+        self._secret = "s"
+        super().__init__(**kwargs)
+
+
+def _fields(changes):
+    return {log.field for log in changes.data}
+
+
+def test_include_fields_limits_tracking():
+    w = Wide(include_fields=["f1", "f2", "_secret", "missing"])
+    assert set(w._original_data) == {"f1", "f2"}
+    w.f1 = 100
+    w.f3 = 300
+    w.missing = 1
+    assert _fields(w.get_changed_data()) == {"f1", "missing"}
+
+
+def test_exclude_fields():
+    w = Wide(exclude_fields=["f0", "f1"])
+    assert "f0" not in w._original_data and "f2" in w._original_data
+    w.f0 = 100
+    w.f2 = 200
+    assert _fields(w.get_changed_data()) == {"f2"}
+
+
+def test_include_mode_with_include_fields():
+    w = Wide(include_mode=ChangeTrackerIncludeMode.ONLY_PRIVATE, include_fields=["_secret", "f1"])
+    assert set(w._original_data) == {"_secret"}
+
+
+def test_plan_is_shared_per_class_and_config():
+    a = Wide(include_fields=["f1"])
+    b = Wide(include_fields=["f1"])
+    c = Wide()
+    assert a._filter_plan is b._filter_plan
+    assert a._filter_plan is not c._filter_plan
+    assert c._filter_plan is get_filter_plan(Wide, ChangeTrackerIncludeMode.ONLY_PUBLIC, exclude_fields=Wide._SYSTEM_KEYS)
+
+
+def test_plan_learns_new_keys():
+    w = Wide(dirty_tracking=True)
+    plan = w._filter_plan
+    assert "later" not in plan._allowed
+    w.later = 1
+    w._hidden = 2
+    assert "later" in plan._allowed and "_hidden" in plan._denied
+    assert _fields(w.get_changed_data()) == {"later"}
+    # Невідстежувані поля не позначаються як "брудні"
+    assert w._dirty_keys == {"later"}
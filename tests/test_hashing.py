@@ -0,0 +1,111 @@
+from changetracker.core import ChangeTracker, _HashedBaseline
+from changetracker.hashing import structural_hash
+
+
+class Custom:
+    def __init__(self, x):
+        self.x = x
+
+
+class Child(ChangeTracker):
+    def __init__(self, value):
+        self.value = value
+        super().__init__(dirty_tracking=True)
+
+
+class Doc(ChangeTracker):
+    def __init__(self, payload, child, blob=None):
+        self.payload = payload
+        self.child = child
+        self.blob = blob
+        super().__init__(hash_compare=True, hash_only_fields=["blob"])
+
+
+def test_structural_hash_matches_equality():
+    assert structural_hash({"a": [1, 2], "b": 1}) == structural_hash({"b": 1.0, "a": [1, 2]})
+    assert structural_hash([1, 2]) != structural_hash([2, 1])
+    assert structural_hash([]) != structural_hash({})
+    assert structural_hash([[1], {1, 2}]) is not None
+    assert structural_hash([[]]) is not None
+
+
+def test_field_hash_matches_snapshot_hash():
+    doc = Doc({"a": [1, {"b": Custom(2)}]}, Child(3))
+    for value in (doc.payload, doc.child):
+        assert doc._get_field_hash(value) == structural_hash(doc._get_field_snapshot(value))
+
+
+def test_unchanged_fields_are_not_snapshotted(count_snapshots):
+    doc = Doc({"a": list(range(100))}, Child(3))
+    calls = count_snapshots()
+    assert doc.get_changed_data().data == []
+    assert calls == []
+
+
+def test_changes_are_detected():
+    child = Child(3)
+    doc = Doc({"a": [1]}, child)
+    doc.payload["a"].append(2)
+    child.value = 4
+    changes = {log.field: (log.old_value, log.new_value) for log in doc.get_changed_data().data}
+    assert changes == {"payload": ({"a": [1]}, {"a": [1, 2]}), "child": ({"value": 3}, {"value": 4})}
+    doc.commit()
+    assert doc.get_changed_data().data == []
+
+
+def test_child_hash_is_cached_until_change():
+    child = Child([1])
+    doc = Doc({}, child)
+    # Поле зі списком потребує повної перевірки — кешувати не можна
+    assert child._hash_cache is None
+    child.value = 5
+    child.commit()
+    doc.get_changed_data()
+    assert child._hash_cache is not None
+    child.value = 6
+    assert child._hash_cache is None
+
+
+def test_hash_only_field_keeps_no_copy():
+    doc = Doc({}, Child(1), blob={"data": "x" * 100})
+    assert type(doc._original_data["blob"]) is _HashedBaseline
+    doc.blob["data"] = "y"
+    changes = doc.get_changed_data()
+    assert [(log.field, log.old_value, log.new_value) for log in changes.data] == [("blob", None, {"data": "y"})]
+    doc.commit()
+    assert type(doc._original_data["blob"]) is _HashedBaseline
+    assert doc.get_changed_data().data == []
+
+
+class Numbers(ChangeTracker):
+    def __init__(self, **kwargs):
+        self.a = -1
+        self.d = {"x": -1, -1: "key"}
+        self.big = 0
+        super().__init__(**kwargs)
+
+
+def test_builtin_hash_collisions_are_not_unchanged():
+    # hash(-1) == hash(-2) та hash(2**61 - 1) == hash(0) у CPython
+    assert structural_hash(-1) != structural_hash(-2)
+    assert structural_hash(2 ** 61 - 1) != structural_hash(0)
+    assert structural_hash({"x": -1}) != structural_hash({"x": -2})
+    assert structural_hash({-1: 0}) != structural_hash({-2: 0})
+    assert structural_hash((1, -1)) != structural_hash((1, -2))
+    for options in ({"hash_compare": True}, {"hash_only_fields": ["a", "d", "big"]}):
+        n = Numbers(**options)
+        n.a = -2
+        n.d["x"] = -2
+        n.big = 2 ** 61 - 1
+        assert sorted(log.field for log in n.get_changed_data().data) == ["a", "big", "d"]
+        n.commit()
+        assert n.get_changed_data().data == []
+
+
+def test_matching_hash_is_confirmed_against_baseline(monkeypatch):
+    n = Numbers(hash_compare=True)
+    # Навіть за колізії хешів поле з повним базовим станом звіряється зі "знімком"
+    monkeypatch.setattr(ChangeTracker, "_get_field_hash", lambda self, value, memo=None: 0)
+    n._original_hashes = {key: 0 for key in n._original_hashes}
+    n.d["x"] = 5
+    assert [log.field for log in n.get_changed_data().data] == ["d"]
@@ -0,0 +1,133 @@
+import asyncio
+import pickle
+
+from changetracker import ChangeTracker, ChangeTrackerDiffMode, ChangeTrackerInstrumentation, commit_many
+from changetracker.instrumentation import approximate_size
+
+
+class Address(ChangeTracker):
+    def __init__(self, city, **kwargs):
+        self.city = city
+        super().__init__(**kwargs)
+
+
+class User(ChangeTracker):
+    def __init__(self, **kwargs):
+        self.name = "Alice"
+        self.age = 30
+        self.tags = ["a", "b"]
+        self.address = Address("Kyiv", instrumentation=kwargs.get("instrumentation"))
+        super().__init__(**kwargs)
+
+
+def _recorder(**kwargs):
+    events = []
+    instrumentation = ChangeTrackerInstrumentation(
+        pre_commit=lambda tracker: events.append(("pre", type(tracker).__name__)),
+        post_commit=lambda tracker, logs, metrics: events.append(("post", type(tracker).__name__, len(logs), metrics)),
+        **kwargs
+    )
+    return instrumentation, events
+
+
+def test_hooks_and_metrics_for_commit():
+    instrumentation, events = _recorder()
+    u = User(instrumentation=instrumentation)
+    # Init-коміт вкладеного об'єкта під час його __init__, потім init-коміт батька разом з вкладеним (без змін)
+    assert [event[:3] for event in events] == [
+        ("pre", "Address"), ("post", "Address", 1), ("pre", "User"), ("pre", "Address"), ("post", "Address", 0), ("post", "User", 4)
+    ]
+    events.clear()
+
+    u.name = "Bob"
+    u.address.city = "Lviv"
+    u.commit(commit_id="c1")
+    assert [event[:2] for event in events] == [("pre", "User"), ("pre", "Address"), ("post", "Address"), ("post", "User")]
+    metrics = events[-1][3].as_dict()
+    assert metrics["commit_id"] == "c1"
+    assert metrics["fields_scanned"] == 4
+    assert metrics["fields_changed"] == 2
+    assert metrics["entries_logged"] == 2
+    assert metrics["child_commits"] == 1
+    assert metrics["snapshot_nodes"] > 0
+    assert metrics["baseline_bytes"] is None
+    assert 0 <= metrics["diff_seconds"] <= metrics["total_seconds"]
+    assert metrics["children_seconds"] >= events[2][3].total_seconds
+
+
+def test_metrics_without_changes_and_totals():
+    instrumentation, events = _recorder(timings=False)
+    u = User(instrumentation=instrumentation)
+    instrumentation.reset()
+    events.clear()
+
+    u.commit()
+    _, _, logs_count, metrics = events[-1]
+    assert logs_count == 0
+    assert metrics.as_dict()["fields_changed"] == 0
+    assert metrics.as_dict()["total_seconds"] is None
+    totals = instrumentation.as_dict()
+    assert totals["commits"] == 1
+    assert "total_seconds" not in totals
+
+
+def test_path_mode_counts_fields_once():
+    instrumentation, events = _recorder()
+    u = User(instrumentation=instrumentation, diff_mode=ChangeTrackerDiffMode.PATH)
+    u.tags.append("c")
+    u.tags[0] = "z"
+    u.commit()
+    metrics = events[-1][3]
+    assert metrics.entries_logged == 2
+    assert metrics.fields_changed == 1
+
+
+def test_dirty_tracking_scans_only_candidates():
+    instrumentation, events = _recorder()
+    u = User(instrumentation=instrumentation, track_containers=True)
+    u.age = 31
+    u.commit()
+    # age — присвоєне поле; address без dirty_tracking перевіряється завжди; name та tags не порівнюються
+    assert events[-1][3].fields_scanned == 2
+
+
+def test_pre_commit_changes_are_committed():
+    u = User(instrumentation=ChangeTrackerInstrumentation(pre_commit=lambda tracker: setattr(tracker, "age", 40) if isinstance(tracker, User) else None))
+    u.commit()
+    assert u.get_change_log().query().field("age").count() == 1
+    assert u.get_changed_data().data == []
+
+
+def test_measure_memory():
+    instrumentation, events = _recorder(measure_memory=True)
+    u = User(instrumentation=instrumentation)
+    metrics = events[-1][3]
+    assert metrics.baseline_bytes >= approximate_size(u._original_data["tags"])
+    assert metrics.log_bytes > 0
+
+
+def test_commit_many_and_acommit():
+    instrumentation, events = _recorder()
+    users = [User(instrumentation=instrumentation) for _ in range(2)]
+    events.clear()
+    users[0].name = "Bob"
+    commit_many(users, commit_id="bulk")
+    posts = [event for event in events if event[0] == "post"]
+    assert len(posts) == 4
+    assert [(event[2], event[3].commit_id) for event in posts if event[2]] == [(1, "bulk")]
+
+    events.clear()
+    users[1].address.city = "Odesa"
+    asyncio.run(users[1].acommit(commit_id="async"))
+    assert [event[:3] for event in events if event[0] == "post"] == [("post", "Address", 1), ("post", "User", 1)]
+    assert events[-1][3].child_commits == 1
+
+
+def test_pickle_drops_instrumentation():
+    instrumentation, events = _recorder()
+    u = User(instrumentation=instrumentation)
+    restored = pickle.loads(pickle.dumps(u))
+    events.clear()
+    restored.name = "Bob"
+    restored.commit()
+    assert events == []
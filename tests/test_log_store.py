@@ -0,0 +1,70 @@
+import sys
+from datetime import datetime
+
+from changetracker.core import ChangeTracker, ChangeTrackerAction, ChangeTrackerLog
+from changetracker.log_store import ChangeLogStore
+
+
+class Item(ChangeTracker):
+    def __init__(self, value):
+        self.value = value
+        self.name = "item"
+        super().__init__()
+
+
+def _log(field, old, new, action=ChangeTrackerAction.CHANGED, commit_id="c1"):
+    return ChangeTrackerLog(field=field, old_value=old, new_value=new, action=action, init=False, timestamp=datetime(2025, 1, 1), commit_id=commit_id)
+
+
+def test_commit_metadata_is_shared():
+    store = ChangeLogStore()
+    now = datetime.now()
+    store.append_commit([_log("a", 1, 2), _log("b", 3, 4)], commit_id="c1", timestamp=now, init=True)
+    store.append_commit([_log("a", 2, 5)], commit_id="c2", timestamp=now, init=False)
+    assert len(store) == 3
+    assert len(store.commits) == 2
+    assert [(log.field, log.commit_id, log.init) for log in store] == [("a", "c1", True), ("b", "c1", True), ("a", "c2", False)]
+    assert store[-1].new_value == 5
+    assert [log.field for log in store[1:]] == ["b", "a"]
+    assert list(store.commit_range(0)) == [0, 1]
+    assert store[0].timestamp is store[1].timestamp
+
+
+def test_field_names_are_interned():
+    store = ChangeLogStore()
+    name = "".join(["fi", "eld"])
+    store.append_commit([_log(name, 1, 2)], commit_id="c1", timestamp=datetime.now(), init=False)
+    assert store._fields[0] is sys.intern("field")
+
+
+def test_extend_groups_by_commit():
+    store = ChangeLogStore([_log("a", 1, 2, commit_id="c1"), _log("b", 1, 2, commit_id="c1"), _log("a", 2, 3, commit_id="c2")])
+    assert [commit.commit_id for commit in store.commits] == ["c1", "c2"]
+    assert store == [_log("a", 1, 2, commit_id="c1"), _log("b", 1, 2, commit_id="c1"), _log("a", 2, 3, commit_id="c2")]
+
+
+def test_tracker_uses_store():
+    item = Item(1)
+    item.value = 2
+    item.commit()
+    logs = item.get_change_log()
+    assert isinstance(logs.data, ChangeLogStore)
+    assert [log.new_value for log in logs.data if log.field == "value"] == [1, 2]
+    assert len(logs.get_filtered_data(filter_init=False)) == 1
+
+
+def test_replace_head_keeps_rest_and_indexes():
+    store = ChangeLogStore()
+    now = datetime.now()
+    for number in range(4):
+        store.append_commit([_log("a", number, number + 1), _log(f"f{number}", None, number, ChangeTrackerAction.CREATED)], commit_id=f"c{number}", timestamp=now, init=number == 0)
+    store.replace_head(3, [_log("a", 0, 3)], commit_id="c2", timestamp=now, init=True)
+    assert [(log.field, log.commit_id, log.init) for log in store] == [("a", "c2", True), ("a", "c3", False), ("f3", "c3", False)]
+    assert store.find_commit("c3") == 1 and "c0" not in store.commit_ids
+    assert list(store.field_positions("a")) == [0, 1]
+    assert list(store.action_positions(ChangeTrackerAction.CREATED)) == [2]
+    assert store.commit_fields(1) == ["a", "f3"]
+
+    store.replace_head(1, [], commit_id=None, timestamp=now, init=False)
+    assert [(log.field, log.commit_id) for log in store] == [("a", "c3"), ("f3", "c3")]
+    assert store.find_commit("c3") == 0
@@ -0,0 +1,97 @@
+from changetracker.core import ChangeTracker
+from changetracker.hashing import structural_hash
+from changetracker.memo import SnapshotMemo, SnapshotRef
+
+
+class Node(ChangeTracker):
+    def __init__(self, name, **kwargs):
+        self.name = name
+        self.parent = None
+        self.child = None
+        super().__init__(**kwargs)
+
+
+def test_back_reference_becomes_snapshot_ref():
+    root = Node("root")
+    child = Node("child")
+    child.parent = root
+    root.child = child
+    root.commit()
+
+    snapshot = root._original_data["child"]
+    assert snapshot == {"name": "child", "parent": SnapshotRef(up=2), "child": None}
+    assert root.get_changed_data().data == []
+    assert child.get_changed_data().data == []
+
+
+def test_cycle_changes_are_detected():
+    root = Node("root")
+    child = Node("child")
+    child.parent = root
+    root.child = child
+    root.commit()
+
+    child.name = "renamed"
+    assert [log.field for log in root.get_changed_data().data] == ["child"]
+    root.commit()
+    assert root.get_changed_data().data == []
+    assert child.get_changed_data().data == []
+
+
+def test_self_referencing_list():
+    node = Node("n")
+    node.items = []
+    node.items.append(node.items)
+    node.commit()
+    assert node._original_data["items"] == [SnapshotRef(up=1)]
+
+
+def test_snapshot_is_independent_of_traversal_root():
+    root = Node("root")
+    child = Node("child")
+    child.parent = root
+    root.child = child
+    memo = SnapshotMemo()
+    via_root = root._get_field_snapshot(root, memo)
+    assert via_root["child"]["parent"] == SnapshotRef(up=2)
+    # Знімок батька з боку дочірнього об'єкта має таку саму форму
+    assert child._get_field_snapshot(root) == via_root
+
+
+def test_shared_object_is_snapshotted_once(count_snapshots):
+    shared = {"values": list(range(100))}
+    node = Node("n")
+    node.a = shared
+    node.b = shared
+    node.items = [shared, shared]
+    calls = count_snapshots("_make_field_snapshot")
+    node.commit()
+    assert sum(1 for value in calls if value is shared) == 1
+    assert node._original_data["a"] is node._original_data["b"]
+
+
+def test_nested_commit_shares_memo(count_snapshots):
+    root = Node("root")
+    child = Node("child")
+    root.child = child
+    root.commit()
+
+    child.data = {"big": list(range(100))}
+    calls = count_snapshots("_make_field_snapshot")
+    root.commit()
+    # Знімок child.data зроблено для батька і повторно використано в коміті child
+    assert sum(1 for value in calls if value is child.data) == 1
+    assert child.get_changed_data().data == []
+
+
+def test_hash_compare_with_cycles():
+    root = Node("root", hash_compare=True)
+    child = Node("child")
+    child.parent = root
+    root.child = child
+    root.commit()
+    assert root.get_changed_data().data == []
+    assert root._get_field_hash(root.child) == structural_hash(root._get_field_snapshot(root.child))
+
+    child.name = "renamed"
+    assert [log.field for log in root.get_changed_data().data] == ["child"]
@@ -0,0 +1,142 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from changetracker.bulk import commit_many
+from changetracker.core import ChangeTracker, ChangeTrackerDiffMode
+from changetracker.parallel import commit_parallel, get_changed_data_parallel
+from changetracker.sinks import ChangeLogSink
+
+
+class Address(ChangeTracker):
+    def __init__(self, city, **kwargs):
+        self.city = city
+        super().__init__(**kwargs)
+
+
+class User(ChangeTracker):
+    def __init__(self, i, **kwargs):
+        self.name = f"u{i}"
+        self.tags = ["a"]
+        self.meta = {"i": i}
+        self.address = Address("Kyiv")
+        super().__init__(**kwargs)
+
+
+MODES = [
+    pytest.param({}, id="full-compare"),
+    pytest.param({"dirty_tracking": True}, id="dirty-tracking"),
+    pytest.param({"track_containers": True}, id="tracked-containers"),
+]
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+def _mutate(users):
+    for i, u in enumerate(users):
+        if i % 3 == 0:
+            u.name = "changed"
+        if i % 4 == 0:
+            u.tags.append(i)
+        if i % 5 == 0:
+            u.address.city = "Lviv"
+
+
+def _dump(logs):
+    return [(log.field, log.old_value, log.new_value) for log in logs.data]
+
+
+@pytest.mark.parametrize("options", MODES)
+def test_commit_parallel_matches_commit_many(options, executor):
+    sequential = [User(i, **options) for i in range(30)]
+    parallel = [User(i, **options) for i in range(30)]
+    _mutate(sequential)
+    _mutate(parallel)
+
+    expected = commit_many(sequential, commit_id="c", diff_mode=ChangeTrackerDiffMode.PATH)
+    logs = commit_parallel(parallel, executor=executor, chunk_size=4, commit_id="c", diff_mode=ChangeTrackerDiffMode.PATH)
+
+    assert _dump(logs) == _dump(expected)
+    assert {log.commit_id for log in logs.data} == {"c"}
+    for s, p in zip(sequential, parallel):
+        assert p.get_changed_data().data == []
+        assert p.address.get_changed_data().data == []
+        assert p._make_checkpoint(None) == s._make_checkpoint(None)
+
+
+def test_get_changed_data_parallel(executor):
+    users = [User(i) for i in range(10)]
+    _mutate(users)
+    results = get_changed_data_parallel(users, executor=executor)
+    assert [_dump(changes) for changes in results] == [_dump(u.get_changed_data()) for u in users]
+    # Порівняння не змінює базовий стан
+    assert _dump(results[0]) == _dump(users[0].get_changed_data())
+
+
+def test_unchanged_fields_keep_parent_baseline(executor):
+    users = [User(i) for i in range(4)]
+    baselines = [dict(u._original_data) for u in users]
+    users[1].name = "Bob"
+    logs = commit_parallel(users, executor=executor)
+
+    assert _dump(logs) == [("name", "u1", "Bob")]
+    for u, baseline in zip(users, baselines):
+        # Процес пулу повертає знімки лише полів із записами; решта — ті самі об'єкти базового стану
+        for key in ("tags", "meta", "address"):
+            assert u._original_data[key] is baseline[key]
+    assert users[1]._original_data["name"] == "Bob"
+
+
+def test_cycles_between_trackers(executor):
+    a, b = User(1), User(2)
+    a.friend, b.friend = b, a
+    a.commit()
+    b.commit()
+    b.name = "Bob"
+    logs = commit_parallel([a, b], executor=executor, diff_mode=ChangeTrackerDiffMode.PATH)
+    assert sorted(_dump(logs)) == [("friend.name", "u2", "Bob"), ("name", "u2", "Bob")]
+    assert a.get_changed_data().data == [] and b.get_changed_data().data == []
+
+
+def test_clean_trackers_are_not_shipped(monkeypatch):
+    import changetracker.parallel as parallel
+
+    shipped = []
+    original = parallel._dumps
+
+    def recording(jobs):
+        shipped.extend(job[0] for job in jobs)
+        return original(jobs)
+
+    monkeypatch.setattr(parallel, "_dumps", recording)
+    users = [User(i, track_containers=True) for i in range(5)]
+    for u in users:
+        u.address = Address("Kyiv", track_containers=True)
+        u.commit()
+    users[2].name = "Bob"
+    logs = commit_parallel(users, max_workers=1)
+    assert _dump(logs) == [("name", "u2", "Bob")]
+    assert shipped == [users[2]]
+
+
+def test_pickle_recreates_runtime_state():
+    class Sink(ChangeLogSink):
+        def write(self, logs):
+            pass
+
+    u = User(1, thread_safe=True, track_containers=True, sink=Sink())
+    u.tags.append("b")
+    u.commit()
+    copy = pickle.loads(pickle.dumps(u))
+
+    assert copy._sink is None
+    assert copy._lock is not None and copy._lock is not u._lock
+    assert copy.get_changed_data().data == []
+    copy.tags.append("c")
+    assert _dump(copy.get_changed_data()) == [("tags", ["a", "b"], ["a", "b", "c"])]
+    assert u.get_changed_data().data == []
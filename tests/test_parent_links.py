@@ -0,0 +1,150 @@
+from changetracker.bulk import commit_many
+from changetracker.core import ChangeTracker
+
+
+class Address(ChangeTracker):
+    def __init__(self, city, **kwargs):
+        self.city = city
+        self.lines = list(range(100))
+        super().__init__(**kwargs)
+
+
+class User(ChangeTracker):
+    def __init__(self, name, address, **kwargs):
+        self.name = name
+        self.address = address
+        super().__init__(**kwargs)
+
+
+class Group(ChangeTracker):
+    def __init__(self, user, **kwargs):
+        self.user = user
+        super().__init__(**kwargs)
+
+
+def test_child_commit_updates_parent_baseline():
+    address = Address("Kyiv")
+    user = User("Alice", address)
+    address.city = "Lviv"
+    assert [log.field for log in user.get_changed_data().data] == ["address"]
+
+    address.commit()
+    assert user.get_changed_data().data == []
+    assert user._original_data["address"]["city"] == "Lviv"
+    assert len(user.get_change_log().data) == 2
+
+
+def test_child_commit_patches_grandparent_subtree_only():
+    address = Address("Kyiv")
+    user = User("Alice", address)
+    group = Group(user)
+
+    user.name = "Bob"
+    address.city = "Lviv"
+    address.commit()
+    changes = group.get_changed_data().data
+    assert len(changes) == 1
+    # Зміна міста вже закомічена, а незакомічене ім'я досі видно
+    assert changes[0].old_value["name"] == "Alice"
+    assert changes[0].old_value["address"]["city"] == "Lviv"
+    assert changes[0].new_value["name"] == "Bob"
+
+    user.commit()
+    assert group.get_changed_data().data == []
+
+
+def test_clean_child_is_not_snapshotted(count_snapshots):
+    address = Address("Kyiv", track_containers=True)
+    user = User("Alice", address, dirty_tracking=True)
+    assert user._child_keys == {"address"}
+
+    calls = count_snapshots("_make_field_snapshot")
+    assert user.get_changed_data().data == []
+    assert calls == []
+
+    address.lines.append(100)
+    assert "address" in user._dirty_keys
+    assert [log.field for log in user.get_changed_data().data] == ["address"]
+
+
+def test_child_without_dirty_tracking_is_always_compared():
+    address = Address("Kyiv")
+    user = User("Alice", address, dirty_tracking=True)
+    address.city = "Lviv"
+    assert [log.field for log in user.get_changed_data().data] == ["address"]
+
+
+def test_grandchild_change_reaches_grandparent():
+    address = Address("Kyiv", dirty_tracking=True)
+    user = User("Alice", address, dirty_tracking=True)
+    group = Group(user, dirty_tracking=True, hash_compare=True)
+    group.get_changed_data()
+
+    address.city = "Lviv"
+    assert "user" in group._dirty_keys
+    assert [log.field for log in group.get_changed_data().data] == ["user"]
+
+    address.commit()
+    assert user.get_changed_data().data == []
+    assert group.get_changed_data().data == []
+
+
+def test_replaced_child_is_unlinked():
+    old = Address("Kyiv", dirty_tracking=True)
+    user = User("Alice", old, dirty_tracking=True)
+    user.address = Address("Lviv", dirty_tracking=True)
+    user.commit()
+
+    old.city = "Odesa"
+    assert "address" not in user._dirty_keys
+    assert old._get_parents() == []
+    old.commit()
+    assert user._original_data["address"]["city"] == "Lviv"
+
+
+def test_cycle_notifications_terminate():
+    address = Address("Kyiv", dirty_tracking=True)
+    user = User("Alice", address, dirty_tracking=True)
+    address.owner = user
+    user.commit()
+
+    address.city = "Lviv"
+    assert "address" in user._dirty_keys
+    address.commit()
+    assert user.get_changed_data().data == []
+    assert address.get_changed_data().data == []
+
+
+
+def test_observable_flag_is_reset_from_descendants():
+    address = Address("Kyiv", track_containers=True)
+    user = User("Alice", address, dirty_tracking=True)
+    group = Group(user, dirty_tracking=True)
+    assert group._is_observable()
+    assert address._observable and user._observable and group._observable
+
+    # Вкладений ChangeTracker без dirty_tracking у непрозорому контейнері: зміни більше не видно
+    address.lines.append(Address("Lviv"))
+    assert not group._observable
+    assert not group._is_observable()
+    group.commit()
+    assert not group._is_observable()
+
+    address.lines = [1]
+    address.commit()
+    assert group._is_observable()
+    address.extra = {1}
+    address.commit()
+    assert not (address._observable or user._observable or group._observable)
+    del address.extra
+    address.commit()
+    assert group._is_observable()
+    group.commit(new_data={"user": None})
+    assert not group._is_observable()
+
+def test_commit_many_updates_parents_outside_the_batch():
+    address = Address("Kyiv")
+    user = User("Alice", address)
+    address.city = "Lviv"
+    commit_many([address])
+    assert user.get_changed_data().data == []
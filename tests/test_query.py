@@ -0,0 +1,109 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from changetracker.core import ChangeTrackerAction, ChangeTrackerLog, ChangeTrackerLogs
+from changetracker.log_store import ChangeLogStore
+
+START = datetime(2025, 1, 1)
+ACTIONS = list(ChangeTrackerAction)
+
+
+def _make_store(commits=200, seed=1):
+    rng = random.Random(seed)
+    store = ChangeLogStore()
+    for number in range(commits):
+        logs = [
+            ChangeTrackerLog(field=rng.choice("abcdef"), old_value=number, new_value=number + 1, action=rng.choice(ACTIONS))
+            for _ in range(rng.randint(1, 5))
+        ]
+        store.append_commit(logs, commit_id=f"c{number}", timestamp=START + timedelta(minutes=number), init=number < 3)
+    return store
+
+
+def _brute(store, field=None, action=None, commit_id=None, init=None, start=None, end=None):
+    return [
+        log for log in store
+        if (field is None or log.field == field)
+        and (action is None or log.action == action)
+        and (commit_id is None or log.commit_id == commit_id)
+        and (init is None or log.init == init)
+        and (start is None or log.timestamp >= start)
+        and (end is None or log.timestamp < end)
+    ]
+
+
+@pytest.mark.parametrize("filters", [
+    {"field": "a"},
+    {"action": ChangeTrackerAction.DELETED},
+    {"field": "b", "action": ChangeTrackerAction.CHANGED},
+    {"commit_id": "c42"},
+    {"commit_id": "c42", "field": "c"},
+    {"init": True},
+    {"init": False, "field": "d"},
+    {"start": START + timedelta(minutes=50), "end": START + timedelta(minutes=60)},
+    {"start": START + timedelta(minutes=150), "field": "e", "action": ChangeTrackerAction.CREATED},
+    {"end": START + timedelta(minutes=10), "init": False},
+])
+def test_query_matches_brute_force(filters):
+    store = _make_store()
+    query = _apply(ChangeTrackerLogs(data=store).query(), filters)
+    expected = _brute(store, **filters)
+    assert query.to_list() == expected
+    assert query.count() == len(expected)
+    assert query.first() == (expected[0] if expected else None)
+    # Ті самі фільтри над звичайним списком записів
+    assert _apply(ChangeTrackerLogs(data=list(store)).query(), filters).to_list() == expected
+
+
+def _apply(query, filters):
+    if "field" in filters:
+        query = query.field(filters["field"])
+    if "action" in filters:
+        query = query.action(filters["action"])
+    if "commit_id" in filters:
+        query = query.commit(filters["commit_id"])
+    if "init" in filters:
+        query = query.init(filters["init"])
+    if "start" in filters or "end" in filters:
+        query = query.between(filters.get("start"), filters.get("end"))
+    return query
+
+
+def test_query_uses_indexes(monkeypatch):
+    store = _make_store(commits=2000)
+    expected = _brute(store, commit_id="c1500", field="a")
+    built = []
+    make_log = ChangeLogStore._make_log
+    monkeypatch.setattr(ChangeLogStore, "_make_log", lambda self, index: built.append(index) or make_log(self, index))
+
+    assert ChangeTrackerLogs(data=store).query().commit("c1500").field("a").to_list() == expected
+    # Записи створюються лише для результату
+    assert len(built) == len(expected)
+    assert ChangeTrackerLogs(data=store).query().field("a").count() == len(store.field_positions("a"))
+
+
+def test_query_is_lazy_and_chainable():
+    store = _make_store(commits=5)
+    base = ChangeTrackerLogs(data=store).query()
+    by_field = base.field("a")
+    assert base.count() == len(store)
+    assert by_field.field("b").to_list() == []
+    # Запит бачить записи, додані після його створення
+    store.append_commit([ChangeTrackerLog(field="a", old_value=1, new_value=2, action=ChangeTrackerAction.CHANGED)], "late", START + timedelta(days=1), False)
+    assert by_field.commit("late").count() == 1
+    assert by_field.between(START + timedelta(hours=1)).between(end=START + timedelta(days=2)).count() == 1
+
+
+def test_get_filtered_data_applies_both_filters():
+    store = ChangeLogStore()
+    store.append_commit([ChangeTrackerLog(field="a", old_value=None, new_value=1, action=ChangeTrackerAction.CREATED)], "c0", START, True)
+    store.append_commit([
+        ChangeTrackerLog(field="a", old_value=1, new_value=2, action=ChangeTrackerAction.CHANGED),
+        ChangeTrackerLog(field="b", old_value=None, new_value=1, action=ChangeTrackerAction.CREATED),
+    ], "c1", START + timedelta(minutes=1), False)
+    logs = ChangeTrackerLogs(data=store)
+    result = logs.get_filtered_data(filter_action=ChangeTrackerAction.CREATED, filter_init=False)
+    assert [(log.field, log.commit_id) for log in result] == [("b", "c1")]
+    assert logs.get_filtered_data() is store
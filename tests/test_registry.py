@@ -0,0 +1,94 @@
+import pytest
+
+from changetracker.core import ChangeTracker, ChangeTrackerAction, ChangeTrackerDiffMode
+from changetracker.registry import get_type_handler, register_type_handler, unregister_type_handler
+
+
+class Blob(ChangeTracker):
+    def __init__(self, data, **kwargs):
+        self.data = data
+        super().__init__(**kwargs)
+
+
+def _changes(tracker):
+    return [(log.field, log.old_value, log.new_value) for log in tracker.get_changed_data().data]
+
+
+def test_bytearray_mutation_is_detected():
+    b = Blob(bytearray(b"hello"))
+    assert b._original_data["data"] == b"hello"
+    b.data[0] = ord("j")
+    assert _changes(b) == [("data", b"hello", b"jello")]
+
+
+def test_memoryview_snapshot():
+    buffer = bytearray(b"abc")
+    b = Blob(memoryview(buffer))
+    buffer[1] = ord("x")
+    assert _changes(b) == [("data", b"abc", b"axc")]
+
+
+def test_bytes_path_diff_reports_changed_range():
+    b = Blob(b"0123456789", diff_mode=ChangeTrackerDiffMode.PATH)
+    b.data = b"0123xy6789"
+    assert _changes(b) == [("data[4:6]", b"45", b"xy")]
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class Point3(Point):
+    pass
+
+
+def test_custom_handler_and_mro_lookup():
+    register_type_handler(Point, snapshot=lambda p: (p.x, p.y), hash=lambda p: hash((p.x, p.y)))
+    try:
+        assert get_type_handler(Point3) is get_type_handler(Point)
+        b = Blob(Point3(1, 2), hash_compare=True)
+        assert b._original_data["data"] == (1, 2)
+        b.data.x = 5
+        assert _changes(b) == [("data", (1, 2), (5, 2))]
+    finally:
+        unregister_type_handler(Point)
+    assert get_type_handler(Point3) is None
+
+
+def test_custom_equals():
+    register_type_handler(Point, snapshot=lambda p: Point(p.x, p.y), equals=lambda a, b: (a.x, a.y) == (b.x, b.y))
+    try:
+        b = Blob(Point(1, 2))
+        b.data = Point(1, 2)
+        assert _changes(b) == []
+        b.data = Point(1, 3)
+        assert _changes(b)[0][0] == "data"
+    finally:
+        unregister_type_handler(Point)
+
+
+def test_numpy_array_changes():
+    numpy = pytest.importorskip("numpy")
+    b = Blob(numpy.zeros(10, dtype=int), diff_mode=ChangeTrackerDiffMode.PATH)
+    assert b._original_data["data"] is not b.data
+    assert b.get_changed_data().data == []
+
+    b.data[2:4] = 1
+    b.data[7] = 5
+    logs = b.get_changed_data().data
+    assert [log.field for log in logs] == ["data[2:4]", "data[7:8]"]
+    assert all(log.action == ChangeTrackerAction.CHANGED for log in logs)
+    assert logs[0].new_value.tolist() == [1, 1]
+
+    b.commit()
+    assert b.get_changed_data().data == []
+
+
+def test_numpy_array_in_nested_structure():
+    numpy = pytest.importorskip("numpy")
+    b = Blob({"weights": numpy.ones(3)}, hash_compare=True)
+    assert b.get_changed_data().data == []
+    b.data["weights"][0] = 2
+    assert [log.field for log in b.get_changed_data().data] == ["data"]
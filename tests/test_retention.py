@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+
+from changetracker.core import ChangeTracker, ChangeTrackerAction, ChangeTrackerDiffMode
+from changetracker.log_store import ChangeLogStore
+from changetracker.retention import ChangeTrackerRetention, fold_states
+
+
+class Counter(ChangeTracker):
+    def __init__(self, retention=None, **kwargs):
+        self.value = 0
+        self.name = "counter"
+        super().__init__(retention=retention, **kwargs)
+
+
+def _commits(tracker):
+    return list(dict.fromkeys(log.commit_id for log in tracker.get_change_log().data))
+
+
+def test_max_commits_folds_into_checkpoint():
+    c = Counter(ChangeTrackerRetention(max_commits=2))
+    for i in range(1, 6):
+        c.value = i
+        c.commit()
+    logs = c.get_change_log().data
+    # чекпоінт + 2 останні коміти
+    assert len(_commits(c)) == 3
+    checkpoint = [log for log in logs if log.commit_id == _commits(c)[0]]
+    assert {(log.field, log.action, log.new_value) for log in checkpoint} == {
+        ("value", ChangeTrackerAction.CREATED, 3),
+        ("name", ChangeTrackerAction.CREATED, "counter"),
+    }
+    assert [log.new_value for log in logs if log.field == "value"] == [3, 4, 5]
+
+
+def test_max_entries_bounds_log():
+    c = Counter(ChangeTrackerRetention(max_entries=4))
+    for i in range(1, 50):
+        c.value = i
+        c.commit()
+    logs = c.get_change_log().data
+    assert len(logs) <= 4
+    assert logs[-1].new_value == 49
+
+
+def test_max_age():
+    c = Counter(ChangeTrackerRetention(max_age=timedelta(hours=1)))
+    start = datetime.now()
+    for i in range(1, 4):
+        c.value = i
+        c.commit(timestamp=start + timedelta(minutes=i))
+    c.value = 10
+    c.commit(timestamp=start + timedelta(hours=2))
+    assert len(_commits(c)) == 2
+    assert [log.new_value for log in c.get_change_log().data if log.field == "value"] == [3, 10]
+
+
+def test_fold_drops_reverted_and_transient_fields():
+    c = Counter()
+    c.value = 5
+    c.tmp = 1
+    c.commit()
+    c.value = 0
+    del c.tmp
+    c.commit()
+    c.compact_change_log()
+    assert {log.field for log in c.get_change_log().data} == {"value", "name"}
+    assert fold_states({}, {}) == []
+
+
+def test_compact_keeps_last_commits():
+    c = Counter()
+    for i in range(1, 4):
+        c.value = i
+        c.commit()
+    c.compact_change_log(keep_commits=1)
+    assert [log.new_value for log in c.get_change_log().data if log.field == "value"] == [2, 3]
+
+
+def test_fold_path_and_element_logs_by_field_state():
+    c = Counter(diff_mode=ChangeTrackerDiffMode.ELEMENTS)
+    c.items = [1]
+    c.commit()
+    c.items.insert(0, 5)
+    c.commit()
+    c.items.insert(0, 7)
+    c.commit()
+    c.compact_change_log()
+    assert [(log.field, log.action, log.new_value) for log in c.get_change_log().data if log.field == "items"] == [
+        ("items", ChangeTrackerAction.CREATED, [7, 5, 1])
+    ]
+
+    p = Counter(diff_mode=ChangeTrackerDiffMode.PATH)
+    p.d = {"a": {"b": 1}}
+    p.commit(commit_id="c1")
+    p.d["a"]["b"] = 2
+    p.commit()
+    p.d["a"] = {"b": 1}
+    p.commit(commit_id="c3")
+    p.compact_change_log(keep_commits=2)
+    p.compact_change_log()
+    assert {log.field for log in p.get_change_log().data} == {"value", "name", "d"}
+    assert p.state_at("c3")["d"] == {"a": {"b": 1}}
+
+
+def test_retention_folds_in_batches(monkeypatch):
+    calls = []
+    original = ChangeLogStore.replace_head
+
+    def counting(self, *args, **kwargs):
+        calls.append(len(self.commits))
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(ChangeLogStore, "replace_head", counting)
+    c = Counter(ChangeTrackerRetention(max_commits=100))
+    for i in range(1, 1001):
+        c.value = i
+        c.commit()
+        assert len(c._changed_log.commits) <= 101
+    # Згортання із запасом у чверть обмеження — раз на 25 комітів, а не після кожного
+    assert len(calls) <= 1000 // 25 + 1
+    checkpoint = c._changed_log.commits[0]
+    assert c.state_at(checkpoint.commit_id)["value"] == c.get_change_log().query().commit(checkpoint.commit_id).field("value").first().new_value
+    assert c.state_at(c._changed_log.commits[-1].commit_id)["value"] == 1000
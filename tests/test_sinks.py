@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from changetracker import sinks
+from changetracker.core import ChangeTracker, ChangeTrackerAction
+from changetracker.sinks import (
+    ChangeLogFsyncPolicy,
+    ChangeLogSink,
+    JsonlChangeLogSink,
+    SqliteChangeLogSink,
+    read_jsonl_change_log,
+    read_sqlite_change_log,
+)
+
+
+class Profile(ChangeTracker):
+    def __init__(self, name, tags, sink):
+        self.name = name
+        self.tags = tags
+        super().__init__(sink=sink)
+
+
+class CountingSink(ChangeLogSink):
+    def __init__(self):
+        self.calls = []
+
+    def write(self, logs):
+        self.calls.append(list(logs))
+
+
+def _history(profile):
+    profile.name = "Petro"
+    profile.tags.append("b")
+    profile.commit()
+    del profile.name
+    profile.commit()
+
+
+def _rows(logs):
+    return [(log.field, log.action, log.old_value, log.new_value, log.init) for log in logs]
+
+
+def test_sink_receives_each_commit():
+    sink = CountingSink()
+    profile = Profile("Ivan", ["a"], sink)
+    _history(profile)
+    assert [len(call) for call in sink.calls] == [2, 2, 1]
+    assert all(log.commit_id is not None and log.timestamp is not None for call in sink.calls for log in call)
+
+
+def test_jsonl_sink_round_trip(tmp_path):
+    path = tmp_path / "log.jsonl"
+    sink = JsonlChangeLogSink(str(path), batch_size=3, fsync=ChangeLogFsyncPolicy.FLUSH)
+    profile = Profile("Ivan", ["a"], sink)
+    _history(profile)
+    # Останній запис ще в буфері
+    assert len(list(read_jsonl_change_log(str(path)))) == 4
+    sink.close()
+    logs = list(read_jsonl_change_log(str(path)))
+    assert _rows(logs) == _rows(profile.get_change_log().data)
+    assert [log.timestamp for log in logs] == [log.timestamp for log in profile.get_change_log().data]
+    assert logs[-1].action == ChangeTrackerAction.DELETED
+
+
+def test_sqlite_sink_round_trip(tmp_path):
+    path = str(tmp_path / "log.db")
+    with SqliteChangeLogSink(path, batch_size=100) as sink:
+        profile = Profile("Ivan", ["a"], sink)
+        _history(profile)
+        assert _rows(sink.read()) == _rows(profile.get_change_log().data)
+    assert len(list(read_sqlite_change_log(path))) == 5
+
+
+def test_sink_base_classes_are_abstract():
+    with pytest.raises(TypeError):
+        ChangeLogSink()
+    with pytest.raises(TypeError):
+        sinks.BufferedChangeLogSink()
+
+
+def test_write_after_close_raises(tmp_path):
+    for sink in (JsonlChangeLogSink(str(tmp_path / "log.jsonl")), SqliteChangeLogSink(str(tmp_path / "log.db"))):
+        sink.close()
+        sink.close()
+        assert sink.closed
+        with pytest.raises(ValueError):
+            sink.write([])
+
+
+def test_sqlite_close_policy_syncs_only_on_close(tmp_path, monkeypatch):
+    synced = []
+    fsync = os.fsync
+    monkeypatch.setattr(sinks.os, "fsync", lambda fd: synced.append(fd) or fsync(fd))
+    sink = SqliteChangeLogSink(str(tmp_path / "log.db"), batch_size=1, fsync=ChangeLogFsyncPolicy.CLOSE)
+    assert sink._connection.execute("PRAGMA synchronous").fetchone() == (0,)
+    _history(Profile("Ivan", ["a"], sink))
+    assert synced == []
+    sink.close()
+    assert len(synced) == 1
+    assert len(list(read_sqlite_change_log(str(tmp_path / "log.db")))) == 5
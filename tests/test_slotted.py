@@ -0,0 +1,201 @@
+import asyncio
+import copy
+import pickle
+import sys
+import tracemalloc
+
+import pytest
+
+from changetracker import ChangeTracker, ChangeTrackerBase, ChangeTrackerDiffMode, SlottedChangeTracker, commit_many, commit_parallel
+from changetracker.core import _NO_EXTRAS, _NO_KEYS
+
+
+class Point(SlottedChangeTracker):
+    __slots__ = ("x", "y", "tags", "_cache")
+
+    def __init__(self, x, y, **kwargs):
+        self.x = x
+        self.y = y
+        self.tags = ["a"]
+        self._cache = None
+        super().__init__(**kwargs)
+
+
+class Point3D(Point):
+    __slots__ = ("z",)
+
+    def __init__(self, x, y, z, **kwargs):
+        self.z = z
+        super().__init__(x, y, **kwargs)
+
+
+class Declared(SlottedChangeTracker):
+    __slots__ = ("name", "secret")
+    _tracked_fields = ("name",)
+
+    def __init__(self, **kwargs):
+        self.name = "a"
+        self.secret = "s"
+        super().__init__(**kwargs)
+
+
+class Shape(ChangeTracker):
+    def __init__(self, **kwargs):
+        self.origin = Point(0, 0, **kwargs)
+        self.label = "shape"
+        super().__init__(**kwargs)
+
+
+MODES = [
+    pytest.param({}, id="full-compare"),
+    pytest.param({"dirty_tracking": True}, id="dirty-tracking"),
+    pytest.param({"track_containers": True}, id="tracked-containers"),
+    pytest.param({"hash_compare": True}, id="hash-compare"),
+    pytest.param({"thread_safe": True, "dirty_tracking": True}, id="thread-safe"),
+    pytest.param({"deferred_baseline": True, "init_log": False, "track_containers": True}, id="deferred"),
+]
+
+
+def _changes(tracker):
+    return sorted((log.field, log.old_value, log.new_value) for log in tracker.get_changed_data().data)
+
+
+def test_fields_come_from_slots():
+    point = Point3D(1, 2, 3)
+    assert not hasattr(point, "__dict__")
+    assert Point3D._field_names == ("x", "y", "tags", "_cache", "z")
+    assert point._get_filtered_data(data=point._get_fields()) == {"x": 1, "y": 2, "tags": ["a"], "z": 3}
+    assert Declared()._get_fields() == {"name": "a"}
+
+
+
+def test_dict_tracker_layout_is_unchanged():
+    # ChangeTracker зберігає атрибути в __dict__; SlottedChangeTracker — окремий підклас спільної бази
+    tracker = ChangeTracker(dirty_tracking=True)
+    assert type(tracker) is ChangeTracker
+    tracker.x = 1
+    assert [(log.field, log.new_value) for log in tracker.get_changed_data().data] == [("x", 1)]
+    tracker.commit()
+    tracker.x = 2
+    restored = pickle.loads(pickle.dumps(tracker))
+    assert [(log.field, log.new_value) for log in restored.get_changed_data().data] == [("x", 2)]
+
+    class WithSlots(ChangeTracker):
+        __slots__ = ("y",)
+
+        def __init__(self):
+            self.name = "a"
+            super().__init__()
+
+    with_slots = WithSlots()
+    with_slots.y = 1
+    with_slots.name = "b"
+    assert [log.field for log in with_slots.get_changed_data().data] == ["name"]
+    assert isinstance(Point(1, 2), ChangeTrackerBase) and not isinstance(Point(1, 2), ChangeTracker)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_tracks_changes_like_dict_tracker(mode):
+    point = Point(1, 2, **mode)
+    point.x = 10
+    point.tags.append("b")
+    del point.y
+    assert _changes(point) == [("tags", ["a"], ["a", "b"]), ("x", 1, 10), ("y", 2, None)]
+    point.commit(commit_id="c1")
+    assert _changes(point) == []
+    assert point.state_at("c1") == {"x": 10, "tags": ["a", "b"]}
+
+    point.y = 5
+    point.commit()
+    point.revert_to("c1")
+    assert (point.x, getattr(point, "y", None), list(point.tags)) == (10, None, ["a", "b"])
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_nested_in_dict_tracker(mode):
+    shape = Shape(**mode)
+    shape.origin.x = 7
+    assert _changes(shape) == [("origin", {"x": 0, "y": 0, "tags": ["a"]}, {"x": 7, "y": 0, "tags": ["a"]})]
+    shape.commit(commit_id="c1")
+    assert [log.field for log in shape.origin.get_change_log().query().commit("c1")] == ["x"]
+    assert _changes(shape) == []
+
+    shape.origin.y = 1
+    assert shape.get_changed_data(diff_mode=ChangeTrackerDiffMode.PATH).data[0].field == "origin.y"
+
+
+def test_pickle_copy_and_bulk_commit():
+    point = Point(1, 2, dirty_tracking=True)
+    point.x = 3
+    restored = pickle.loads(pickle.dumps(point))
+    assert _changes(restored) == [("x", 1, 3)]
+    clone = copy.deepcopy(point)
+    clone.y = 9
+    assert _changes(clone) == [("x", 1, 3), ("y", 2, 9)]
+
+    points = [point, clone]
+    logs = commit_many(points, commit_id="bulk")
+    assert sorted(log.field for log in logs.data) == ["x", "x", "y"]
+    point.x = 4
+    assert [log.field for log in commit_parallel([point], max_workers=1).data] == ["x"]
+
+
+def test_acommit():
+    point = Point(1, 2, track_containers=True)
+    point.tags.append("b")
+    logs = asyncio.run(point.acommit())
+    assert [(log.field, log.new_value) for log in logs.data] == [("tags", ["a", "b"])]
+
+
+def test_per_instance_memory_close_to_plain_slots():
+    class Plain:
+        __slots__ = ("x", "y", "tags", "_cache")
+
+        def __init__(self, x, y):
+            self.x = x
+            self.y = y
+            self.tags = ["a"]
+            self._cache = None
+
+    def measure(make):
+        tracemalloc.start()
+        objects = [make(i) for i in range(2000)]
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert len(objects) == 2000
+        return size / 2000
+
+    class DictPoint(ChangeTracker):
+        def __init__(self, x, y):
+            self.x = x
+            self.y = y
+            self.tags = ["a"]
+            self._cache = None
+            super().__init__()
+
+    plain = measure(lambda i: Plain(i, i))
+    slotted = measure(lambda i: Point(i, i, deferred_baseline=True, init_log=False))
+    regular = measure(lambda i: DictPoint(i, i))
+    # Накладні витрати — слоти та базовий стан (знімок списку tags), а не журнал і службові структури
+    assert slotted - plain < 450
+    assert slotted * 2 < regular
+    # З init-журналом додаються лише записи та коміт: індекси журналу будуються під час першого пошуку
+    assert measure(lambda i: Point(i, i)) < 1600
+    assert sys.getsizeof(Point(1, 2)) < 200
+
+
+def test_bookkeeping_is_shared_until_used():
+    first = Point(1, 2, dirty_tracking=True, deferred_baseline=True, init_log=False)
+    second = Point(3, 4, dirty_tracking=True, deferred_baseline=True, init_log=False)
+    # Налаштування спільні для конфігурації, множини dirty_tracking та рідко потрібний стан ще не створені
+    assert first._config is second._config
+    assert first._config is not Point(1, 2, checkpoint_interval=None)._config
+    assert first._dirty_keys is _NO_KEYS and first._child_keys is _NO_KEYS
+    assert first._extras is _NO_EXTRAS
+
+    first.x = 10
+    first.commit(commit_id="c1")
+    assert second._dirty_keys is _NO_KEYS
+    assert Point(1, 2, thread_safe=True)._extras is not _NO_EXTRAS
+    restored = pickle.loads(pickle.dumps(first))
+    assert restored._config is first._config
@@ -0,0 +1,172 @@
+import sys
+import threading
+
+import pytest
+
+from changetracker.bulk import commit_many
+from changetracker.core import ChangeTracker
+
+
+class Account(ChangeTracker):
+    def __init__(self, **kwargs):
+        self.balance = 0
+        self.history = []
+        self.meta = {}
+        super().__init__(thread_safe=True, checkpoint_interval=None, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def frequent_thread_switches():
+    # Частіше перемикання потоків — більше шансів перервати коміт посеред зміни полів
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+MODES = [
+    pytest.param({}, id="full-compare"),
+    pytest.param({"dirty_tracking": True}, id="dirty-tracking"),
+    pytest.param({"track_containers": True}, id="tracked-containers"),
+]
+
+
+def _run(*targets):
+    errors = []
+
+    def wrap(target):
+        def run():
+            try:
+                target()
+            except BaseException as error:
+                errors.append(error)
+        return run
+
+    threads = [threading.Thread(target=wrap(target)) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def _current_state(tracker):
+    return {k: tracker._get_field_snapshot(v) for k, v in tracker._get_filtered_data(data=tracker.__dict__).items()}
+
+
+def _assert_consistent(tracker):
+    # Журнал, базовий стан і поточні поля описують той самий стан
+    tracker.commit()
+    assert tracker.get_changed_data().data == []
+    last_commit = tracker._changed_log.commits[-1].commit_id
+    state = _current_state(tracker)
+    assert tracker.state_at(last_commit) == state
+    assert tracker._make_checkpoint(None) == state
+
+
+@pytest.mark.parametrize("options", MODES)
+def test_concurrent_writers_and_commits(options):
+    account = Account(**options)
+    stop = threading.Event()
+
+    def writer(n):
+        def run():
+            for i in range(300):
+                account.balance += 1
+                with account.locked():
+                    account.history.append(i)
+                    account.meta[f"w{n}"] = i
+                # Нові атрибути змінюють розмір __dict__ під час коміту
+                setattr(account, f"field_{n}_{i % 7}", i)
+        return run
+
+    def committer():
+        while not stop.is_set():
+            account.commit()
+            account.get_changed_data()
+
+    writers = [writer(n) for n in range(4)]
+
+    def writers_then_stop():
+        _run(*writers)
+        stop.set()
+
+    _run(writers_then_stop, committer, committer)
+    _assert_consistent(account)
+    assert len(account.history) == 1200
+
+
+@pytest.mark.parametrize("options", MODES)
+def test_locked_changes_are_committed_together(options):
+    account = Account(**options)
+    account.debit = 0
+    account.commit()
+    stop = threading.Event()
+
+    def writer():
+        for _ in range(500):
+            with account.locked():
+                account.balance += 10
+                account.debit -= 10
+        stop.set()
+
+    def committer():
+        while not stop.is_set():
+            account.commit()
+
+    _run(writer, committer)
+    _assert_consistent(account)
+    for record in account._changed_log.commits[1:]:
+        state = account.state_at(record.commit_id)
+        assert state["balance"] + state["debit"] == 0
+
+
+def test_tracked_dict_mutated_during_commit():
+    account = Account(track_containers=True)
+    stop = threading.Event()
+
+    def writer():
+        for i in range(2000):
+            account.meta[i] = i
+            if i % 3 == 0:
+                del account.meta[i]
+        stop.set()
+
+    def committer():
+        while not stop.is_set():
+            account.commit()
+
+    _run(writer, committer)
+    _assert_consistent(account)
+
+
+def test_commit_many_with_concurrent_writers():
+    accounts = [Account(dirty_tracking=True) for _ in range(3)]
+    stop = threading.Event()
+
+    def writer():
+        for i in range(500):
+            for account in accounts:
+                account.balance = i
+        stop.set()
+
+    def committer():
+        while not stop.is_set():
+            commit_many(accounts)
+
+    _run(writer, committer)
+    for account in accounts:
+        _assert_consistent(account)
+
+
+def test_locked_is_a_no_op_without_thread_safe():
+    class Plain(ChangeTracker):
+        def __init__(self):
+            self.value = 1
+            super().__init__()
+
+    plain = Plain()
+    with plain.locked() as tracker:
+        tracker.value = 2
+    assert plain._lock is None
+    assert [log.field for log in plain.get_changed_data().data] == ["value"]
@@ -0,0 +1,174 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from changetracker.core import ChangeTracker, ChangeTrackerDiffMode
+from changetracker.log_store import ChangeLogStore
+from changetracker.retention import ChangeTrackerRetention
+
+
+class Address(ChangeTracker):
+    def __init__(self, city):
+        self.city = city
+        super().__init__()
+
+
+class User(ChangeTracker):
+    def __init__(self, **kwargs):
+        self.name = "Alice"
+        self.tags = ["a"]
+        self.address = Address("Kyiv")
+        super().__init__(**kwargs)
+
+
+def _commit(tracker, commit_id, timestamp=None):
+    tracker.commit(commit_id=commit_id, timestamp=timestamp)
+
+
+def test_state_at_commit_id():
+    u = User()
+    u.name = "Bob"
+    _commit(u, "c1")
+    u.tags.append("b")
+    del u.name
+    _commit(u, "c2")
+
+    assert u.state_at("c1") == {"name": "Bob", "tags": ["a"], "address": {"city": "Kyiv"}}
+    assert u.state_at("c2") == {"tags": ["a", "b"], "address": {"city": "Kyiv"}}
+    with pytest.raises(KeyError):
+        u.state_at("missing")
+
+
+def test_state_at_timestamp():
+    start = datetime(2024, 1, 1)
+    u = User(init_commit=False)
+    _commit(u, "c0", start)
+    for i in range(1, 4):
+        u.name = f"v{i}"
+        _commit(u, f"c{i}", start + timedelta(hours=i))
+
+    assert u.state_at(start + timedelta(hours=2, minutes=30))["name"] == "v2"
+    assert u.state_at(start + timedelta(hours=3))["name"] == "v3"
+    with pytest.raises(KeyError):
+        u.state_at(start - timedelta(seconds=1))
+
+
+def test_state_at_returns_copy():
+    u = User()
+    _commit(u, "c1")
+    first_id = u.get_change_log().data[0].commit_id
+    state = u.state_at(first_id)
+    state["tags"].append("x")
+    assert u.state_at(first_id)["tags"] == ["a"]
+
+
+def test_replay_is_bounded_by_checkpoints(monkeypatch):
+    u = User(checkpoint_interval=10)
+    for i in range(1, 100):
+        u.name = f"v{i}"
+        _commit(u, f"c{i}")
+    assert len(u._checkpoints) == 10
+
+    calls = []
+    commit_logs = ChangeLogStore.commit_logs
+    monkeypatch.setattr(ChangeLogStore, "commit_logs", lambda store, n: calls.append(n) or commit_logs(store, n))
+    assert u.state_at("c57")["name"] == "v57"
+    assert len(calls) <= 10
+
+
+def test_state_at_after_path_mode_commit():
+    u = User(diff_mode=ChangeTrackerDiffMode.PATH, checkpoint_interval=None)
+    u.address.city = "Lviv"
+    u.tags.append("b")
+    _commit(u, "c1")
+    u.name = "Bob"
+    _commit(u, "c2")
+
+    assert u.state_at("c1") == {"name": "Alice", "tags": ["a", "b"], "address": {"city": "Lviv"}}
+    assert u.state_at("c2")["name"] == "Bob"
+
+
+def test_path_checkpoints_skip_unchanged_containers(count_snapshots):
+    u = User(diff_mode=ChangeTrackerDiffMode.PATH, track_containers=True, checkpoint_interval=None)
+    u.big = list(range(1000))
+    u.tags.append("b")
+    _commit(u, "c0")
+    big = u.big
+
+    calls = count_snapshots()
+    for i in range(1, 11):
+        u.name = f"v{i}"
+        u.tags.append(i)
+        _commit(u, f"c{i}")
+    assert not any(value is big for value in calls)
+
+    del u.name
+    _commit(u, "c11")
+    # Без checkpoint_interval стан відтворюється із записів шляхів, чекпоінти комітів не зберігаються
+    assert not u._checkpoints
+    assert u.state_at("c5") == {"name": "v5", "tags": ["a", "b", 1, 2, 3, 4, 5], "address": {"city": "Kyiv"}, "big": list(range(1000))}
+    assert "name" not in u.state_at("c11")
+
+
+def test_state_at_replays_element_moves_and_inserts():
+    u = User(diff_mode=ChangeTrackerDiffMode.ELEMENTS, checkpoint_interval=None)
+    u.tags = [{"id": 1}, {"id": 2}, {"id": 3}, [1, 2]]
+    _commit(u, "c1")
+    u.tags.insert(0, {"id": 0})
+    u.tags.pop(2)
+    u.tags[-1].append(3)
+    u.tags[1]["name"] = "x"
+    _commit(u, "c2")
+    u.tags.reverse()
+    _commit(u, "c3")
+
+    assert not u._checkpoints
+    assert u.state_at("c2") == {"name": "Alice", "tags": [{"id": 0}, {"id": 1, "name": "x"}, {"id": 3}, [1, 2, 3]], "address": {"city": "Kyiv"}}
+    assert u.state_at("c3")["tags"] == [[1, 2, 3], {"id": 3}, {"id": 1, "name": "x"}, {"id": 0}]
+
+
+def test_state_at_with_unreplayable_paths():
+    # Обробник bytes записує діапазони (data[1:2]), які не відтворюються операціями, — коміт зберігає стан поля
+    u = User(diff_mode=ChangeTrackerDiffMode.PATH, checkpoint_interval=None)
+    u.data = b"abc"
+    _commit(u, "c1")
+    u.data = b"axc"
+    _commit(u, "c2")
+    u.name = "Bob"
+    _commit(u, "c3")
+
+    assert set(u._checkpoints) == {"c2"}
+    assert u.state_at("c2")["data"] == b"axc"
+    assert u.state_at("c3")["name"] == "Bob"
+
+
+def test_state_at_survives_retention():
+    u = User(retention=ChangeTrackerRetention(max_commits=3), checkpoint_interval=None)
+    for i in range(1, 10):
+        u.name = f"v{i}"
+        _commit(u, f"c{i}")
+
+    for i in range(6, 10):
+        assert u.state_at(f"c{i}")["name"] == f"v{i}"
+    with pytest.raises(KeyError):
+        u.state_at("c2")
+
+
+def test_revert_to():
+    u = User(dirty_tracking=True)
+    _commit(u, "c0")
+    u.name = "Bob"
+    u.address.city = "Lviv"
+    u.extra = 1
+    _commit(u, "c1")
+    address = u.address
+
+    changes = u.revert_to(u.get_change_log().data[0].commit_id)
+    assert u.address is address
+    assert (u.name, u.tags, u.address.city) == ("Alice", ["a"], "Kyiv")
+    assert not hasattr(u, "extra")
+    assert {log.field for log in changes.data} == {"name", "address", "extra"}
+
+    u.commit()
+    assert u.get_changed_data().data == []
+    assert u.address.get_changed_data().data == []